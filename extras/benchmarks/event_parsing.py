@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Measure the time and memory needed to build a History from a raw event list,
+as a decider does for each decision task, and optionally to parse it.
+
+    python extras/benchmarks/event_parsing.py [--events 25000] [--repeat 5] [--parse]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from simpleflow.history import History as ParsedHistory
+from simpleflow.swf.mapper.models.history.base import History
+
+
+def make_events(nb_events: int) -> list[dict]:
+    """
+    Build a raw history made of activity tasks (scheduled, started, completed).
+    """
+    events = [
+        {
+            "eventId": 1,
+            "eventType": "WorkflowExecutionStarted",
+            "eventTimestamp": 1_700_000_000.0,
+            "workflowExecutionStartedEventAttributes": {
+                "input": json.dumps({"args": [], "kwargs": {}}),
+                "taskList": {"name": "bench"},
+                "workflowType": {"name": "bench", "version": "1"},
+            },
+        }
+    ]
+    while len(events) < nb_events:
+        scheduled_id = len(events) + 1
+        activity_id = f"activity-{scheduled_id}"
+        payload = json.dumps({"args": [scheduled_id], "kwargs": {"key": "value" * 10}})
+        events += [
+            {
+                "eventId": scheduled_id,
+                "eventType": "ActivityTaskScheduled",
+                "eventTimestamp": 1_700_000_000.0 + scheduled_id,
+                "activityTaskScheduledEventAttributes": {
+                    "activityId": activity_id,
+                    "activityType": {"name": "tasks.bench", "version": "1"},
+                    "input": payload,
+                    "control": json.dumps({"retry": 0}),
+                    "taskList": {"name": "bench"},
+                    "decisionTaskCompletedEventId": 1,
+                },
+            },
+            {
+                "eventId": scheduled_id + 1,
+                "eventType": "ActivityTaskStarted",
+                "eventTimestamp": 1_700_000_000.0 + scheduled_id + 1,
+                "activityTaskStartedEventAttributes": {"identity": "bench-host", "scheduledEventId": scheduled_id},
+            },
+            {
+                "eventId": scheduled_id + 2,
+                "eventType": "ActivityTaskCompleted",
+                "eventTimestamp": 1_700_000_000.0 + scheduled_id + 2,
+                "activityTaskCompletedEventAttributes": {
+                    "result": payload,
+                    "scheduledEventId": scheduled_id,
+                    "startedEventId": scheduled_id + 1,
+                },
+            },
+        ]
+    return events[:nb_events]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=25_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--parse", action="store_true", help="also parse the history (simpleflow.history)")
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+
+    def run():
+        history = History.from_event_list(events)
+        if args.parse:
+            ParsedHistory(history).parse()
+        return history
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    history = run()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    print(f"events:     {len(history)}")
+    print(f"best time:  {best * 1000:.1f} ms ({len(history) / best:,.0f} events/s)")
+    print(f"memory:     {memory / 1024**2:.1f} MiB ({memory / len(history):.0f} bytes/event)")
+
+
+if __name__ == "__main__":
+    main()
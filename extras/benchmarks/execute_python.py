@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Compare the latency of execute.python() calls in a new process per call and
+in a persistent interpreter server.
+
+    python extras/benchmarks/execute_python.py [--interpreter python] [--calls 20] [--result-mb 0]
+
+The callable is ``statistics.fmean``, so that only the process and transport
+overhead are measured. The first persistent call starts the server; the next
+ones reuse it. With --result-mb, the callable is ``copy.copy`` of a list of
+about this many MiB of JSON, sent as argument and returned as result.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import functools
+import statistics
+import time
+import tracemalloc
+
+from simpleflow import execute
+
+
+def measure(func, nb_calls):
+    latencies = []
+    for _ in range(nb_calls):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    tracemalloc.start()  # in another call, as it slows down allocations
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latencies, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--interpreter", default="python")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--result-mb", type=float, default=0)
+    args = parser.parse_args()
+
+    if args.result_mb:
+        item = [1.5, "abcdefgh"]  # 16 bytes of JSON
+        callable_, call_args = copy.copy, (item * int(args.result_mb * 1024 * 1024 / 16),)
+    else:
+        callable_, call_args = statistics.fmean, (list(range(10)),)
+    print(f"calls:       {args.calls} ({args.interpreter}, {args.result_mb} MiB)")
+    for name, persistent in (("subprocess", False), ("persistent", True)):
+        func = execute.python(interpreter=args.interpreter, persistent=persistent)(callable_)
+        latencies, peak = measure(functools.partial(func, *call_args), args.calls)
+        print(
+            f"{name + ':':<13}first {latencies[0] * 1000:8.1f} ms,"
+            f" median {statistics.median(latencies[1:] or latencies) * 1000:8.1f} ms,"
+            f" peak {peak / 1024 / 1024:6.1f} MiB"
+        )
+    execute.python_servers.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Measure the cost of building the future of a large Group on replay, as a
+decider does on each decision task.
+
+    python extras/benchmarks/group_future.py [--items 100000] [--finished 50000] [--max-parallel 100]
+
+Activities are replaced by a fake workflow returning ready-made futures, so
+that only the GroupFuture bookkeeping is measured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from simpleflow import futures
+from simpleflow.canvas import GroupFuture
+
+
+class FakeWorkflow:
+    """
+    Submitting item i returns a finished future if i < nb_finished, else a
+    running one.
+    """
+
+    def __init__(self, nb_finished: int) -> None:
+        self.nb_finished = nb_finished
+
+    def submit(self, i: int) -> futures.Future:
+        future = futures.Future()
+        if i < self.nb_finished:
+            future.set_finished(i)
+        else:
+            future.set_running()
+        return future
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--finished", type=int, default=50_000)
+    parser.add_argument("--max-parallel", type=int, default=100)
+    args = parser.parse_args()
+
+    workflow = FakeWorkflow(args.finished)
+    start = time.perf_counter()
+    future = GroupFuture(range(args.items), workflow, max_parallel=args.max_parallel)
+    elapsed = time.perf_counter() - start
+
+    print(f"items:      {args.items} ({args.finished} finished, max_parallel={args.max_parallel})")
+    print(f"submitted:  {len(future.futures)}")
+    print(f"time:       {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Count the jumbo fields pulled by a long-lived decision process, when its
+memory cache is cleared at each decision and when it's kept within a budget.
+
+    python extras/benchmarks/jumbo_cache.py [--workflows 20] [--decisions 200] [--fields 10] [--size-kb 100]
+
+Decisions go round-robin over the workflows, each of them referencing its own
+--fields jumbo fields. S3 is replaced by a function sleeping --latency-ms per
+GET.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from unittest import mock
+
+from simpleflow import format, storage
+from simpleflow.jumbo_fields_cache import MemoryJumboFieldsCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workflows", type=int, default=20)
+    parser.add_argument("--decisions", type=int, default=200)
+    parser.add_argument("--fields", type=int, default=10)
+    parser.add_argument("--size-kb", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    size = args.size_kb * 1024
+    nb_gets = 0
+
+    def pull_content(bucket, path):
+        nonlocal nb_gets
+        nb_gets += 1
+        time.sleep(args.latency_ms / 1000)
+        return '"' + "x" * (size - 2) + '"'
+
+    working_set = args.workflows * args.fields * size
+    print(
+        f"{args.decisions} decisions over {args.workflows} workflows,"
+        f" working set {working_set / 1024 / 1024:.1f} MiB ({args.latency_ms} ms per GET)"
+    )
+    with mock.patch.object(storage, "pull_content", pull_content):
+        for name, max_bytes, clear in (
+            ("cleared", working_set, True),
+            ("half", working_set // 2, False),
+            ("full", working_set, False),
+        ):
+            nb_gets = 0
+            cache = MemoryJumboFieldsCache(max_bytes=max_bytes)
+            with mock.patch.object(format, "JUMBO_FIELDS_MEMORY_CACHE", cache):
+                start = time.perf_counter()
+                for decision in range(args.decisions):
+                    if clear:
+                        cache.clear()
+                    workflow = decision % args.workflows
+                    for i in range(args.fields):
+                        format.decode(f"simpleflow+s3://jumbo-bucket/{workflow}-{i} {size}", use_proxy=False)
+                elapsed = time.perf_counter() - start
+            print(
+                f"{name + ':':<9}{elapsed * 1000:8.1f} ms, {nb_gets} GETs,"
+                f" cache {max_bytes / 1024 / 1024:6.1f} MiB, {cache.evictions} evictions"
+            )
+
+
+if __name__ == "__main__":
+    main()
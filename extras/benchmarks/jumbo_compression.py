@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Measure the effect of SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION on activity results
+of growing sizes: where they end up (in place or on S3), the bytes stored,
+and the time to encode and decode them.
+
+    python extras/benchmarks/jumbo_compression.py [--sizes-kb 40,200,1000]
+
+S3 is mocked by moto. The results are lists of records like crawl results.
+Keep them under a few MiB: moto doesn't decode the chunked uploads of recent
+botocore versions above that.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import time
+from unittest import mock
+
+import boto3
+from moto import mock_s3
+
+from simpleflow import format
+from simpleflow.utils import json_dumps
+
+
+def make_result(size: int) -> list[dict]:
+    records = []
+    length = 2
+    while length < size:
+        i = len(records)
+        record = {
+            "id": i,
+            "url": f"https://www.example.com/products/{i * 7919 % 100_000}/reviews?page={i % 13}",
+            "status": 200 if i % 17 else 404,
+            "depth": i % 5,
+            "content_type": "text/html; charset=utf-8",
+        }
+        records.append(record)
+        length += len(json_dumps(record)) + 1
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes-kb", default="40,200,1000")
+    args = parser.parse_args()
+
+    os.environ["SIMPLEFLOW_JUMBO_FIELDS_BUCKET"] = "simpleflow-benchmark"
+    with mock_s3():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="simpleflow-benchmark")
+        for size_kb in map(int, args.sizes_kb.split(",")):
+            result = make_result(size_kb * 1024)
+            print(f"result: {size_kb} KiB")
+            for compression in "", "gzip":
+                with mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION", compression):
+                    start = time.perf_counter()
+                    encoded = format.result(result)
+                    encode_time = time.perf_counter() - start
+                    format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+                    start = time.perf_counter()
+                    assert format.decode(encoded) == result
+                    decode_time = time.perf_counter() - start
+                if format.is_jumbo_field(encoded):
+                    where = "S3"
+                    key = encoded.split()[0].split("/", 3)[-1]
+                    stored = client.head_object(Bucket="simpleflow-benchmark", Key=key)["ContentLength"]
+                else:
+                    where = "in place"
+                    stored = len(encoded)
+                print(
+                    f"  {compression or 'none':<5} {where:<9} {stored / 1024:8.1f} KiB,"
+                    f" encode {encode_time * 1000:6.1f} ms, decode {decode_time * 1000:6.1f} ms"
+                )
+            print(f"  ratio {len(json_dumps(result)) / len(gzip.compress(json_dumps(result).encode())):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
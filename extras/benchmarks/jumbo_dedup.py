@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Measure the uploads of a jumbo field encoded many times, like the same input of
+a large fan-out, with objects named by UUID and by content.
+
+    python extras/benchmarks/jumbo_dedup.py [--tasks 500] [--size-kb 100]
+
+S3 is mocked by moto.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from unittest import mock
+
+import boto3
+from moto import mock_s3
+
+from simpleflow import format, storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--size-kb", type=int, default=100)
+    args = parser.parse_args()
+
+    os.environ["SIMPLEFLOW_JUMBO_FIELDS_BUCKET"] = "simpleflow-benchmark"
+    message = {"urls": [f"https://www.example.com/{i}" for i in range(args.size_kb * 1024 // 30)]}
+    with mock_s3():
+        client = boto3.client("s3", region_name="us-east-1")
+        for content_addressed in False, True:
+            client.create_bucket(Bucket="simpleflow-benchmark")
+            format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+            format.JUMBO_FIELDS_KNOWN_KEYS.clear()
+            with (
+                mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED", content_addressed),
+                mock.patch("simpleflow.storage.push_content", wraps=storage.push_content) as push,
+            ):
+                start = time.perf_counter()
+                for _ in range(args.tasks):
+                    format.input(message)
+                elapsed = time.perf_counter() - start
+            objects = client.list_objects_v2(Bucket="simpleflow-benchmark").get("Contents", [])
+            print(
+                f"{'content' if content_addressed else 'uuid':<8} {elapsed * 1000:8.1f} ms, {push.call_count} uploads,"
+                f" {sum(obj['Size'] for obj in objects) / 1024 / 1024:6.1f} MiB stored,"
+                f" {len(format.JUMBO_FIELDS_MEMORY_CACHE)} cached"
+            )
+            for obj in objects:
+                client.delete_object(Bucket="simpleflow-benchmark", Key=obj["Key"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Compare resolving the jumbo fields of a history one at a time and after
+prefetching them.
+
+    python extras/benchmarks/jumbo_prefetch.py [--fields 50] [--latency-ms 30] [--workers 8]
+
+S3 is replaced by a function sleeping --latency-ms per GET, standing for the
+network round-trip that the prefetch overlaps.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from unittest import mock
+
+from simpleflow import format, storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fields", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    def pull_content(bucket, path):
+        time.sleep(args.latency_ms / 1000)
+        return f'"{path}"'
+
+    print(f"fields: {args.fields} ({args.latency_ms} ms per GET, {args.workers} workers)")
+    with mock.patch.object(storage, "pull_content", pull_content):
+        for name, workers in (("serial", 0), ("prefetch", args.workers)):
+            format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+            references = [f"simpleflow+s3://jumbo-bucket/{name}-{i} 100" for i in range(args.fields)]
+            start = time.perf_counter()
+            if workers:
+                format.prefetch_jumbo_fields(references, max_workers=workers)
+            values = [str(format.decode(reference)) for reference in references]
+            elapsed = time.perf_counter() - start
+            assert len(values) == args.fields
+            print(f"{name + ':':<10}{elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
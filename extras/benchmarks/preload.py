@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Measure the latency of the first task of forked processes, with and without
+preloading the modules it needs in their parent.
+
+    python extras/benchmarks/preload.py [--modules boto3,simpleflow.swf.executor] [--children 5]
+
+Each mode runs in a fresh interpreter. The parent (like a worker supervisor)
+optionally preloads the modules, then forks children one after the other;
+the first task of each child imports the modules, as the dispatcher does for
+an activity module.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import statistics
+import subprocess
+import sys
+import time
+
+import multiprocess
+
+
+def first_task(modules):
+    for name in modules:
+        importlib.import_module(name)
+
+
+def run(modules, nb_children, preload):
+    if preload:
+        from simpleflow.process import preload_modules
+
+        preload_modules(modules)
+    latencies = []
+    for _ in range(nb_children):
+        start = time.perf_counter()
+        child = multiprocess.Process(target=first_task, args=(modules,))
+        child.start()
+        child.join()
+        latencies.append(time.perf_counter() - start)
+    print(f"{statistics.median(latencies) * 1000:.1f} {max(latencies) * 1000:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", default="boto3,simpleflow.swf.executor")
+    parser.add_argument("--children", type=int, default=5)
+    parser.add_argument("--child-mode", choices=["cold", "preload"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    modules = args.modules.split(",")
+
+    if args.child_mode:
+        run(modules, args.children, args.child_mode == "preload")
+        return
+
+    print(f"modules:  {', '.join(modules)} ({args.children} children)")
+    for mode in ("cold", "preload"):
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--modules",
+                args.modules,
+                "--children",
+                str(args.children),
+                "--child-mode",
+                mode,
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        median, worst = output.split()
+        print(f"{mode + ':':<10}first task {median:>7} ms (median), {worst:>7} ms (max)")
+
+
+if __name__ == "__main__":
+    main()
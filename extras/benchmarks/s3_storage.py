@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Measure the latency of simpleflow.storage calls: a first push, which creates
+the S3 resource, then pulls.
+
+    python extras/benchmarks/s3_storage.py [--pulls 20] [--bucket my-bucket]
+
+Without --bucket, S3 is mocked by moto, so that only the client side is
+measured. With a real bucket, the pulls also reuse the TLS connections.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import statistics
+import time
+
+from simpleflow import storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pulls", type=int, default=20)
+    parser.add_argument("--bucket")
+    parser.add_argument("--key", default="simpleflow-benchmark/s3_storage")
+    args = parser.parse_args()
+
+    if args.bucket:
+        mock = contextlib.nullcontext()
+    else:
+        import boto3
+        from moto import mock_s3
+
+        mock = mock_s3()
+    with mock:
+        bucket = args.bucket or "simpleflow-benchmark"
+        if not args.bucket:
+            boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=bucket)
+        start = time.perf_counter()
+        storage.push_content(bucket, args.key, "x" * 1024)
+        first = time.perf_counter() - start
+
+        latencies = []
+        for _ in range(args.pulls):
+            start = time.perf_counter()
+            storage.pull_content(bucket, args.key)
+            latencies.append(time.perf_counter() - start)
+    print(f"bucket: {bucket} ({'S3' if args.bucket else 'moto'})")
+    print(f"push:   {first * 1000:8.1f} ms")
+    print(f"pulls:  median {statistics.median(latencies) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
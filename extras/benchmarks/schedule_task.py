@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Measure the cost of Executor.schedule_task() as the batch of decisions of a
+decision task grows.
+
+    python extras/benchmarks/schedule_task.py [--decisions 2000]
+
+The decisions limit is raised for the benchmark so that large batches can be
+measured; the request size limit still applies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from unittest import mock
+
+from simpleflow import Workflow, activity
+from simpleflow.swf import constants
+from simpleflow.swf.executor import Executor
+from simpleflow.swf.mapper.models import Domain
+from simpleflow.swf.task import ActivityTask
+
+
+@activity.with_attributes(task_list="benchmark", version="1")
+def noop(i):
+    return i
+
+
+class BenchmarkWorkflow(Workflow):
+    name = "benchmark"
+    version = "1"
+    task_list = "benchmark"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--decisions", type=int, default=2000)
+    parser.add_argument("--buckets", type=int, default=5)
+    args = parser.parse_args()
+
+    executor = Executor(Domain("benchmark"), BenchmarkWorkflow)
+    executor.reset()
+    timings = []
+    with (
+        mock.patch.object(constants, "MAX_DECISIONS", args.decisions + 2),
+        mock.patch.object(constants, "MAX_REQUEST_SIZE", 1000**3),
+    ):
+        for i in range(args.decisions):
+            task = ActivityTask(noop, i)
+            start = time.perf_counter()
+            executor.schedule_task(task)
+            timings.append(time.perf_counter() - start)
+
+    size = len(timings) // args.buckets
+    print(f"{'decisions':>15}  {'us/schedule_task':>16}")
+    for bucket in range(args.buckets):
+        chunk = timings[bucket * size : (bucket + 1) * size]
+        print(f"{bucket * size + 1:>6} - {(bucket + 1) * size:>6}  {sum(chunk) / len(chunk) * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Compare the cost of replaying a large fan-out as a Group and as a
+StreamingGroup with max_parallel.
+
+    python extras/benchmarks/streaming_group.py [--items 100000] [--finished 1000] [--max-parallel 100]
+
+A fake executor returns ready-made futures, so that only building the tasks
+and the GroupFuture bookkeeping are measured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from simpleflow import activity, futures
+from simpleflow.canvas import Group, StreamingGroup
+
+
+@activity.with_attributes(task_list="benchmark", version="1")
+def process_part(part):
+    return part
+
+
+class FakeExecutor:
+    """
+    Submitting the task of part i returns a finished future if
+    i < nb_finished, else a running one.
+    """
+
+    def __init__(self, nb_finished: int) -> None:
+        self.nb_finished = nb_finished
+        self.workflow = self
+
+    def submit(self, task) -> futures.Future:
+        future = futures.Future()
+        part = task.args[0]["part"]
+        if part < self.nb_finished:
+            future.set_finished(part)
+        else:
+            future.set_running()
+        return future
+
+
+def measure(build, executor):
+    tracemalloc.start()
+    start = time.perf_counter()
+    future = build().submit(executor)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return future, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--finished", type=int, default=1_000)
+    parser.add_argument("--max-parallel", type=int, default=100)
+    args = parser.parse_args()
+
+    executor = FakeExecutor(args.finished)
+    print(f"items:      {args.items} ({args.finished} finished, max_parallel={args.max_parallel})")
+    for name, build in (
+        (
+            "Group",
+            lambda: Group(*[(process_part, {"part": i}) for i in range(args.items)], max_parallel=args.max_parallel),
+        ),
+        (
+            "StreamingGroup",
+            lambda: StreamingGroup(
+                lambda i: (process_part, {"part": i}), size=args.items, max_parallel=args.max_parallel
+            ),
+        ),
+    ):
+        future, elapsed, peak = measure(build, executor)
+        print(
+            f"{name + ':':<16}{elapsed * 1000:8.1f} ms, peak {peak / 1024 / 1024:6.1f} MiB,"
+            f" {len(future.futures)} submitted"
+        )
+
+
+if __name__ == "__main__":
+    main()
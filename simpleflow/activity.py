@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import inspect
+from contextvars import ContextVar
 from typing import TYPE_CHECKING
 
 from . import registry, settings
@@ -16,6 +18,10 @@ __all__ = [
 ]
 
 
+# Context of the activity task executed by the current thread or coroutine.
+task_context: ContextVar[dict[str, Any] | None] = ContextVar("simpleflow_task_context", default=None)
+
+
 class NotSet:
     def __repr__(self):
         return "<Priority Not Set>"
@@ -119,8 +125,22 @@ class Activity:
 
     @property
     def context(self):
+        context = task_context.get()
+        if context is not None:
+            return context
         return getattr(self.callable, "context", None)
 
+    @property
+    def is_async(self) -> bool:
+        """
+        Whether the activity is a coroutine function, or a class with a
+        coroutine execute method.
+        """
+        callable = self._callable
+        if hasattr(callable, "execute"):
+            return inspect.iscoroutinefunction(callable.execute)
+        return inspect.iscoroutinefunction(callable)
+
     @property
     def name(self):
         if self._name is not None:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import hashlib
+import os
+import threading
 from contextvars import ContextVar
 from typing import Any
 
@@ -8,23 +10,78 @@ import boto3
 
 from simpleflow.utils import json_dumps
 
-_client_var: ContextVar[dict] = ContextVar("boto3_clients")
+# boto3 clients are thread-safe: the process shares them, and their connection
+# pools, between its threads
+_clients: dict[str, Any] = {}
+_clients_lock = threading.Lock()
 
+_resource_var: ContextVar[tuple[int, dict]] = ContextVar("boto3_resources")
 
-def get_or_create_boto3_client(*, region_name: str | None, service_name: str, **kwargs: Any):
+
+def _reset_clients() -> None:
+    """
+    Forget the clients inherited from a parent process, as they share its
+    connections.
+    """
+    global _clients, _clients_lock
+    _clients = {}
+    _clients_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_clients)
+
+
+def _get_resources() -> dict:
+    """
+    boto3 resources of the current context (e.g. thread): resources aren't
+    thread-safe. Those inherited from a parent process aren't reused.
+    """
+    pid, boto3_resources = _resource_var.get((0, {}))
+    if pid != os.getpid():
+        boto3_resources = {}
+        _resource_var.set((os.getpid(), boto3_resources))
+    return boto3_resources
+
+
+def _make_key(kind: str, region_name: str | None, service_name: str, kwargs: dict[str, Any]) -> str:
     d = {
+        "kind": kind,
         "region_name": region_name,
         "service_name": service_name,
     }
     d.update(kwargs)
-    key = hashlib.sha1(json_dumps(d).encode()).hexdigest()
-    boto3_clients = _client_var.get({})
-    if not boto3_clients:
-        _client_var.set(boto3_clients)
-
-    client = boto3_clients.get(key)
-    if client is None:
-        session = boto3.session.Session(region_name=region_name)
-        client = session.client(service_name, **kwargs)
-        boto3_clients[key] = client
+    if d.get("config") is not None:
+        d["config"] = vars(d["config"])  # botocore.config.Config
+    return hashlib.sha1(json_dumps(d, default=repr).encode()).hexdigest()
+
+
+def get_or_create_boto3_client(*, region_name: str | None, service_name: str, **kwargs: Any):
+    key = _make_key("client", region_name, service_name, kwargs)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            session = boto3.session.Session(region_name=region_name)
+            client = session.client(service_name, **kwargs)
+            _clients[key] = client
     return client
+
+
+def get_or_create_boto3_resource(*, region_name: str | None, service_name: str, **kwargs: Any):
+    """
+    Like get_or_create_boto3_client(), for a resource. Each thread gets its
+    own resource, on top of a client shared by the process.
+    """
+    key = _make_key("resource", region_name, service_name, kwargs)
+    boto3_resources = _get_resources()
+    resource = boto3_resources.get(key)
+    if resource is None:
+        with _clients_lock:
+            # the first resource of the process, whose client is shared
+            template = _clients.get(key)
+            if template is None:
+                session = boto3.session.Session(region_name=region_name)
+                template = session.resource(service_name, **kwargs)
+                _clients[key] = template
+        resource = type(template)(client=template.meta.client)
+        boto3_resources[key] = resource
+    return resource
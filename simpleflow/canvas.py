@@ -53,6 +53,15 @@ class FuncGroup(SubmittableContainer):
 
 
 class GroupFuture(futures.Future):
+    """
+    Future of a group: submits the activities, keeping at most max_parallel of
+    them pending or running, and aggregates their states and results.
+
+    The states of the futures are counted as they are added (see add_future),
+    so that large groups are handled in linear time. The activities can be
+    an iterator: they are then consumed only up to the submitted window.
+    """
+
     def __init__(self, activities, workflow, max_parallel=None, bubbles_exception_on_failure=True):
         super().__init__()
         self.activities = activities
@@ -60,51 +69,65 @@ class GroupFuture(futures.Future):
         self.workflow = workflow
         self.max_parallel = max_parallel
         self.bubbles_exception_on_failure = bubbles_exception_on_failure
+        self._reset_counts()
+        self._futures_contain_all_activities = False
 
         for a in self.activities:
-            if not self.max_parallel or self._count_pending_or_running < self.max_parallel:
-                future = workflow.submit(a)
-                self.futures.append(future)
-                if self._count_pending_or_running == self.max_parallel:
-                    break
+            self.add_future(workflow.submit(a))
+            if self.max_parallel and self._count_pending_or_running >= self.max_parallel:
+                break
+        else:
+            self._futures_contain_all_activities = True
 
         self.sync_state()
         self.sync_result()
 
+    def _reset_counts(self):
+        self.nb_pending = 0
+        self.nb_running = 0
+        self.nb_finished = 0
+        self.nb_cancelled = 0
+        self.nb_failed = 0
+
+    def add_future(self, future):
+        """
+        Add the future of a submitted activity and count its state.
+        """
+        self.futures.append(future)
+        state = future.state
+        if state == futures.FINISHED:
+            self.nb_finished += 1
+            if future.exception:
+                self.nb_failed += 1
+        elif state == futures.RUNNING:
+            self.nb_running += 1
+        elif state == futures.CANCELLED:
+            self.nb_cancelled += 1
+        else:
+            self.nb_pending += 1
+
     def sync_state(self):
-        if all(a.finished for a in self.futures) and self._futures_contain_all_activities:
+        if self.nb_finished == len(self.futures) and self._futures_contain_all_activities:
             self._state = futures.FINISHED
-        elif any(a.cancelled for a in self.futures):
+        elif self.nb_cancelled:
             self._state = futures.CANCELLED
-        elif any(a.running for a in self.futures):
+        elif self.nb_running:
             self._state = futures.RUNNING
 
     @property
     def _count_pending_or_running(self):
-        return len([True for f in self.futures if f.pending or f.running])
-
-    @property
-    def _futures_contain_all_activities(self):
-        return len(self.futures) == len(self.activities)
+        return self.nb_pending + self.nb_running
 
     def sync_result(self):
-        self._result = []
-        exceptions = []
-        for future in self.futures:
-            if future.finished:
-                self._result.append(future.result)
-                if self.bubbles_exception_on_failure is not False:
-                    exception = future.exception
-                    exceptions.append(exception)
-            else:
-                self._result.append(None)
-                exceptions.append(None)
-        if any(ex for ex in exceptions):
-            self._exception = AggregateException(exceptions)
+        self._result = [future.result if future.finished else None for future in self.futures]
+        if self.nb_failed and self.bubbles_exception_on_failure is not False:
+            self._exception = AggregateException(
+                [future.exception if future.finished else None for future in self.futures]
+            )
 
     @property
     def count_finished_activities(self):
-        return sum(1 if a.finished else 0 for a in self.futures)
+        return self.nb_finished
 
     def __repr__(self):
         return (
@@ -130,6 +153,13 @@ class Group(SubmittableContainer):
         self.extend(activities)
 
     def append(self, submittable, *args, **kwargs):
+        self.activities.append(self.make_submittable(submittable, *args, **kwargs))
+
+    def make_submittable(self, submittable, *args, **kwargs):
+        """
+        Build the Submittable or SubmittableContainer for an activity, a
+        workflow or a submittable, and its args.
+        """
         from simpleflow.workflow import Workflow
 
         if isinstance(submittable, (Submittable, SubmittableContainer)):
@@ -148,7 +178,7 @@ class Group(SubmittableContainer):
 
         if self.raises_on_failure is not None:
             submittable.propagate_attribute("raises_on_failure", self.raises_on_failure)
-        self.activities.append(submittable)
+        return submittable
 
     def extend(self, iterable):
         """
@@ -203,6 +233,64 @@ class Group(SubmittableContainer):
         self.workflow_tasks = []
 
 
+class StreamingGroup(Group):
+    """
+    Group whose activities are built lazily, as they are submitted.
+
+    The activities are given either as an iterable (typically a generator) of
+    submittables or tuples, or as a callable returning the i-th one, with the
+    number of activities as *size*. With *max_parallel*, only the activities
+    up to the submitted window are built: replaying a large fan-out then
+    costs memory proportional to the parallelism, not to the fan-out size.
+
+    A generator can only be consumed once: build a new StreamingGroup for each
+    submission, as a workflow's run() naturally does.
+    """
+
+    def __init__(self, activities, size=None, **options):
+        if callable(activities) and size is None:
+            raise ValueError("a size is needed when the activities are given as a callable")
+        super().__init__(**options)
+        self.source = activities
+        self.size = size
+        self.propagated_attributes = {}
+
+    def append(self, submittable, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} doesn't support appending activities")
+
+    def iter_activities(self, executor):
+        """
+        Build and yield the activities one at a time.
+        """
+        if callable(self.source):
+            items = (self.source(i) for i in range(self.size))
+        else:
+            items = self.source
+        for it in items:
+            submittable = self.make_submittable(*it) if isinstance(it, tuple) else self.make_submittable(it)
+            for attr, val in self.propagated_attributes.items():
+                submittable.propagate_attribute(attr, val)
+            self.set_workflow_tasks_executor(executor)
+            yield submittable
+
+    def submit(self, executor):
+        return self.future_class(
+            self.iter_activities(executor),
+            executor.workflow,
+            self.max_parallel,
+            self.bubbles_exception_on_failure,
+        )
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} at {id(self):#x}, source={self.source!r}, size={self.size}>"
+
+    def propagate_attribute(self, attr, val):
+        """
+        Propagate attribute to the activities of the Group, when built.
+        """
+        self.propagated_attributes[attr] = val
+
+
 class ChainFuture(GroupFuture):
     # Don't call GroupFuture.__init__ on purpose
     # noinspection PyMissingConstructor
@@ -222,6 +310,8 @@ class ChainFuture(GroupFuture):
         self._exception = None
         self.futures = []
         self._has_failed = False
+        self._reset_counts()
+        self._futures_contain_all_activities = False
 
         previous_result = None
         for i, a in enumerate(self.activities):
@@ -234,7 +324,7 @@ class ChainFuture(GroupFuture):
                     a.args.append(previous_result)
 
             future = workflow.submit(a)
-            self.futures.append(future)
+            self.add_future(future)
             if not future.finished:
                 break
             if future.exception and break_on_failure:
@@ -242,16 +332,18 @@ class ChainFuture(GroupFuture):
                 self._has_failed = True
                 break
             previous_result = future.result
+        else:
+            self._futures_contain_all_activities = True
 
         self.sync_state()
         self.sync_result()
 
     def sync_state(self):
-        if all(a.finished for a in self.futures) and (self._futures_contain_all_activities or self._has_failed):
+        if self.nb_finished == len(self.futures) and (self._futures_contain_all_activities or self._has_failed):
             self._state = futures.FINISHED
-        elif any(a.cancelled for a in self.futures):
+        elif self.nb_cancelled:
             self._state = futures.CANCELLED
-        elif any(a.running for a in self.futures):
+        elif self.nb_running:
             self._state = futures.RUNNING
 
 
@@ -580,6 +580,31 @@ def task_info(
     print(with_format(ctx)(helpers.get_task)(domain, workflow_id, task_id, details))
 
 
+@click.option(
+    "--preload",
+    type=comma_separated_list,
+    help="Comma-separated modules imported once before forking the decider processes.",
+)
+@click.option(
+    "--max-decisions-per-child",
+    type=int,
+    help="Replace a pooled decision process after this many decisions.",
+)
+@click.option(
+    "--decision-pool-size",
+    type=int,
+    help="Number of long-lived processes taking decisions, per decider process (default: fork per decision).",
+)
+@click.option(
+    "--max-processes",
+    type=int,
+    help="Autoscale the number of decider processes up to this, from the backlog of the task list.",
+)
+@click.option(
+    "--min-processes",
+    type=int,
+    help="Minimum number of decider processes when autoscaling (default: 1).",
+)
 @click.option("--nb-processes", "-N", type=int)
 @click.option("--log-level", "-l")
 @click.option("--task-list", "-t")
@@ -592,6 +617,11 @@ def start_decider(
     task_list: str,
     log_level: str,
     nb_processes: int,
+    min_processes: int | None,
+    max_processes: int | None,
+    decision_pool_size: int | None,
+    max_decisions_per_child: int | None,
+    preload: list[str] | None,
 ) -> None:
     if log_level:
         logger.warning("Deprecated: --log-level will be removed, use LOG_LEVEL environment variable instead")
@@ -601,6 +631,11 @@ def start_decider(
         task_list,
         None,
         nb_processes,
+        decision_pool_size=decision_pool_size,
+        max_decisions_per_child=max_decisions_per_child,
+        preload=preload,
+        min_processes=min_processes,
+        max_processes=max_processes,
     )
 
 
@@ -611,6 +646,38 @@ def start_decider(
     help="Provide a base64 encoded json dump of the SWF poll response, instead of polling SWF",
 )
 @click.option("--one-task", is_flag=True, help="Run only one task and shut down (no supervisor).")
+@click.option(
+    "--preload",
+    type=comma_separated_list,
+    help="Comma-separated modules imported once before forking the worker processes.",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(["process", "thread"]),
+    default="process",
+    help="Run activity tasks in processes, or in --nb-slots threads of each worker process.",
+)
+@click.option(
+    "--nb-coroutines",
+    type=int,
+    help="Run up to this many async activities concurrently on an event loop, per worker process.",
+)
+@click.option(
+    "--nb-slots",
+    type=int,
+    default=1,
+    help="Number of activity tasks run concurrently by each worker process.",
+)
+@click.option(
+    "--max-tasks-per-child",
+    type=int,
+    help="Replace a reused activity process after this many tasks.",
+)
+@click.option(
+    "--reuse-processes",
+    is_flag=True,
+    help="Run activity tasks in long-lived processes (default: fork per task).",
+)
 @click.option(
     "--heartbeat",
     type=int,
@@ -618,6 +685,16 @@ def start_decider(
     default=60,
     help="Heartbeat interval in seconds (0 to disable heartbeating).",
 )
+@click.option(
+    "--max-processes",
+    type=int,
+    help="Autoscale the number of worker processes up to this, from the backlog of the task list.",
+)
+@click.option(
+    "--min-processes",
+    type=int,
+    help="Minimum number of worker processes when autoscaling (default: 1).",
+)
 @click.option("--nb-processes", "-N", type=int)
 @click.option("--log-level", "-l")
 @click.option("--task-list", "-t")
@@ -628,7 +705,15 @@ def start_worker(
     task_list,
     log_level,
     nb_processes,
+    min_processes,
+    max_processes,
     heartbeat,
+    reuse_processes,
+    max_tasks_per_child,
+    nb_slots,
+    nb_coroutines,
+    executor,
+    preload,
     one_task,
     poll_data,
     middleware_pre_execution,
@@ -653,6 +738,14 @@ def start_worker(
         heartbeat=heartbeat,
         one_task=one_task,
         poll_data=poll_data,
+        reuse_processes=reuse_processes,
+        max_tasks_per_child=max_tasks_per_child,
+        nb_slots=nb_slots,
+        nb_coroutines=nb_coroutines,
+        executor=executor,
+        preload=preload,
+        min_processes=min_processes,
+        max_processes=max_processes,
     )
 
 
@@ -25,7 +25,12 @@ MAX_LOG_FIELD = 500 * 1024  # 500kB
 
 # Jumbo fields
 JUMBO_FIELDS_PREFIX = "simpleflow+s3://"
+# Stored compressed with gzip (SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION)
+JUMBO_FIELDS_GZIP_PREFIX = "simpleflow+s3+gzip://"
+JUMBO_FIELDS_PREFIXES = (JUMBO_FIELDS_PREFIX, JUMBO_FIELDS_GZIP_PREFIX)
 JUMBO_FIELDS_MAX_SIZE = 5 * 1024**2  # 5MB
+# Compressed with gzip and base64-encoded in place of the field, without S3
+INLINE_GZIP_PREFIX = "simpleflow+gzip:"
 
 # Cache directory
 # No security considerations expected :)
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
+import atexit
 import functools
 import json
 import logging
+import mmap
 import os
+import select
+import stat
+import struct
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import traceback
 from inspect import signature
 
 import psutil
 
-from simpleflow import format
+from simpleflow import format, settings
 from simpleflow import logger as simpleflow_logger
 from simpleflow.exceptions import ExecutionError, ExecutionTimeoutError
-from simpleflow.utils import import_from_module, json_dumps
+from simpleflow.utils import import_from_module, json_dump, json_dumps
 
 MAX_ARGUMENTS_JSON_LENGTH = 65536
 
@@ -123,12 +129,340 @@ def wait_subprocess(process, timeout: int | None = None, command_info: str | lis
     return rc
 
 
+def kill_child_processes() -> None:
+    process = psutil.Process(os.getpid())
+    children = process.children(recursive=True)
+
+    for child in children:
+        try:
+            child.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, still_alive = psutil.wait_procs(children, timeout=0.3)
+    for child in still_alive:
+        try:
+            child.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+_FRAME_HEADER = struct.Struct("!Q")
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def write_frame(fd: int, *parts: bytes) -> None:
+    """
+    Write the concatenation of *parts* to *fd*, prefixed with its length.
+    """
+    _write_all(fd, _FRAME_HEADER.pack(sum(len(part) for part in parts)))
+    for part in parts:
+        _write_all(fd, part)
+
+
+def _read_exactly(fd: int, size: int, deadline: float | None) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    poller = select.poll()
+    poller.register(fd, select.POLLIN)
+    while view:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not poller.poll(remaining * 1000):
+                raise TimeoutError
+        nbytes = os.readv(fd, [view])
+        if not nbytes:
+            raise EOFError
+        view = view[nbytes:]
+    return buffer
+
+
+def read_frame(fd: int, deadline: float | None = None) -> bytearray:
+    """
+    Read a frame written by :func:`write_frame`.
+
+    :raise EOFError: if *fd* was closed.
+    :raise TimeoutError: if the frame isn't read by *deadline* (``time.monotonic()``).
+    """
+    (size,) = _FRAME_HEADER.unpack(_read_exactly(fd, _FRAME_HEADER.size, deadline))
+    return _read_exactly(fd, size, deadline)
+
+
+def anonymous_file(tmp_dir: str | None = None):
+    """
+    Binary file in memory (memfd) where supported, else a temporary file in
+    *tmp_dir*. Its descriptor is close-on-exec, unless passed in ``pass_fds``.
+    """
+    if hasattr(os, "memfd_create"):
+        return open(os.memfd_create("simpleflow-execute"), "w+b")
+    return tempfile.TemporaryFile(dir=tmp_dir)
+
+
+def read_text(fd: int) -> str:
+    """
+    Decode the UTF-8 content of the file *fd* from a memory map, without
+    reading it into an intermediate bytes object. Pipes and other files that
+    can't be mapped are read until EOF.
+    """
+    stat_result = os.fstat(fd)
+    if not stat.S_ISREG(stat_result.st_mode):
+        chunks = []
+        while chunk := os.read(fd, 1024 * 1024):
+            chunks.append(chunk)
+        return str(b"".join(chunks), "utf-8", "replace")
+    size = stat_result.st_size
+    if not size:
+        return ""
+    with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as content:
+        return str(content, "utf-8", "replace")
+
+
+def get_tmp_dir(env: dict | None) -> str | None:
+    if env:
+        for envname in "TMPDIR", "TEMP", "TMP":
+            tmp_dir = env.get(envname)
+            if tmp_dir:
+                return tmp_dir
+    return None
+
+
+class PythonServer:
+    """
+    A ``python -m simpleflow.execute --server`` process: it executes the
+    callables sent over a pipe, one at a time, and keeps its imports between
+    calls.
+
+    A request is the JSON header of the call, a line feed, and the JSON
+    arguments. A response is ``r`` if the JSON result was written to the
+    result file, or ``e`` followed by the JSON error details.
+    """
+
+    def __init__(self, interpreter: str = "python", env: dict | None = None) -> None:
+        self.key = PythonServerPool.make_key(interpreter, env)
+        self.result_file = anonymous_file(get_tmp_dir(env))
+        request_fd, self.request_fd = os.pipe()
+        self.response_fd, response_fd = os.pipe()
+        self.command = [
+            interpreter,
+            "-m",
+            "simpleflow.execute",
+            "--server",
+            f"--request-fd={request_fd}",
+            f"--response-fd={response_fd}",
+            f"--result-fd={self.result_file.fileno()}",
+        ]
+        try:
+            self.process = subprocess.Popen(  # nosec
+                self.command,
+                close_fds=True,
+                pass_fds=(request_fd, response_fd, self.result_file.fileno()),
+                env=env,
+            )
+        except BaseException:
+            os.close(self.request_fd)
+            os.close(self.response_fd)
+            self.result_file.close()
+            raise
+        finally:
+            os.close(request_fd)
+            os.close(response_fd)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} pid={self.process.pid} key={self.key[0]!r}>"
+
+    @property
+    def is_alive(self) -> bool:
+        return self.request_fd >= 0 and self.process.poll() is None
+
+    def call(
+        self,
+        funcname: str,
+        arguments_json: str,
+        context: dict | None = None,
+        logger_name: str | None = None,
+        kill_children: bool = False,
+        timeout: float | None = None,
+    ) -> str:
+        """
+        Execute *funcname* and return its JSON result.
+
+        It has the semantics of a ``python -m simpleflow.execute`` process:
+        the server is terminated on timeout, and an exit of the server is an
+        :class:`ExecutionError`, unless it is a ``sys.exit(0)``.
+        """
+        header = json_dumps(
+            {
+                "funcname": funcname,
+                "context": context,
+                "logger_name": logger_name,
+                "kill_children": kill_children,
+            }
+        )
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            write_frame(self.request_fd, header.encode(), b"\n", arguments_json.encode())
+            response = read_frame(self.response_fd, deadline)
+        except TimeoutError:
+            self.close(terminate=True)
+            raise ExecutionTimeoutError(command=[*self.command, funcname], timeout_value=timeout)
+        except (EOFError, BrokenPipeError):
+            self.close()
+            if self.process.wait():
+                raise ExecutionError
+            return ""
+        if response[:1] == b"e":
+            err_output = response[1:].decode(errors="replace")
+            raise ExecutionError(err_output) if err_output else ExecutionError
+        result_str = read_text(self.result_file.fileno())
+        self.result_file.truncate(0)
+        return result_str
+
+    def close(self, terminate: bool = False) -> None:
+        """
+        Close the pipes, which stops an idle server; *terminate* also stops a
+        busy one.
+        """
+        for fd in self.request_fd, self.response_fd:
+            if fd >= 0:
+                os.close(fd)
+        self.request_fd = self.response_fd = -1
+        self.result_file.close()
+        if terminate and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+class PythonServerPool:
+    """
+    Idle :class:`PythonServer`'s per interpreter and environment, up to
+    ``SIMPLEFLOW_EXECUTE_POOL_SIZE`` of each.
+
+    A forked process doesn't share the servers of its parent: it starts its own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: dict[tuple, list[PythonServer]] = {}
+
+    @staticmethod
+    def make_key(interpreter: str, env: dict | None) -> tuple:
+        return interpreter, None if env is None else tuple(sorted(env.items()))
+
+    def acquire(self, interpreter: str = "python", env: dict | None = None) -> PythonServer:
+        key = self.make_key(interpreter, env)
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                server = idle.pop()
+                if server.is_alive:
+                    return server
+                server.close()
+        return PythonServer(interpreter, env)
+
+    def release(self, server: PythonServer) -> None:
+        if server.is_alive:
+            with self._lock:
+                idle = self._idle.setdefault(server.key, [])
+                if len(idle) < settings.SIMPLEFLOW_EXECUTE_POOL_SIZE:
+                    idle.append(server)
+                    return
+        server.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for servers in idle.values():
+            for server in servers:
+                server.close()
+
+    def _forget(self) -> None:
+        # After a fork: the servers are still used by the parent.
+        self._lock = threading.Lock()
+        self.close()
+
+
+python_servers = PythonServerPool()
+atexit.register(python_servers.close)
+os.register_at_fork(after_in_child=python_servers._forget)
+
+
+def _execute_in_subprocess(
+    func,
+    interpreter: str,
+    logger_name: str,
+    timeout: int | None,
+    kill_children: bool,
+    env: dict | None,
+    context: dict,
+    arguments_json: str,
+) -> str:
+    command = "simpleflow.execute"  # name of a module.
+    tmp_dir = get_tmp_dir(env)
+    with anonymous_file(tmp_dir) as result_fd, anonymous_file(tmp_dir) as error_fd:
+        dup_result_fd = os.dup(result_fd.fileno())  # remove FD_CLOEXEC
+        dup_error_fd = os.dup(error_fd.fileno())  # remove FD_CLOEXEC
+        full_command = [
+            interpreter,
+            "-m",
+            command,  # execute module a script.
+            get_name(func),
+            f"--logger-name={logger_name}",
+            f"--result-fd={dup_result_fd}",
+            f"--error-fd={dup_error_fd}",
+            f"--context={json_dumps(context)}",
+        ]
+        if len(arguments_json) < MAX_ARGUMENTS_JSON_LENGTH:  # command-line limit on Linux: 128K
+            full_command.append(arguments_json)
+            arg_file = None
+            arg_fd = None
+        else:
+            arg_file = anonymous_file(tmp_dir)
+            arg_file.write(arguments_json.encode())
+            arg_file.flush()
+            arg_file.seek(0)
+            arg_fd = os.dup(arg_file.fileno())
+            full_command.append(f"--arguments-json-fd={arg_fd}")
+            full_command.append("foo")  # dummy funcarg
+        if kill_children:
+            full_command.append("--kill-children")
+        close_fds = True
+        pass_fds = [dup_result_fd, dup_error_fd]
+        if arg_file:
+            pass_fds.append(arg_fd)
+        process = subprocess.Popen(  # nosec
+            full_command,
+            bufsize=-1,
+            close_fds=close_fds,
+            pass_fds=pass_fds,
+            env=env,
+        )
+        rc = wait_subprocess(process, timeout=timeout, command_info=full_command)
+        os.close(dup_result_fd)
+        os.close(dup_error_fd)
+        if arg_file:
+            arg_file.close()
+        if rc:
+            err_output = read_text(error_fd.fileno())
+            raise ExecutionError(err_output) if err_output else ExecutionError
+
+        return read_text(result_fd.fileno())
+
+
 def python(
     interpreter: str = "python",
     logger_name: str = __name__,
     timeout: int | None = None,
     kill_children: bool = False,
     env: dict | None = None,
+    persistent: bool | None = None,
 ):
     """
     Execute a callable as an external Python program.
@@ -138,77 +472,37 @@ def python(
 
     Arguments of the decorated callable must be serializable in JSON.
 
+    With *persistent* (default: ``SIMPLEFLOW_EXECUTE_PERSISTENT``), the
+    callable is executed by a :class:`PythonServer` of the interpreter and
+    environment, reused between calls, instead of a new process.
+
     """
 
     def wrap_callable(func):
         @functools.wraps(func)
         def execute(*args, **kwargs):
             logger = logging.getLogger(logger_name)
-            command = "simpleflow.execute"  # name of a module.
             sys.stdout.flush()
             sys.stderr.flush()
-            result_str = None  # useless
             context = kwargs.pop("context", {})
-            tmp_dir = None
-            if env:
-                for envname in "TMPDIR", "TEMP", "TMP":
-                    tmp_dir = env.get(envname)
-                    if tmp_dir:
-                        break
-            with (
-                tempfile.TemporaryFile(dir=tmp_dir) as result_fd,
-                tempfile.TemporaryFile(dir=tmp_dir, buffering=0) as error_fd,
-            ):
-                dup_result_fd = os.dup(result_fd.fileno())  # remove FD_CLOEXEC
-                dup_error_fd = os.dup(error_fd.fileno())  # remove FD_CLOEXEC
-                arguments_json = format_arguments_json(*args, **kwargs)
-                full_command = [
-                    interpreter,
-                    "-m",
-                    command,  # execute module a script.
-                    get_name(func),
-                    f"--logger-name={logger_name}",
-                    f"--result-fd={dup_result_fd}",
-                    f"--error-fd={dup_error_fd}",
-                    f"--context={json_dumps(context)}",
-                ]
-                if len(arguments_json) < MAX_ARGUMENTS_JSON_LENGTH:  # command-line limit on Linux: 128K
-                    full_command.append(arguments_json)
-                    arg_file = None
-                    arg_fd = None
-                else:
-                    arg_file = tempfile.TemporaryFile(dir=tmp_dir)
-                    arg_file.write(arguments_json.encode())
-                    arg_file.flush()
-                    arg_file.seek(0)
-                    arg_fd = os.dup(arg_file.fileno())
-                    full_command.append(f"--arguments-json-fd={arg_fd}")
-                    full_command.append("foo")  # dummy funcarg
-                if kill_children:
-                    full_command.append("--kill-children")
-                close_fds = True
-                pass_fds = [dup_result_fd, dup_error_fd]
-                if arg_file:
-                    pass_fds.append(arg_fd)
-                process = subprocess.Popen(  # nosec
-                    full_command,
-                    bufsize=-1,
-                    close_fds=close_fds,
-                    pass_fds=pass_fds,
-                    env=env,
+            arguments_json = format_arguments_json(*args, **kwargs)
+            if persistent if persistent is not None else settings.SIMPLEFLOW_EXECUTE_PERSISTENT:
+                server = python_servers.acquire(interpreter, env)
+                try:
+                    result_str = server.call(
+                        get_name(func),
+                        arguments_json,
+                        context=context,
+                        logger_name=logger_name,
+                        kill_children=kill_children,
+                        timeout=timeout,
+                    )
+                finally:
+                    python_servers.release(server)
+            else:
+                result_str = _execute_in_subprocess(
+                    func, interpreter, logger_name, timeout, kill_children, env, context, arguments_json
                 )
-                rc = wait_subprocess(process, timeout=timeout, command_info=full_command)
-                os.close(dup_result_fd)
-                os.close(dup_error_fd)
-                if arg_file:
-                    arg_file.close()
-                if rc:
-                    error_fd.seek(0)
-                    err_output = error_fd.read().decode(errors="replace")
-                    raise ExecutionError(err_output) if err_output else ExecutionError
-
-                result_fd.seek(0)
-                result_str = result_fd.read().decode(errors="replace")
 
             if not result_str:
                 return None
@@ -268,6 +562,95 @@ def program(path=None, argument_format=format_arguments):
     return wrap_callable
 
 
+def get_callable(funcname: str):
+    callable_ = import_from_module(funcname)
+    if hasattr(callable_, "__wrapped__"):
+        callable_ = callable_.__wrapped__
+    return callable_
+
+
+def call(callable_, arguments: dict, context: dict | None = None):
+    """
+    Execute *callable_* with *arguments* (``{"args": [...], "kwargs": {...}}``)
+    and return its result.
+
+    A class is instantiated, given the *context*, and its ``execute()`` method
+    called.
+    """
+    args = arguments.get("args", ())
+    kwargs = arguments.get("kwargs", {})
+    if hasattr(callable_, "execute"):
+        inst = callable_(*args, **kwargs)
+        if context is not None:
+            inst.context = context
+        result = inst.execute()
+        if hasattr(inst, "post_execute"):
+            inst.post_execute()
+    else:
+        if context is not None:
+            callable_.context = context
+        result = callable_(*args, **kwargs)
+    return result
+
+
+def format_error_details() -> bytes:
+    """
+    JSON details of the exception being handled.
+    """
+    exc_type, exc_value, exc_traceback = sys.exc_info()
+    tb = traceback.format_tb(exc_traceback)
+    details = json_dumps(
+        {
+            "error": exc_type.__name__,
+            "message": str(exc_value),
+            "traceback": tb,
+        },
+        default=repr,
+    )
+    return details.encode("utf-8")
+
+
+def write_result(result, fd: int) -> None:
+    """
+    Write *result* in JSON to *fd* by chunks.
+    """
+    with open(fd, "w", encoding="utf-8", closefd=False) as result_file:
+        json_dump(result, result_file)
+
+
+def serve(request_fd: int, response_fd: int, result_fd: int) -> None:
+    """
+    Execute the calls sent by a :class:`PythonServer` until *request_fd* is
+    closed.
+    """
+    while True:
+        try:
+            request = read_frame(request_fd)
+        except EOFError:
+            return
+        header, _, arguments_json = request.partition(b"\n")
+        header = json.loads(header)
+        logger = logging.getLogger(header["logger_name"]) if header["logger_name"] else simpleflow_logger
+        try:
+            try:
+                arguments = format.decode(arguments_json.decode())
+            except Exception:
+                raise ValueError(f"cannot load arguments from {arguments_json[:1024]!r}")
+            result = call(get_callable(header["funcname"]), arguments, header["context"])
+            os.ftruncate(result_fd, 0)
+            os.lseek(result_fd, 0, os.SEEK_SET)
+            write_result(result, result_fd)
+            response = b"r"
+        except Exception as err:
+            logger.error(f"Exception: {err}")
+            response = b"e" + format_error_details()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        if header["kill_children"]:
+            kill_child_processes()
+        write_frame(response_fd, response)
+
+
 def main():
     """
     When executed as a script, this module expects the name of a callable as
@@ -311,10 +694,12 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "funcname",
+        nargs="?",
         help="name of the callable to execute",
     )
     parser.add_argument(
         "funcargs",
+        nargs="?",
         help="callable arguments in JSON",
     )
     parser.add_argument(
@@ -351,32 +736,41 @@ def main():
         action="store_true",
         help="kill child processes on exit",
     )
-    cmd_arguments = parser.parse_args()
-
-    def kill_child_processes():
-        process = psutil.Process(os.getpid())
-        children = process.children(recursive=True)
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="execute the callables sent on --request-fd (see PythonServer)",
+    )
+    parser.add_argument(
+        "--request-fd",
+        type=int,
+        metavar="N",
+        help="server request file descriptor",
+    )
+    parser.add_argument(
+        "--response-fd",
+        type=int,
+        metavar="N",
+        help="server response file descriptor",
+    )
+    cmd_arguments = parser.parse_intermixed_args()
 
-        for child in children:
-            try:
-                child.terminate()
-            except psutil.NoSuchProcess:
-                pass
-        _, still_alive = psutil.wait_procs(children, timeout=0.3)
-        for child in still_alive:
-            try:
-                child.kill()
-            except psutil.NoSuchProcess:
-                pass
+    if cmd_arguments.server:
+        if cmd_arguments.request_fd is None or cmd_arguments.response_fd is None or cmd_arguments.result_fd == 1:
+            parser.error("--server requires --request-fd, --response-fd and --result-fd")
+        serve(cmd_arguments.request_fd, cmd_arguments.response_fd, cmd_arguments.result_fd)
+        return
 
     funcname = cmd_arguments.funcname
+    if funcname is None:
+        parser.error("the following arguments are required: funcname")
     if cmd_arguments.arguments_json_fd is None:
         content = cmd_arguments.funcargs
         if content is None:
             parser.error("the following arguments are required: funcargs")
     else:
-        with os.fdopen(cmd_arguments.arguments_json_fd) as arguments_json_file:
-            content = arguments_json_file.read()
+        content = read_text(cmd_arguments.arguments_json_fd)
+        os.close(cmd_arguments.arguments_json_fd)
     try:
         arguments = format.decode(content)
     except Exception:
@@ -385,40 +779,15 @@ def main():
         logger = logging.getLogger(cmd_arguments.logger_name)
     else:
         logger = simpleflow_logger
-    callable_ = import_from_module(funcname)
-    if hasattr(callable_, "__wrapped__"):
-        callable_ = callable_.__wrapped__
-    args = arguments.get("args", ())
-    kwargs = arguments.get("kwargs", {})
+    callable_ = get_callable(funcname)
     context = json.loads(cmd_arguments.context) if cmd_arguments.context is not None else None
     try:
-        if hasattr(callable_, "execute"):
-            inst = callable_(*args, **kwargs)
-            if context is not None:
-                inst.context = context
-            result = inst.execute()
-            if hasattr(inst, "post_execute"):
-                inst.post_execute()
-        else:
-            if context is not None:
-                callable_.context = context
-            result = callable_(*args, **kwargs)
+        result = call(callable_, arguments, context)
     except Exception as err:
         logger.error(f"Exception: {err}")
-        exc_type, exc_value, exc_traceback = sys.exc_info()
-        tb = traceback.format_tb(exc_traceback)
-        details = json_dumps(
-            {
-                "error": exc_type.__name__,
-                "message": str(exc_value),
-                "traceback": tb,
-            },
-            default=repr,
-        )
         if cmd_arguments.error_fd == 2:
             sys.stderr.flush()
-        details = details.encode("utf-8")
-        os.write(cmd_arguments.error_fd, details)
+        os.write(cmd_arguments.error_fd, format_error_details())
         if cmd_arguments.kill_children:
             kill_child_processes()
         sys.exit(1)
@@ -426,9 +795,7 @@ def main():
     if cmd_arguments.result_fd == 1:  # stdout (legacy)
         sys.stdout.flush()  # may have print's in flight
         os.write(cmd_arguments.result_fd, b"\n")
-    result = json_dumps(result)
-    result = result.encode("utf-8")
-    os.write(cmd_arguments.result_fd, result)
+    write_result(result, cmd_arguments.result_fd)
     if cmd_arguments.kill_children:
         kill_child_processes()
 
@@ -1,24 +1,57 @@
 from __future__ import annotations
 
+import base64
+import functools
+import gzip
+import hashlib
 import os
-from sqlite3 import OperationalError
-from typing import Any, cast
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, cast
 from uuid import uuid4
 
 import lazy_object_proxy
-from diskcache import Cache
 
-from simpleflow import constants, logger, storage
-from simpleflow.settings import SIMPLEFLOW_ENABLE_DISK_CACHE
+from simpleflow import constants, logger, settings, storage
+from simpleflow.jumbo_fields_cache import DiskJumboFieldsCache, KnownJumboFieldsKeys, MemoryJumboFieldsCache
 from simpleflow.utils import json_dumps, json_loads_or_raw
 
-JUMBO_FIELDS_MEMORY_CACHE: dict[str, str] = {}
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+JUMBO_FIELDS_MEMORY_CACHE = MemoryJumboFieldsCache()
+JUMBO_FIELDS_DISK_CACHE = DiskJumboFieldsCache()
+JUMBO_FIELDS_KNOWN_KEYS = KnownJumboFieldsKeys()
+# (pid, max_workers, executor) of the prefetches, kept between decisions
+_prefetch_executor: tuple[int, int, ThreadPoolExecutor] | None = None
+_prefetch_executor_lock = threading.Lock()
 
 
 class JumboTooLargeError(ValueError):
     pass
 
 
+class LazyFieldProxy(lazy_object_proxy.Proxy):
+    """
+    Lazy proxy on a decoded field.
+
+    Pickling it stores the factory, not the wrapped value, so a parsed history
+    can be persisted without decoding its fields.
+    """
+
+    def __reduce_ex__(self, protocol):
+        return type(self), (self.__factory__,)
+
+    __reduce__ = __reduce_ex__
+
+
+class JumboFieldProxy(LazyFieldProxy):
+    """
+    Lazy proxy on a jumbo field: pickling it doesn't pull it from S3.
+    """
+
+
 def _jumbo_fields_bucket() -> str | None:
     # wrapped into a function so easier to override for tests
     bucket = os.getenv("SIMPLEFLOW_JUMBO_FIELDS_BUCKET")
@@ -30,20 +63,19 @@ def _jumbo_fields_bucket() -> str | None:
     return bucket
 
 
+def is_jumbo_field(content: str) -> bool:
+    return content.startswith(constants.JUMBO_FIELDS_PREFIXES)
+
+
 def decode(content: str | None, parse_json: bool = True, use_proxy: bool = True) -> Any:
     if content is None:
         return content
-    if content.startswith(constants.JUMBO_FIELDS_PREFIX):
-
-        def unwrap():
-            location, _size = content.split()
-            value = _pull_jumbo_field(location)
-            if parse_json:
-                return json_loads_or_raw(value)
-            return value
-
+    if content.startswith(constants.INLINE_GZIP_PREFIX):
+        content = _decompress(base64.b64decode(content[len(constants.INLINE_GZIP_PREFIX) :]))
+    elif is_jumbo_field(content):
+        unwrap = functools.partial(_unwrap_jumbo_field, content, parse_json)
         if use_proxy:
-            return lazy_object_proxy.Proxy(unwrap)
+            return JumboFieldProxy(unwrap)
         return unwrap()
 
     if parse_json:
@@ -52,6 +84,34 @@ def decode(content: str | None, parse_json: bool = True, use_proxy: bool = True)
     return content
 
 
+def decode_lazily(content: str | None, parse_json: bool = True) -> Any:
+    """
+    Like decode(), on first use of the returned proxy. Empty and null fields
+    are decoded at once, so that they stay None.
+    """
+    if not content or content == "null":
+        return decode(content, parse_json)
+    return LazyFieldProxy(functools.partial(decode, content, parse_json, False))
+
+
+def _unwrap_jumbo_field(content: str, parse_json: bool) -> Any:
+    location, _size = content.split()
+    value = _pull_jumbo_field(location)
+    if parse_json:
+        return json_loads_or_raw(value)
+    return value
+
+
+def _compress(message: str) -> bytes:
+    if settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION != "gzip":
+        raise ValueError(f"unknown jumbo fields compression: {settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION!r}")
+    return gzip.compress(message.encode(), mtime=0)
+
+
+def _decompress(content: bytes) -> str:
+    return gzip.decompress(content).decode()
+
+
 def encode(message: str | None, max_length: int, allow_jumbo_fields: bool = True) -> str | None:
     if not message:
         return message
@@ -59,6 +119,16 @@ def encode(message: str | None, max_length: int, allow_jumbo_fields: bool = True
     can_use_jumbo_fields = allow_jumbo_fields and _jumbo_fields_bucket()
 
     if len(message) > max_length:
+        compressed = None
+        if (
+            allow_jumbo_fields
+            and settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION
+            and len(message) <= constants.JUMBO_FIELDS_MAX_SIZE
+        ):
+            compressed = _compress(message)
+            if len(constants.INLINE_GZIP_PREFIX) + (len(compressed) + 2) // 3 * 4 <= max_length:
+                return constants.INLINE_GZIP_PREFIX + base64.b64encode(compressed).decode()
+
         if not can_use_jumbo_fields:
             _log_message_too_long(message)
             raise JumboTooLargeError(f"Message too long ({len(message)} chars)")
@@ -67,7 +137,7 @@ def encode(message: str | None, max_length: int, allow_jumbo_fields: bool = True
             _log_message_too_long(message)
             raise JumboTooLargeError(f"Message too long even for a jumbo field ({len(message)} chars)")
 
-        jumbo_signature = _push_jumbo_field(message)
+        jumbo_signature = _push_jumbo_field(message, compressed)
         if len(jumbo_signature) > max_length:
             raise JumboTooLargeError(
                 f"Jumbo field signature is longer than the max allowed length "
@@ -79,76 +149,185 @@ def encode(message: str | None, max_length: int, allow_jumbo_fields: bool = True
 
 
 def _get_cached(path: str) -> str | None:
-    # 1/ memory cache
-    if path in JUMBO_FIELDS_MEMORY_CACHE:
-        return JUMBO_FIELDS_MEMORY_CACHE[path]
-
-    # 2/ disk cache
-    if SIMPLEFLOW_ENABLE_DISK_CACHE:
-        try:
-            # NB: this cache may also be triggered on activity workers, where it's not that
-            # useful. The performance hit should be minimal. To be improved later.
-            # NB2: cache has to be lazily instantiated here, cache objects do not survive forks,
-            # see DiskCache docs.
-            cache = Cache(constants.CACHE_DIR)
-            # generate a dedicated cache key because this cache may be shared with other
-            # features of simpleflow at some point
-            cache_key = "jumbo_fields/" + path.split("/")[-1]
-            if cache_key in cache:
-                logger.debug(f"diskcache: getting key={cache_key} from cache_dir={constants.CACHE_DIR}")
-                return cache[cache_key]
-        except OperationalError:
-            logger.warning("diskcache: got an OperationalError, skipping cache usage")
-
-    # nothing to return, but better be explicit here
-    return
+    content = JUMBO_FIELDS_MEMORY_CACHE.get(path)
+    if content is None and settings.SIMPLEFLOW_ENABLE_DISK_CACHE:
+        # NB: this cache may also be triggered on activity workers, where it's not that
+        # useful. The performance hit should be minimal. To be improved later.
+        content = JUMBO_FIELDS_DISK_CACHE.get(path.split("/")[-1])
+        if content is not None:
+            JUMBO_FIELDS_MEMORY_CACHE.set(path, content)
+    return content
 
 
 def _set_cached(path: str, content: str) -> None:
-    # 1/ memory cache
-    JUMBO_FIELDS_MEMORY_CACHE[path] = content
-
-    # 2/ disk cache
-    if SIMPLEFLOW_ENABLE_DISK_CACHE:
-        try:
-            cache = Cache(constants.CACHE_DIR)
-            cache_key = "jumbo_fields/" + path.split("/")[-1]
-            logger.debug(f"diskcache: setting key={cache_key} on cache_dir={constants.CACHE_DIR}")
-            cache.set(cache_key, content, expire=3 * constants.HOUR)
-        except OperationalError:
-            logger.warning("diskcache: got an OperationalError on write, skipping cache write")
-
-
-def _push_jumbo_field(message: str) -> str:
+    JUMBO_FIELDS_MEMORY_CACHE.set(path, content)
+    if settings.SIMPLEFLOW_ENABLE_DISK_CACHE:
+        JUMBO_FIELDS_DISK_CACHE.set(path.split("/")[-1], content)
+
+
+def jumbo_fields_cache_metrics() -> dict[str, dict[str, int]]:
+    """
+    Counters of the jumbo fields caches of this process.
+    """
+    return {
+        "memory": JUMBO_FIELDS_MEMORY_CACHE.metrics(),
+        "disk": JUMBO_FIELDS_DISK_CACHE.metrics(),
+    }
+
+
+def _push_jumbo_field(message: str, compressed: bytes | None = None) -> str:
+    """
+    Store *message* on S3, compressed if SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION
+    is set (*compressed* if already done), and return its signature.
+
+    With SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED, the object is named after
+    a hash of its content, and isn't uploaded again if it already exists,
+    unless it is older than SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED_MAX_AGE.
+    """
     size = len(message)
-    uuid = str(uuid4())
+    if settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION:
+        if compressed is None:
+            compressed = _compress(message)
+        content: str | bytes = compressed
+        content_type = "application/gzip"
+        prefix = constants.JUMBO_FIELDS_GZIP_PREFIX
+    else:
+        content = message
+        content_type = None
+        prefix = constants.JUMBO_FIELDS_PREFIX
+
+    if settings.SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED:
+        name = _content_hash(content)
+    else:
+        name = str(uuid4())
     bucket_with_dir = cast(str, _jumbo_fields_bucket())
     if "/" in bucket_with_dir:
         bucket, directory = bucket_with_dir.split("/", 1)
-        path = f"{directory}/{uuid}"
+        path = f"{directory}/{name}"
     else:
         bucket = bucket_with_dir
-        path = uuid
+        path = name
 
-    storage.push_content(bucket, path, message)
+    if not settings.SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED:
+        storage.push_content(bucket, path, content, content_type=content_type)
+    elif not _is_known_key(bucket, path):
+        storage.push_content(bucket, path, content, content_type=content_type)
+        JUMBO_FIELDS_KNOWN_KEYS.add(f"{bucket}/{path}")
     _set_cached(path, message)
 
-    return f"{constants.JUMBO_FIELDS_PREFIX}{bucket}/{path} {size}"
+    return f"{prefix}{bucket}/{path} {size}"
+
+
+def _content_hash(content: str | bytes) -> str:
+    """
+    Name of a content-addressed object: 128 bits of its SHA-256, as long as
+    a UUID without dashes.
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()[:32]
+
+
+def _is_known_key(bucket: str, path: str) -> bool:
+    """
+    Whether a content-addressed object exists and is recent enough to be
+    referenced again: an older one is uploaded again, so that lifecycle rules
+    don't expire it while new workflows reference it.
+    """
+    key = f"{bucket}/{path}"
+    if key in JUMBO_FIELDS_KNOWN_KEYS:
+        return True
+    last_modified = storage.last_modified(bucket, path)
+    if last_modified is None:
+        return False
+    stored_at = last_modified.timestamp()
+    if time.time() - stored_at >= JUMBO_FIELDS_KNOWN_KEYS.max_age:
+        return False
+    JUMBO_FIELDS_KNOWN_KEYS.add(key, stored_at)
+    return True
+
+
+def _split_location(location: str) -> tuple[str, str, str]:
+    """
+    Split a jumbo field location into its prefix, bucket and path.
+    """
+    prefix = next(prefix for prefix in constants.JUMBO_FIELDS_PREFIXES if location.startswith(prefix))
+    bucket, path = location[len(prefix) :].split("/", 1)
+    return prefix, bucket, path
 
 
 def _pull_jumbo_field(location: str) -> str:
-    bucket, path = location.replace(constants.JUMBO_FIELDS_PREFIX, "").split("/", 1)
+    prefix, bucket, path = _split_location(location)
 
     cached_value = _get_cached(path)
     if cached_value:
         return cached_value
 
-    content = storage.pull_content(bucket, path)
+    if prefix == constants.JUMBO_FIELDS_GZIP_PREFIX:
+        content = _decompress(storage.pull_bytes(bucket, path))
+    else:
+        content = storage.pull_content(bucket, path)
     _set_cached(path, content)
 
     return content
 
 
+def prefetch_jumbo_fields(references: Iterable[str], max_workers: int, max_bytes: int | None = None) -> int:
+    """
+    Pull jumbo fields into the cache with *max_workers* threads, so that
+    decoding them doesn't wait for S3 one at a time.
+
+    :param references: ``simpleflow+s3://bucket/path size`` strings; those
+        already in memory, duplicates, and those beyond *max_bytes* (by their
+        size) are skipped.
+    :return: number of jumbo fields pulled. Errors are logged: the fields
+        are pulled again when decoded.
+    """
+    locations = {}
+    nb_bytes = 0
+    for reference in references:
+        location, size = reference.split()
+        _, _, path = _split_location(location)
+        if location in locations or path in JUMBO_FIELDS_MEMORY_CACHE:
+            continue
+        if max_bytes is not None and nb_bytes + int(size) > max_bytes:
+            continue
+        locations[location] = None
+        nb_bytes += int(size)
+    if not locations:
+        return 0
+
+    def pull(location: str) -> bool:
+        try:
+            _pull_jumbo_field(location)
+        except Exception as err:
+            logger.warning(f"cannot prefetch jumbo field {location}: {err}")
+            return False
+        return True
+
+    nb_pulled = sum(_get_prefetch_executor(max_workers).map(pull, locations))
+    logger.debug(f"prefetched {nb_pulled}/{len(locations)} jumbo fields ({nb_bytes} bytes)")
+    return nb_pulled
+
+
+def _get_prefetch_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Thread pool of the prefetches of the process; its threads are started on
+    demand and kept. A forked process starts its own.
+    """
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is not None:
+            pid, executor_max_workers, executor = _prefetch_executor
+            if pid == os.getpid() and executor_max_workers == max_workers:
+                return executor
+            if pid == os.getpid():
+                executor.shutdown(wait=False)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jumbo-prefetch")
+        _prefetch_executor = (os.getpid(), max_workers, executor)
+        return executor
+
+
 def _log_message_too_long(message: str):
     if len(message) > constants.MAX_LOG_FIELD:
         message = f"{message[: constants.MAX_LOG_FIELD]} <...truncated to {constants.MAX_LOG_FIELD} chars>"
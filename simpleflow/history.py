@@ -5,7 +5,7 @@ from collections.abc import Callable
 from typing import TYPE_CHECKING, ClassVar
 
 import simpleflow.swf.mapper.models.history
-from simpleflow import logger
+from simpleflow import constants, format, logger
 from simpleflow.swf.mapper.models.event.task import ActivityTaskEventDict
 from simpleflow.swf.mapper.models.event.workflow import ExternalWorkflowExecutionEvent
 
@@ -27,6 +27,29 @@ class History:
     History data.
     """
 
+    # Attributes built by ``parse()``; see ``snapshot()`` and ``restore()``.
+    PARSED_ATTRIBUTES = (
+        "_activities",
+        "_child_workflows",
+        "_external_workflows_signaling",
+        "_external_workflows_canceling",
+        "_signals",
+        "_signal_lists",
+        "_signaled_workflows",
+        "_signaled_workflows_index",
+        "_markers",
+        "_markers_index",
+        "_timers",
+        "_tasks",
+        "_cancel_requested",
+        "_cancel_failed",
+        "started_decision_id",
+        "completed_decision_id",
+        "last_event_id",
+        "_workflow",
+        "_jumbo_fields",
+    )
+
     def __init__(self, history: simpleflow.swf.mapper.models.history.History) -> None:
         self._history = history
         self._activities: dict[str, ActivityTaskEventDict] = {}
@@ -36,7 +59,11 @@ class History:
         self._signals: dict[str, dict[str, Any]] = {}
         self._signal_lists: collections.defaultdict[str, list[dict[str, Any]]] = collections.defaultdict(list)
         self._signaled_workflows = collections.defaultdict(list)
+        # (signal name, workflow ID, run ID or None) -> first signaled workflow
+        self._signaled_workflows_index: dict[tuple[str, str, str | None], dict[str, Any]] = {}
         self._markers: dict[str, list[dict[str, Any]]] = {}
+        # (marker name, raw details) -> last recorded marker
+        self._markers_index: dict[tuple[str, str | None], dict[str, Any]] = {}
         self._timers: dict[str, dict[str, Any]] = {}
         self._tasks: list[dict[str, Any]] = []
         self._cancel_requested: dict[str, Any] | None = None
@@ -45,6 +72,8 @@ class History:
         self.completed_decision_id: int | None = None
         self.last_event_id: int | None = None
         self._workflow: dict[str, Any] = {}
+        self._jumbo_fields: list[str] = []
+        self._new_jumbo_fields_start = 0
 
     @property
     def swf_history(self) -> simpleflow.swf.mapper.models.history.History:
@@ -124,6 +153,23 @@ class History:
         """
         return self._signaled_workflows
 
+    def find_signaled_workflow(self, name: str, workflow_id: str, run_id: str | None = None) -> dict[str, Any] | None:
+        """
+        :return: the first workflow signaled with this signal name and IDs,
+            whatever its run ID if run_id is None.
+        """
+        return self._signaled_workflows_index.get((name, workflow_id, run_id))
+
+    def was_signaled(self, name: str, workflow_id: str, run_id: str | None) -> bool:
+        """
+        :return: whether this signal name was sent to this exact workflow and
+            run ID, a None run ID matching only signals sent without one.
+        """
+        signaled = self.find_signaled_workflow(name, workflow_id, run_id)
+        if signaled is None or run_id is not None or signaled["run_id"] is None:
+            return signaled is not None
+        return any(w["workflow_id"] == workflow_id and w["run_id"] is None for w in self._signaled_workflows[name])
+
     @property
     def markers(self):
         """
@@ -132,6 +178,13 @@ class History:
         """
         return self._markers
 
+    def find_marker(self, name: str, details: str | None) -> dict[str, Any] | None:
+        """
+        :param details: JSON-encoded details, as recorded in the history.
+        :return: the last marker recorded with this name and details.
+        """
+        return self._markers_index.get((name, details))
+
     @property
     def timers(self) -> dict[str, dict[str, Any]]:
         return self._timers
@@ -166,9 +219,9 @@ class History:
                 "state": event.state,
                 "scheduled_id": event.id,
                 "scheduled_timestamp": event.timestamp,
-                "input": event.input,
+                "input": format.decode_lazily(event.raw_input),
                 "task_list": event.task_list["name"],
-                "control": event.control,
+                "control": format.decode_lazily(event.raw_control),
                 "decision_task_completed_event_id": event.decision_task_completed_event_id,
             }
             if event.activity_id not in self._activities:
@@ -320,9 +373,9 @@ class History:
                 "state": event.state,
                 "initiated_event_id": event.id,
                 "raw_input": event.raw.get("input"),  # FIXME obsolete; any user out there?
-                "input": event.input,
+                "input": format.decode_lazily(event.raw_input),
                 "child_policy": event.child_policy,
-                "control": event.control,
+                "control": format.decode_lazily(event.raw_control),
                 "tag_list": getattr(event, "tag_list", None),
                 "task_list": event.task_list["name"],
                 "initiated_event_timestamp": event.timestamp,
@@ -349,7 +402,7 @@ class History:
                 "cause": event.cause,
                 "name": event.workflow_type["name"],
                 "version": event.workflow_type["version"],
-                "control": event.control,
+                "control": format.decode_lazily(event.raw_control),
                 "start_failed_id": event.id,
                 "start_failed_timestamp": event.timestamp,
                 "decision_task_completed_event_id": event.decision_task_completed_event_id,
@@ -449,7 +502,7 @@ class History:
                     "workflow_type": event.workflow_type,
                     "continued_execution_run_id": getattr(event, "continued_execution_run_id", None),
                     "execution_start_to_close_timeout": getattr(event, "execution_start_to_close_timeout", None),
-                    "input": getattr(event, "input", None),
+                    "input": format.decode_lazily(event.raw_input),
                     "lambda_role": getattr(event, "lambda_role", None),
                     "parent_initiated_event_id": getattr(event, "parent_initiated_event_id", None),
                     "parent_workflow_execution": getattr(event, "parent_workflow_execution", None),
@@ -469,7 +522,7 @@ class History:
                     "task_list": event.task_list["name"],
                     "workflow_type": event.workflow_type,
                     "execution_start_to_close_timeout": getattr(event, "execution_start_to_close_timeout", None),
-                    "input": getattr(event, "input", None),
+                    "input": format.decode_lazily(event.raw_input),
                     "lambda_role": getattr(event, "lambda_role", None),
                     "tag_list": getattr(event, "tag_list", None),
                     "task_priority": getattr(event, "task_priority", None),
@@ -558,7 +611,7 @@ class History:
                 "external_initiated_event_id": getattr(event, "external_initiated_event_id", None),
                 "external_run_id": getattr(event, "external_workflow_execution", {}).get("runId"),
                 "external_workflow_id": getattr(event, "external_workflow_execution", {}).get("workflowId"),
-                "input": event.input,
+                "input": format.decode_lazily(event.raw_input),
                 "event_id": event.id,
                 "timestamp": event.timestamp,
             }
@@ -609,8 +662,8 @@ class History:
                 "signal_name": event.signal_name,
                 "state": event.state,
                 "initiated_event_id": event.id,
-                "input": event.input,
-                "control": event.control,
+                "input": format.decode_lazily(event.raw_input),
+                "control": format.decode_lazily(event.raw_control),
                 "initiated_event_timestamp": event.timestamp,
             }
             self._external_workflows_signaling[event.id] = workflow
@@ -623,8 +676,8 @@ class History:
                     "signal_failed_timestamp": event.timestamp,
                 }
             )
-            if event.control:
-                workflow["control"] = event.control
+            if event.raw_control:
+                workflow["control"] = format.decode_lazily(event.raw_control)
         elif event.state == "execution_signaled":
             workflow = self._external_workflows_signaling[event.initiated_event_id]
             workflow.update(
@@ -637,13 +690,16 @@ class History:
                 }
             )
             self._signaled_workflows[workflow["signal_name"]].append(workflow)
+            for run_id in (workflow["run_id"], None):
+                key = (workflow["signal_name"], workflow["workflow_id"], run_id)
+                self._signaled_workflows_index.setdefault(key, workflow)
         elif event.state == "request_cancel_execution_initiated":
             workflow = {
                 "type": "external_workflow",
                 "id": event.workflow_id,
                 "run_id": getattr(event, "run_id", None),
                 "state": event.state,
-                "control": event.control,
+                "control": format.decode_lazily(event.raw_control),
                 "initiated_event_id": event.id,
                 "initiated_event_timestamp": event.timestamp,
             }
@@ -664,8 +720,8 @@ class History:
                     "cause": event.cause,
                 }
             )
-            if event.control:
-                workflow["control"] = event.control
+            if event.raw_control:
+                workflow["control"] = format.decode_lazily(event.raw_control)
             workflow["request_cancel_failed_timestamp"] = event.timestamp
         elif event.state == "execution_cancel_requested":
             workflow = get_workflow(self._external_workflows_canceling)
@@ -689,6 +745,7 @@ class History:
                 "timestamp": event.timestamp,
             }
             self._markers.setdefault(event.marker_name, []).append(marker)
+            self._markers_index[(marker["name"], marker["details"])] = marker
         elif event.state == "record_failed":
             marker = {
                 "type": "marker",
@@ -707,7 +764,7 @@ class History:
                 "id": event.timer_id,
                 "state": event.state,
                 "start_to_fire_timeout": int(event.start_to_fire_timeout),
-                "control": event.control,
+                "control": format.decode_lazily(event.raw_control),
                 "started_event_id": event.id,
                 "started_event_timestamp": event.timestamp,
                 "decision_task_completed_event_id": event.decision_task_completed_event_id,
@@ -786,16 +843,76 @@ class History:
         """
         Parse the events.
         Update the corresponding statuses.
+
+        If the history was restored from a snapshot, only the events
+        following the snapshot are parsed.
         """
 
         events = self.events
-        for event in events:
+        prefix = constants.JUMBO_FIELDS_PREFIXES
+        self._new_jumbo_fields_start = len(self._jumbo_fields)
+        for index in range(self.last_event_id or 0, len(events)):
+            event = events[index]
             parser = self.TYPE_TO_PARSER.get(event.type)
             if parser:
                 parser(self, events, event)
+            for attributes in event.raw.values():
+                if isinstance(attributes, dict):
+                    self._jumbo_fields.extend(
+                        value for value in attributes.values() if isinstance(value, str) and value.startswith(prefix)
+                    )
         if events:
             self.last_event_id = events[-1].id
 
+    def jumbo_fields(self) -> list[str]:
+        """
+        References of the jumbo fields found in the attributes of the parsed
+        events (inputs, results, details, markers...), including those
+        restored from a snapshot, in event order.
+        """
+        return self._jumbo_fields
+
+    def new_jumbo_fields(self) -> list[str]:
+        """
+        Like ``jumbo_fields()``, for the events handled by the last
+        ``parse()`` only.
+        """
+        return self._jumbo_fields[self._new_jumbo_fields_start :]
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Return the parsed aggregates, to be restored with ``restore()`` on a
+        later history of the same workflow execution.
+        The snapshot isn't a copy: pickle it before mutating the history.
+        """
+        if not self.last_event_id:
+            raise ValueError("cannot snapshot an unparsed history")
+        return {
+            "last_event_id": self.last_event_id,
+            "last_event_timestamp": self.events[self.last_event_id - 1].timestamp,
+            "state": {name: getattr(self, name) for name in self.PARSED_ATTRIBUTES},
+        }
+
+    def restore(self, snapshot: dict[str, Any]) -> bool:
+        """
+        Restore the parsed aggregates from a snapshot, so that ``parse()``
+        only handles newer events.
+
+        :return: False if the snapshot doesn't match this history.
+        """
+        if self.last_event_id:
+            raise ValueError("cannot restore a snapshot on a parsed history")
+        if snapshot["state"].keys() != set(self.PARSED_ATTRIBUTES):
+            return False  # made by another version of simpleflow
+        last_event_id = snapshot["last_event_id"]
+        if last_event_id > len(self.events):
+            return False
+        if self.events[last_event_id - 1].timestamp != snapshot["last_event_timestamp"]:
+            return False
+        for name, value in snapshot["state"].items():
+            setattr(self, name, value)
+        return True
+
     @staticmethod
     def get_event_id(event: dict[str, Any]) -> int | None:
         for event_id_key in (  # FIXME add a universal name?..
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from sqlite3 import OperationalError
+from typing import TYPE_CHECKING
+
+from diskcache import Cache
+
+from simpleflow import constants, logger, settings
+from simpleflow.utils import import_from_module
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from simpleflow.history import History
+
+__all__ = [
+    "DiskHistorySnapshotCache",
+    "HistorySnapshotCache",
+    "MemoryHistorySnapshotCache",
+    "get_history_snapshot_cache",
+    "parse_history",
+]
+
+
+class HistorySnapshotCache:
+    """
+    Store parsed history snapshots (see ``simpleflow.history.History.snapshot``)
+    so that a decider can resume parsing a workflow execution history where a
+    previous decision task stopped.
+
+    Snapshots are keyed by run ID; each snapshot records the last event ID it
+    covers. Subclasses implement ``get`` and ``set``.
+    """
+
+    #: whether ``get`` removes the snapshot from the cache
+    pops_on_get = False
+
+    def get(self, run_id: str) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    def set(self, run_id: str, snapshot: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class DiskHistorySnapshotCache(HistorySnapshotCache):
+    """
+    Snapshot cache backed by DiskCache, shared by the processes of a host.
+
+    The cache is bounded by ``SIMPLEFLOW_HISTORY_SNAPSHOT_CACHE_SIZE_LIMIT``
+    (bytes); least recently stored snapshots are evicted first.
+    """
+
+    def __init__(self, directory: str | None = None, size_limit: int | None = None) -> None:
+        self.directory = directory or os.path.join(constants.CACHE_DIR, "history_snapshots")
+        self.size_limit = size_limit or settings.SIMPLEFLOW_HISTORY_SNAPSHOT_CACHE_SIZE_LIMIT
+        self._cache: Cache | None = None
+        self._pid: int | None = None
+
+    @property
+    def cache(self) -> Cache:
+        # DiskCache objects do not survive forks: reopen in each process.
+        if self._cache is None or self._pid != os.getpid():
+            self._cache = Cache(self.directory, size_limit=self.size_limit)
+            self._pid = os.getpid()
+        return self._cache
+
+    def get(self, run_id: str) -> dict[str, Any] | None:
+        try:
+            return self.cache.get(run_id)
+        except OperationalError:
+            logger.warning("diskcache: got an OperationalError, skipping history snapshot")
+        except Exception as err:  # corrupted or incompatible snapshot
+            logger.warning(f"history snapshot: cannot load snapshot for run_id={run_id}: {err}")
+        return None
+
+    def set(self, run_id: str, snapshot: dict[str, Any]) -> None:
+        try:
+            self.cache.set(run_id, snapshot, expire=constants.DAY)
+        except OperationalError:
+            logger.warning("diskcache: got an OperationalError on write, skipping history snapshot")
+
+
+class MemoryHistorySnapshotCache(HistorySnapshotCache):
+    """
+    Snapshot cache kept in the memory of a decision process, for deciders with
+    long-lived decision processes (see ``--decision-pool-size``): the pool
+    sends the decisions of an execution to the process that took the previous
+    one when it can. A decision process forked per decision loses it.
+
+    Snapshots are neither pickled nor copied: parsing resumes directly on the
+    cached aggregates, so workflows must not mutate the parsed history. A
+    snapshot is removed from the cache when read and stored again once the
+    history is parsed, so a failed parsing can't leave a half-updated snapshot.
+
+    The least recently used snapshots are evicted once the cached snapshots
+    cover more than ``SIMPLEFLOW_HISTORY_MEMORY_CACHE_MAX_EVENTS`` events.
+    """
+
+    pops_on_get = True
+
+    def __init__(self, max_events: int | None = None) -> None:
+        self.max_events = max_events or settings.SIMPLEFLOW_HISTORY_MEMORY_CACHE_MAX_EVENTS
+        self.nb_events = 0
+        self._snapshots: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def get(self, run_id: str) -> dict[str, Any] | None:
+        snapshot = self._snapshots.pop(run_id, None)
+        if snapshot is not None:
+            self.nb_events -= snapshot["last_event_id"]
+        return snapshot
+
+    def set(self, run_id: str, snapshot: dict[str, Any]) -> None:
+        self.get(run_id)
+        self._snapshots[run_id] = snapshot
+        self.nb_events += snapshot["last_event_id"]
+        while self.nb_events > self.max_events and len(self._snapshots) > 1:
+            _, evicted = self._snapshots.popitem(last=False)
+            self.nb_events -= evicted["last_event_id"]
+
+
+_history_snapshot_cache: tuple[str | None, HistorySnapshotCache | None] = (None, None)
+
+
+def get_history_snapshot_cache() -> HistorySnapshotCache | None:
+    """
+    Return the history snapshot cache configured by
+    ``SIMPLEFLOW_HISTORY_SNAPSHOT_CACHE`` (a class path), if any.
+    """
+    global _history_snapshot_cache
+
+    path = settings.SIMPLEFLOW_HISTORY_SNAPSHOT_CACHE
+    if not path:
+        return None
+    cached_path, cache = _history_snapshot_cache
+    if cached_path != path:
+        cache = import_from_module(path)()
+        _history_snapshot_cache = (path, cache)
+    return cache
+
+
+def parse_history(history: History, run_id: str | None) -> History:
+    """
+    Parse a history, resuming from a cached snapshot if possible, then store
+    the new snapshot.
+    """
+    cache = get_history_snapshot_cache()
+    if cache is None or not run_id:
+        history.parse()
+        return history
+
+    snapshot = cache.get(run_id)
+    if snapshot and history.restore(snapshot):
+        logger.debug(f"history snapshot: resuming run_id={run_id} after event {snapshot['last_event_id']}")
+    history.parse()
+    if history.last_event_id and (
+        not snapshot or snapshot["last_event_id"] != history.last_event_id or cache.pops_on_get
+    ):
+        cache.set(run_id, history.snapshot())
+    return history
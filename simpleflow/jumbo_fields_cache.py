@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from sqlite3 import OperationalError
+from typing import TYPE_CHECKING
+
+from diskcache import Cache
+
+from simpleflow import constants, logger, settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import Any
+
+__all__ = [
+    "DiskJumboFieldsCache",
+    "KnownJumboFieldsKeys",
+    "MemoryJumboFieldsCache",
+]
+
+
+class MemoryJumboFieldsCache(MutableMapping):
+    """
+    Jumbo fields contents of a process, keyed by path, shared by its threads.
+
+    The least recently used contents are evicted once the cache holds more
+    than ``SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_MAX_BYTES`` (counted as
+    characters); larger contents aren't cached. ``get`` and ``set`` count
+    hits, misses and evictions.
+    """
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self._max_bytes = max_bytes
+        self.nb_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._contents: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} len={len(self)} bytes={self.nb_bytes}>"
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes or settings.SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_MAX_BYTES
+
+    def __getitem__(self, path: str) -> str:
+        with self._lock:
+            content = self._contents[path]
+            self._contents.move_to_end(path)
+            return content
+
+    def __setitem__(self, path: str, content: str) -> None:
+        with self._lock:
+            self._pop(path)
+            if len(content) > self.max_bytes:
+                return
+            self._contents[path] = content
+            self.nb_bytes += len(content)
+            while self.nb_bytes > self.max_bytes:
+                _, evicted = self._contents.popitem(last=False)
+                self.nb_bytes -= len(evicted)
+                self.evictions += 1
+
+    def __delitem__(self, path: str) -> None:
+        with self._lock:
+            if self._pop(path) is None:
+                raise KeyError(path)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._contents
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._contents))
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def _pop(self, path: str) -> str | None:
+        content = self._contents.pop(path, None)
+        if content is not None:
+            self.nb_bytes -= len(content)
+        return content
+
+    def get(self, path: str, default: Any = None) -> Any:
+        with self._lock:
+            content = self._contents.get(path)
+            if content is None:
+                self.misses += 1
+                return default
+            self._contents.move_to_end(path)
+            self.hits += 1
+            return content
+
+    def set(self, path: str, content: str) -> None:
+        self[path] = content
+
+    def clear(self) -> None:
+        with self._lock:
+            self._contents.clear()
+            self.nb_bytes = 0
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "entries": len(self),
+            "bytes": self.nb_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskJumboFieldsCache:
+    """
+    Jumbo fields contents backed by DiskCache, shared by the processes of a
+    host, and opened on first use by each of them.
+
+    The cache is bounded by ``SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_SIZE_LIMIT``
+    (bytes) and evicts with ``SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_EVICTION_POLICY``;
+    contents expire after ``SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_EXPIRE``
+    seconds. Errors of the underlying SQLite database are logged and count
+    as misses.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        size_limit: int | None = None,
+        eviction_policy: str | None = None,
+        expire: int | None = None,
+    ) -> None:
+        self.directory = directory or os.path.join(constants.CACHE_DIR, "jumbo_fields")
+        self._size_limit = size_limit
+        self._eviction_policy = eviction_policy
+        self._expire = expire
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._cache: Cache | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> Cache:
+        # DiskCache objects do not survive forks: reopen in each process.
+        with self._lock:
+            if self._cache is None or self._pid != os.getpid():
+                self._cache = Cache(
+                    self.directory,
+                    size_limit=self._size_limit or settings.SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_SIZE_LIMIT,
+                    eviction_policy=self._eviction_policy
+                    or settings.SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_EVICTION_POLICY,
+                )
+                self._pid = os.getpid()
+            return self._cache
+
+    def get(self, key: str) -> str | None:
+        try:
+            content = self.cache.get(key)
+        except OperationalError:
+            logger.warning("diskcache: got an OperationalError, skipping cache usage")
+            content = None
+            self._count("errors")
+        self._count("misses" if content is None else "hits")
+        return content
+
+    def set(self, key: str, content: str) -> None:
+        expire = self._expire or settings.SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_EXPIRE or None
+        try:
+            self.cache.set(key, content, expire=expire)
+        except OperationalError:
+            logger.warning("diskcache: got an OperationalError on write, skipping cache write")
+            self._count("errors")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+class KnownJumboFieldsKeys:
+    """
+    Content-addressed jumbo fields known to be on S3, as "bucket/path", with
+    the time they were stored.
+
+    A key is forgotten once stored more than
+    ``SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED_MAX_AGE`` seconds ago; the
+    least recently added keys are forgotten beyond
+    ``SIMPLEFLOW_JUMBO_FIELDS_KNOWN_KEYS_MAX_ENTRIES``.
+    """
+
+    def __init__(self, max_entries: int | None = None, max_age: int | None = None) -> None:
+        self._max_entries = max_entries
+        self._max_age = max_age
+        self._stored_at: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} len={len(self)}>"
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries or settings.SIMPLEFLOW_JUMBO_FIELDS_KNOWN_KEYS_MAX_ENTRIES
+
+    @property
+    def max_age(self) -> int:
+        return self._max_age or settings.SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED_MAX_AGE
+
+    def __contains__(self, key: object) -> bool:
+        stored_at = self._stored_at.get(key)
+        return stored_at is not None and time.time() - stored_at < self.max_age
+
+    def __len__(self) -> int:
+        return len(self._stored_at)
+
+    def add(self, key: str, stored_at: float | None = None) -> None:
+        """
+        Remember *key*, stored at the *stored_at* timestamp (now by default).
+        """
+        with self._lock:
+            self._stored_at.pop(key, None)
+            self._stored_at[key] = time.time() if stored_at is None else stored_at
+            while len(self._stored_at) > self.max_entries:
+                self._stored_at.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stored_at.clear()
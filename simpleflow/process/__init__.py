@@ -1,2 +1,5 @@
+from ._autoscaler import Autoscaler  # NOQA
 from ._named_mixin import NamedMixin, with_state  # NOQA
+from ._pool import ProcessPool  # NOQA
+from ._preload import preload_modules  # NOQA
 from ._supervisor import Supervisor, reset_signal_handlers  # NOQA
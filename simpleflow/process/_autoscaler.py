@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from typing import TYPE_CHECKING
+
+from simpleflow import logger, settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Autoscaler:
+    """
+    Policy sizing the children of a :class:`Supervisor` between
+    *min_children* and *max_children*, from the backlog of their task list.
+
+    Every *interval* seconds, the supervisor asks for a number of children:
+
+    - tasks waiting in the task list mean the children cannot keep up: one
+      child is added per waiting task, up to *max_children*, unless the host
+      load (1-minute load average per CPU) exceeds *max_load* or the last
+      scaling happened less than *scale_up_cooldown* seconds ago;
+    - an empty backlog for *scale_down_cooldown* seconds means there are too
+      many children: one is removed, down to *min_children*, at most once per
+      *scale_down_cooldown*.
+
+    Defaults come from the SIMPLEFLOW_AUTOSCALING_* settings. *backlog* is
+    called in the supervisor process: its errors are logged, and leave the
+    number of children unchanged.
+    """
+
+    def __init__(
+        self,
+        backlog: Callable[[], int],
+        min_children: int,
+        max_children: int,
+        interval: float | None = None,
+        scale_up_cooldown: float | None = None,
+        scale_down_cooldown: float | None = None,
+        max_load: float | None = None,
+    ) -> None:
+        if min_children < 0 or max_children < max(min_children, 1):
+            raise ValueError(f"invalid autoscaling bounds: {min_children}-{max_children}")
+        self.backlog = backlog
+        self.min_children = min_children
+        self.max_children = max_children
+        self.interval = settings.SIMPLEFLOW_AUTOSCALING_INTERVAL if interval is None else interval
+        self.scale_up_cooldown = (
+            settings.SIMPLEFLOW_AUTOSCALING_SCALE_UP_COOLDOWN if scale_up_cooldown is None else scale_up_cooldown
+        )
+        self.scale_down_cooldown = (
+            settings.SIMPLEFLOW_AUTOSCALING_SCALE_DOWN_COOLDOWN if scale_down_cooldown is None else scale_down_cooldown
+        )
+        self.max_load = settings.SIMPLEFLOW_AUTOSCALING_MAX_LOAD if max_load is None else max_load
+        self.scaled_at = -math.inf
+        self.idle_since: float | None = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.min_children}-{self.max_children}>"
+
+    def clamp(self, nb_children: int) -> int:
+        return max(self.min_children, min(self.max_children, nb_children))
+
+    def load(self) -> float:
+        """
+        1-minute load average per CPU.
+        """
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+
+    def scale(self, nb_children: int) -> int:
+        """
+        Return the number of children to run instead of *nb_children*.
+        """
+        try:
+            backlog = self.backlog()
+        except Exception as err:
+            logger.warning(f"autoscaling: cannot get the backlog: {err}")
+            return self.clamp(nb_children)
+
+        now = time.monotonic()
+        target = nb_children
+        if backlog > 0:
+            self.idle_since = None
+            if nb_children < self.max_children and now - self.scaled_at >= self.scale_up_cooldown:
+                load = self.load()
+                if self.max_load and load > self.max_load:
+                    logger.info(f"autoscaling: {backlog} pending tasks, but the host is loaded ({load:.2f} per CPU)")
+                else:
+                    target = nb_children + backlog
+        else:
+            if self.idle_since is None:
+                self.idle_since = now
+            if now - self.idle_since >= self.scale_down_cooldown and now - self.scaled_at >= self.scale_down_cooldown:
+                target = nb_children - 1
+
+        target = self.clamp(target)
+        if target != nb_children:
+            logger.info(f"autoscaling: {nb_children} -> {target} processes ({backlog} pending tasks)")
+            self.scaled_at = now
+        return target
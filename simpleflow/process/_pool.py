@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import multiprocess
+from multiprocess.connection import wait
+
+from simpleflow import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+    from typing import Any
+
+
+_STOP = None  # message asking a pool process to exit
+
+
+def _pool_process_loop(
+    target: Callable[[Any], Any],
+    conn,
+    max_tasks: int | None,
+    initializer: Callable[[], None] | None = None,
+) -> None:
+    """
+    Main loop of a pool process: call *initializer*, run *target* on each
+    payload received on *conn*, acknowledge it with the result, and exit
+    after *max_tasks* tasks or when asked to by the parent.
+    """
+    if initializer is not None:
+        initializer()
+    nb_tasks = 0
+    while True:
+        try:
+            payload = conn.recv()
+        except (EOFError, OSError):
+            return
+        if payload is _STOP:
+            return
+        result = None
+        try:
+            result = target(payload)
+        except Exception:
+            logger.exception(f"pool process pid={os.getpid()}: task failed")
+        nb_tasks += 1
+        exiting = bool(max_tasks) and nb_tasks >= max_tasks
+        conn.send((exiting, result))
+        if exiting:
+            logger.debug(f"pool process pid={os.getpid()}: recycling after {nb_tasks} tasks")
+            return
+
+
+class PoolTask:
+    """
+    Task sent to a pool process: done once acknowledged, with the result of
+    the target, or once its process died.
+    """
+
+    def __init__(self, process: PoolProcess) -> None:
+        self.process = process
+        self.done = False
+        self.result = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} pid={self.pid} done={self.done}>"
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def exitcode(self) -> int | None:
+        return self.process.process.exitcode
+
+
+class PoolProcess:
+    """
+    Parent-side handle on a process of a :class:`ProcessPool`.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[Any], Any],
+        max_tasks: int | None,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        self.conn, child_conn = multiprocess.Pipe()
+        self.process = multiprocess.Process(
+            target=_pool_process_loop, args=(target, child_conn, max_tasks, initializer)
+        )
+        self.process.start()
+        child_conn.close()
+        self.task: PoolTask | None = None  # running task
+        self.exiting = False
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} pid={self.pid} busy={self.busy}>"
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def busy(self) -> bool:
+        return self.task is not None
+
+    def send(self, payload: Any) -> PoolTask:
+        self.task = PoolTask(self)
+        self.conn.send(payload)
+        return self.task
+
+    def end_task(self, result: Any = None) -> None:
+        self.task.result = result
+        self.task.done = True
+        self.task = None
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(_STOP)
+        except OSError:  # already gone
+            pass
+        self.process.join()
+        self.conn.close()
+
+
+class ProcessPool:
+    """
+    Pool of long-lived processes, each running *target* on the payloads it
+    receives, one at a time.
+
+    Unlike forking a process per task, the pool avoids paying the fork and
+    module warm-up costs for each task. A process is replaced after
+    *max_tasks_per_child* tasks, which keeps the protection against memory
+    leaks, or when it dies.
+
+    Payloads and results are pickled: they must not hold connections or
+    clients, and payloads cannot be None. Submitting a payload returns a
+    :class:`PoolTask`, holding the result once done.
+
+    Each process calls *initializer* once started, e.g. to replace the
+    connections inherited from the parent.
+
+    Payloads submitted with the same key go to the same process when it is
+    idle, so that it can reuse what it cached for the previous ones.
+    """
+
+    max_affinities = 10_000  # keys remembered, least recently used dropped
+
+    def __init__(
+        self,
+        target: Callable[[Any], Any],
+        nb_processes: int,
+        max_tasks_per_child: int | None = None,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        if nb_processes < 1:
+            raise ValueError("a process pool needs at least one process")
+        self._target = target
+        self._nb_processes = nb_processes
+        self._max_tasks_per_child = max_tasks_per_child
+        self._initializer = initializer
+        self._processes: list[PoolProcess] = []
+        self._affinities: OrderedDict[Hashable, PoolProcess] = OrderedDict()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} processes={self._processes}>"
+
+    @property
+    def processes(self) -> list[PoolProcess]:
+        return self._processes
+
+    @property
+    def nb_busy(self) -> int:
+        return sum(1 for p in self._processes if p.busy)
+
+    def start(self) -> None:
+        while len(self._processes) < self._nb_processes:
+            self._processes.append(PoolProcess(self._target, self._max_tasks_per_child, self._initializer))
+
+    def _collect(self, timeout: float | None) -> None:
+        """
+        Wait up to *timeout* seconds for task acknowledgements or process
+        deaths, and update the pool accordingly.
+        """
+        self.start()
+        by_handle = {}
+        for p in self._processes:
+            if p.busy:
+                by_handle[p.conn] = p
+            by_handle[p.process.sentinel] = p
+        if not by_handle:
+            return
+        for ready in wait(list(by_handle), timeout=timeout):
+            p = by_handle[ready]
+            if ready is p.conn:
+                result = None
+                try:
+                    p.exiting, result = p.conn.recv()
+                except (EOFError, OSError):
+                    p.exiting = True
+                p.end_task(result)
+            else:
+                if p.busy and not p.conn.poll():
+                    logger.warning(f"pool process pid={p.pid} died while busy, exit code {p.process.exitcode}")
+                    p.end_task()
+                p.exiting = True
+
+        for p in [p for p in self._processes if p.exiting and not p.busy]:
+            p.process.join()
+            p.conn.close()
+            self._processes.remove(p)
+        self.start()
+
+    def get_idle_process(self, timeout: float | None = None, key: Hashable | None = None) -> PoolProcess | None:
+        """
+        Return an idle process, waiting up to *timeout* seconds (forever if
+        None) for one to become available. The last process given for *key*
+        is preferred.
+        """
+        self._collect(timeout=0)
+        preferred = self._affinities.get(key) if key is not None else None
+        while True:
+            if preferred is not None and preferred in self._processes and not preferred.busy and not preferred.exiting:
+                return preferred
+            for p in self._processes:
+                if not p.busy and not p.exiting:
+                    return p
+            if timeout is not None and timeout <= 0:
+                return None
+            self._collect(timeout=timeout)
+            if timeout is not None:
+                timeout = 0
+
+    def submit(self, payload: Any, key: Hashable | None = None) -> PoolTask:
+        """
+        Send *payload* to an idle process, waiting for one if needed: the
+        process that took the previous payload of *key*, if it is idle.
+        """
+        process = self.get_idle_process(key=key)
+        if key is not None:
+            self._affinities[key] = process
+            self._affinities.move_to_end(key)
+            if len(self._affinities) > self.max_affinities:
+                self._affinities.popitem(last=False)
+        return process.send(payload)
+
+    def wait(self, task: PoolTask, timeout: float | None = None) -> bool:
+        """
+        Wait up to *timeout* seconds (forever if None) for *task* to be done,
+        and return whether it is. A task whose process died is done: check its
+        exit code.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not task.done:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            self._collect(timeout=remaining)
+            if remaining == 0:
+                break
+        return task.done
+
+    def join(self) -> None:
+        """
+        Wait for running tasks, then stop the processes.
+        """
+        while any(p.busy for p in self._processes):
+            self._collect(timeout=None)
+        for p in self._processes:
+            p.stop()
+        self._processes = []
@@ -5,14 +5,18 @@ import os
 import signal
 import time
 import types
+from typing import TYPE_CHECKING
 
 import multiprocess
-import psutil
+from multiprocess.connection import wait
 
 from simpleflow import logger
 
 from ._named_mixin import NamedMixin, with_state
 
+if TYPE_CHECKING:
+    from ._autoscaler import Autoscaler
+
 
 def reset_signal_handlers(func):
     """
@@ -31,22 +35,6 @@ def reset_signal_handlers(func):
     return wrapped
 
 
-def _void_handle_sigchld(signum, frame):
-    """
-    Default action for a SIGCHLD signal handling is to ignore it
-    which in practice has no effect on the running program. Having
-    a handler that does nothing is a bit different, in the sense
-    it will interrupt the execution of any "time.sleep()" routing.
-    From "time" module docs:
-
-        The actual suspension time may be less than that requested
-        because any caught signal will terminate the sleep()
-        following execution of that signal's catching routine.
-
-    """
-    pass
-
-
 class Supervisor(NamedMixin):
     """
     The `Supervisor` class is responsible for managing one or many worker processes
@@ -58,14 +46,26 @@ class Supervisor(NamedMixin):
     It also has its roots in the former simpleflow process manager and some of Botify
     private code which wasn't really well tested, and was re-written in a TDD-y
     style.
+
+    Children are watched through their sentinels and SIGCHLD, as a child that
+    forked task processes doesn't close its sentinel before they exit: a dead
+    child is joined and replaced as soon as it exits, unless it lived less than `respawn_delay`
+    seconds, in which case it is replaced after that delay, so that a crashing
+    payload doesn't turn into a fork loop.
+
+    With an :class:`Autoscaler`, the number of children changes over time:
+    extra children are sent a SIGTERM, and finish their current task.
     """
 
+    respawn_delay = 1.0
+
     def __init__(
         self,
         payload: callable,
         arguments: tuple | list | None = None,
         nb_children: int | None = None,
         background: bool = False,
+        autoscaler: Autoscaler | None = None,
     ) -> None:
         """
         Initializes a Manager() instance, with a payload (a callable that will be
@@ -74,20 +74,31 @@ class Supervisor(NamedMixin):
         of workers, which defaults to the number of CPU cores if not passed).
 
         background: whether the supervisor process should launch in background
+        autoscaler: policy changing the number of workers over time, starting
+        from nb_children (or its minimum)
         """
         # NB: below, compare explicitly to "None" there because nb_children could be 0
         if nb_children is None:
-            self._nb_children = multiprocess.cpu_count()
+            self._nb_children = autoscaler.min_children if autoscaler else multiprocess.cpu_count()
         else:
             self._nb_children = nb_children
+        self._autoscaler = autoscaler
+        if autoscaler is not None:
+            self._nb_children = autoscaler.clamp(self._nb_children)
         self._payload = payload
         self._payload_friendly_name = self.payload_friendly_name()
         self._named_mixin_properties = ["_payload_friendly_name", "_nb_children"]
         self._args = arguments if arguments is not None else ()
         self._background = background
 
-        self._processes = {}
+        self._processes: dict[int, multiprocess.Process] = {}
+        self._started_at: dict[int, float] = {}
+        self._respawn_at = 0.0
+        self._autoscale_at = 0.0
+        self._retiring: set[int] = set()  # SIGTERMed when scaling down
         self._terminating = False
+        self._wakeup_r: int | None = None
+        self._wakeup_w: int | None = None
 
         super().__init__()
 
@@ -105,33 +116,32 @@ class Supervisor(NamedMixin):
             self.target()
 
     def _cleanup_worker_processes(self):
-        # cleanup children
-        to_remove = []
-        for pid, child in self._processes.items():
-            try:
-                name, status = child.name(), child.status()
-            except psutil.NoSuchProcess:  # May be untimely deceased
-                name, status = "unknown", "unknown"
-            logger.debug(f"  child: name={name} pid={child.pid:d} status={status}")
-            if status in (psutil.STATUS_ZOMBIE, "unknown"):
-                logger.debug(f"  process {child.pid} is zombie, will cleanup")
-                # join process to clean it up
-                child.wait()
-                # set the process to be removed from self._processes
-                to_remove.append(pid)
-
-        # cleanup our internal state (self._processes)
-        for pid in to_remove:
+        """
+        Join the worker processes that exited, and remove them from
+        self._processes.
+        """
+        now = time.monotonic()
+        for pid, child in list(self._processes.items()):
+            if child.exitcode is None:  # waitpid(pid, WNOHANG): no /proc scan
+                continue
+            child.join()
             del self._processes[pid]
+            started_at = self._started_at.pop(pid)
+            logger.info(f"process: worker pid={pid} exited with exit code {child.exitcode}")
+            if pid in self._retiring:
+                self._retiring.discard(pid)
+            elif now - started_at < self.respawn_delay:
+                logger.warning(f"process: worker pid={pid} exited early, replacing it in {self.respawn_delay}s")
+                self._respawn_at = now + self.respawn_delay
 
     def _start_worker_processes(self):
         """
         Start missing worker processes depending on self._nb_children and the current
         processes stored in self._processes.
         """
-        if self._terminating:
+        if self._terminating or time.monotonic() < self._respawn_at:
             return
-        for _ in range(len(self._processes), self._nb_children):
+        for _ in range(len(self._processes) - len(self._retiring), self._nb_children):
             child = multiprocess.Process(target=reset_signal_handlers(self._payload), args=self._args)
             child.start()
 
@@ -143,7 +153,24 @@ class Supervisor(NamedMixin):
             pid = child.pid
             if not pid:
                 raise AssertionError(f"Cannot add process with pid={pid}: {child}")
-            self._processes[pid] = psutil.Process(pid)
+            self._processes[pid] = child
+            self._started_at[pid] = time.monotonic()
+
+    def _autoscale(self):
+        """
+        Ask the autoscaler for the number of worker processes, and retire the
+        extra ones.
+        """
+        self._nb_children = self._autoscaler.scale(self._nb_children)
+        self._autoscale_at = time.monotonic() + self._autoscaler.interval
+        active = sorted(
+            (pid for pid in self._processes if pid not in self._retiring),
+            key=self._started_at.__getitem__,
+        )
+        for pid in active[: max(0, len(active) - self._nb_children)]:
+            logger.info(f"process: scaling down, sending SIGTERM to pid={pid}")
+            self._processes[pid].terminate()
+            self._retiring.add(pid)
 
     def target(self):
         """
@@ -157,34 +184,44 @@ class Supervisor(NamedMixin):
         if len(self._processes) != 0:
             raise Exception("Child processes map is not empty, already called .start()?")
 
-        # wait for all processes to finish
-        while True:
-            # if terminating, join all processes and exit the loop so we finish
-            # the supervisor process
-            if self._terminating:
-                for proc in self._processes.values():
-                    logger.info(f"process: waiting for proces={proc} to finish.")
-                    proc.wait()
-                break
-
-            # start worker processes
-            self._cleanup_worker_processes()
-            self._start_worker_processes()
-
-            # re-evaluate state at least every 5 seconds ; if a SIGCHLD happens during
-            # the "time.sleep()" below, it will be interrupted, making the code above
-            # run nearly immediately ; but if a SIGCHLD happens during the two calls
-            # above, the "time.sleep()" here won't be stopped, so better have it
-            # relatively short, but not too short since the above methods involve
-            # scanning a bunch of entries in /proc so that could become slow if we do
-            # it every 0.1s.
-            time.sleep(5)
+        # the wake-up pipe interrupts the wait below when terminating
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_w, False)
+        try:
+            while not self._terminating:
+                self._cleanup_worker_processes()
+                if self._autoscaler is not None and time.monotonic() >= self._autoscale_at:
+                    self._autoscale()
+                self._start_worker_processes()
+
+                # sleep until a child exits (SIGCHLD or its sentinel), we're
+                # asked to terminate, or it is time to replace a child or to
+                # autoscale
+                deadlines = []
+                if len(self._processes) - len(self._retiring) < self._nb_children:
+                    deadlines.append(self._respawn_at)
+                if self._autoscaler is not None:
+                    deadlines.append(self._autoscale_at)
+                timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                handles = [self._wakeup_r] + [child.sentinel for child in self._processes.values()]
+                if self._wakeup_r in wait(handles, timeout=timeout):
+                    os.read(self._wakeup_r, 4096)
+
+            # terminating: join all processes so we finish the supervisor process
+            for proc in self._processes.values():
+                logger.info(f"process: waiting for process={proc} to finish.")
+                proc.join()
+        finally:
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            self._wakeup_r = self._wakeup_w = None
 
     def bind_signal_handlers(self):
         """
         Binds signals for graceful shutdown:
         - SIGTERM and SIGINT lead to a graceful shutdown
-        - SIGCHLD is intentionally left to a void handler, see comment
+        - SIGCHLD wakes the main loop up, which joins the dead children: their
+          sentinels may be kept open by the task processes they forked
         - other signals are not modified for now
         """
 
@@ -198,9 +235,7 @@ class Supervisor(NamedMixin):
         # bind SIGTERM and SIGINT
         signal.signal(signal.SIGTERM, _handle_graceful_shutdown)
         signal.signal(signal.SIGINT, _handle_graceful_shutdown)
-
-        # bind SIGCHLD
-        signal.signal(signal.SIGCHLD, _void_handle_sigchld)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: self._wakeup())
 
     @with_state("stopping")
     def terminate(self):
@@ -210,6 +245,17 @@ class Supervisor(NamedMixin):
         self._terminating = True
         logger.info("process: will stop workers, this might take up several minutes. Please, be patient.")
         self._killall()
+        self._wakeup()
+
+    def _wakeup(self):
+        """
+        Interrupt the wait of the main loop, if it runs.
+        """
+        if self._wakeup_w is not None:
+            try:
+                os.write(self._wakeup_w, b"\0")
+            except BlockingIOError:  # already woken up
+                pass
 
     def _killall(self):
         """
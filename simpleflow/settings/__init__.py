@@ -48,6 +48,12 @@ ACTIVITY_HEARTBEAT_TIMEOUT: str
 
 SIMPLEFLOW_S3_HOST: str
 SIMPLEFLOW_S3_SSE: bool
+SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS: int
+SIMPLEFLOW_S3_TCP_KEEPALIVE: bool
+SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION: str
+SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED: bool
+SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED_MAX_AGE: int
+SIMPLEFLOW_JUMBO_FIELDS_KNOWN_KEYS_MAX_ENTRIES: int
 
 STEP_BUCKET: str
 
@@ -58,8 +64,30 @@ LOGGING: dict[str, Any]
 SIMPLEFLOW_SYSLOG_TARGET: str | None
 
 SIMPLEFLOW_ENABLE_DISK_CACHE: bool
+SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_MAX_BYTES: int
+SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_SIZE_LIMIT: int
+SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_EVICTION_POLICY: str
+SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_EXPIRE: int
 SIMPLEFLOW_BINARIES_DIRECTORY: str
 
+SIMPLEFLOW_HISTORY_SNAPSHOT_CACHE: str | None
+SIMPLEFLOW_HISTORY_SNAPSHOT_CACHE_SIZE_LIMIT: int
+SIMPLEFLOW_HISTORY_MEMORY_CACHE_MAX_EVENTS: int
+SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS: int
+SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_MAX_BYTES: int
+
+SIMPLEFLOW_PIPELINED_POLLING: bool
+SIMPLEFLOW_ASYNC_COMPLETION: bool
+
+SIMPLEFLOW_PRELOAD_MODULES: str
+SIMPLEFLOW_AUTOSCALING_INTERVAL: float
+SIMPLEFLOW_AUTOSCALING_SCALE_UP_COOLDOWN: float
+SIMPLEFLOW_AUTOSCALING_SCALE_DOWN_COOLDOWN: float
+SIMPLEFLOW_AUTOSCALING_MAX_LOAD: float
+
+SIMPLEFLOW_EXECUTE_PERSISTENT: bool
+SIMPLEFLOW_EXECUTE_POOL_SIZE: int
+
 # Activity management
 
 # Amount of time to wait for process spawned by an activity poller to wait in
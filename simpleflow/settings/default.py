@@ -18,6 +18,23 @@ ACTIVITY_HEARTBEAT_TIMEOUT = ACTIVITY_DEFAULT_TIMEOUT
 
 SIMPLEFLOW_S3_HOST = "s3.amazonaws.com"
 SIMPLEFLOW_S3_SSE = False
+# Connections kept by each S3 client, reused by the process for the same
+# endpoint or region, and whether to enable TCP keep-alive on them.
+SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS = 10
+SIMPLEFLOW_S3_TCP_KEEPALIVE = True
+# Compression of the jumbo fields: "" (none) or "gzip". A compressed field that
+# fits in the SWF field is kept there, base64-encoded, instead of on S3.
+# Simpleflow versions before this setting can't decode them.
+SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION = ""
+# Name the jumbo fields objects after a hash of their content instead of a
+# UUID, so that a field encoded several times (e.g. the same input of many
+# activities) is only uploaded once.
+SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED = False
+# Such an object is uploaded again once older than this, so that lifecycle
+# rules don't expire it while new workflows reference it. Each process
+# remembers up to this many existing objects.
+SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED_MAX_AGE = 24 * 3600  # seconds
+SIMPLEFLOW_JUMBO_FIELDS_KNOWN_KEYS_MAX_ENTRIES = 100_000
 
 STEP_BUCKET = "step_bucket"
 
@@ -53,9 +70,60 @@ LOGGING = {
 }
 SIMPLEFLOW_SYSLOG_TARGET = None
 
+# Jumbo fields caches: an LRU memory cache per process, and a disk cache
+# shared by the processes of a host if SIMPLEFLOW_ENABLE_DISK_CACHE is set.
 SIMPLEFLOW_ENABLE_DISK_CACHE = False
+SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_MAX_BYTES = 64 * 1024**2  # 64MB
+SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_SIZE_LIMIT = 1024**3  # 1GB
+# A DiskCache eviction policy, e.g. "least-recently-used" (each read is a write)
+SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_EVICTION_POLICY = "least-recently-stored"
+SIMPLEFLOW_JUMBO_FIELDS_DISK_CACHE_EXPIRE = 3 * 3600  # seconds, 0 for never
 SIMPLEFLOW_BINARIES_DIRECTORY = "/tmp/simpleflow-binaries"  # nosec
 
+# Decider history parsing
+
+# Class path of a simpleflow.history_cache.HistorySnapshotCache, e.g.
+# "simpleflow.history_cache.DiskHistorySnapshotCache" or
+# "simpleflow.history_cache.MemoryHistorySnapshotCache"; disabled if empty.
+SIMPLEFLOW_HISTORY_SNAPSHOT_CACHE = None
+SIMPLEFLOW_HISTORY_SNAPSHOT_CACHE_SIZE_LIMIT = 256 * 1024**2  # 256MB
+# Events covered by the snapshots of MemoryHistorySnapshotCache, per process.
+SIMPLEFLOW_HISTORY_MEMORY_CACHE_MAX_EVENTS = 1_000_000
+# Pull the jumbo fields of a history with this many threads before replaying
+# it (0 to disable), up to this many bytes per decision.
+SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS = 0
+SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_MAX_BYTES = 64 * 1024**2  # 64MB
+
+# Polling
+
+# Deciders poll the next decision task in a background thread while the current
+# one is processed.
+SIMPLEFLOW_PIPELINED_POLLING = False
+
+# Respond to SWF (complete or fail tasks) from a background queue of the poller.
+SIMPLEFLOW_ASYNC_COMPLETION = False
+
+# Processes
+
+# Comma-separated modules (workflows, activities, their dependencies) imported
+# once by deciders and workers before forking their processes.
+SIMPLEFLOW_PRELOAD_MODULES = ""
+
+# Autoscaling of the deciders and workers (--min-processes/--max-processes):
+# seconds between backlog checks, seconds between two scale ups and between two
+# scale downs (also the time without backlog before a scale down), and load
+# average per CPU above which no process is added (0 to ignore the load).
+SIMPLEFLOW_AUTOSCALING_INTERVAL = 30.0
+SIMPLEFLOW_AUTOSCALING_SCALE_UP_COOLDOWN = 60.0
+SIMPLEFLOW_AUTOSCALING_SCALE_DOWN_COOLDOWN = 300.0
+SIMPLEFLOW_AUTOSCALING_MAX_LOAD = 1.0
+
+# Execute the callables of execute.python() in warm interpreter servers reused
+# between calls, keeping up to SIMPLEFLOW_EXECUTE_POOL_SIZE idle servers per
+# interpreter and environment, instead of a new process per call.
+SIMPLEFLOW_EXECUTE_PERSISTENT = False
+SIMPLEFLOW_EXECUTE_POOL_SIZE = 4
+
 # Activity management
 
 # Amount of time to wait for process spawned by an activity poller to wait in
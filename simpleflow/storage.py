@@ -4,30 +4,48 @@ import io
 from typing import TYPE_CHECKING
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from . import logger, settings
-from .boto3_utils import get_or_create_boto3_client
+from .boto3_utils import get_or_create_boto3_client, get_or_create_boto3_resource
 from .swf.mapper.exceptions import extract_error_code
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from mypy_boto3_s3.service_resource import Bucket, ObjectSummary
 
-BUCKET_CACHE = {}
 BUCKET_LOCATIONS_CACHE = {}
 
 
+def get_config() -> Config:
+    return Config(
+        max_pool_connections=settings.SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=settings.SIMPLEFLOW_S3_TCP_KEEPALIVE,
+    )
+
+
 def get_client() -> boto3.session.Session.client:
-    return get_or_create_boto3_client(region_name=None, service_name="s3")
+    return get_or_create_boto3_client(region_name=None, service_name="s3", config=get_config())
 
 
 def get_resource(host_or_region: str) -> boto3.session.Session.resource:
+    """
+    S3 resource of an endpoint or region, reused by the current thread of the
+    process with its connections.
+    """
     # first case: we got a valid DNS (host)
     if "." in host_or_region:
-        return boto3.resource("s3", endpoint_url=f"https://{host_or_region}")
+        return get_or_create_boto3_resource(
+            region_name=None,
+            service_name="s3",
+            endpoint_url=f"https://{host_or_region}",
+            config=get_config(),
+        )
 
     # second case: we got a region
-    return boto3.resource("s3", region_name=host_or_region)
+    return get_or_create_boto3_resource(region_name=host_or_region, service_name="s3", config=get_config())
 
 
 def sanitize_bucket_and_host(bucket: str) -> tuple[str, str]:
@@ -77,11 +95,7 @@ def sanitize_bucket_and_host(bucket: str) -> tuple[str, str]:
 
 def get_bucket(bucket_name: str) -> Bucket:
     bucket_name, location = sanitize_bucket_and_host(bucket_name)
-    s3 = get_resource(location)
-    if bucket_name not in BUCKET_CACHE:
-        bucket = s3.Bucket(bucket_name)
-        BUCKET_CACHE[bucket_name] = bucket
-    return BUCKET_CACHE[bucket_name]
+    return get_resource(location).Bucket(bucket_name)
 
 
 def pull(bucket: str, path: str, dest_file: str) -> None:
@@ -90,10 +104,32 @@ def pull(bucket: str, path: str, dest_file: str) -> None:
 
 
 def pull_content(bucket: str, path: str) -> str:
+    return pull_bytes(bucket, path).decode()
+
+
+def pull_bytes(bucket: str, path: str) -> bytes:
     bucket_resource = get_bucket(bucket)
     bytes_buffer = io.BytesIO()
     bucket_resource.download_fileobj(path, bytes_buffer)
-    return bytes_buffer.getvalue().decode()
+    return bytes_buffer.getvalue()
+
+
+def exists(bucket: str, path: str) -> bool:
+    return last_modified(bucket, path) is not None
+
+
+def last_modified(bucket: str, path: str) -> datetime | None:
+    """
+    Last modification time of an object, or None if it doesn't exist.
+    """
+    obj = get_bucket(bucket).Object(path)
+    try:
+        obj.load()
+    except ClientError as e:
+        if extract_error_code(e) in ("404", "NoSuchKey"):
+            return None
+        raise
+    return obj.last_modified
 
 
 def push(bucket: str, path: str, src_file: str, content_type: str | None = None) -> None:
@@ -106,14 +142,16 @@ def push(bucket: str, path: str, src_file: str, content_type: str | None = None)
     bucket_resource.upload_file(src_file, path, ExtraArgs=extra_args)
 
 
-def push_content(bucket: str, path: str, content: str, content_type: str | None = None) -> None:
+def push_content(bucket: str, path: str, content: str | bytes, content_type: str | None = None) -> None:
     bucket_resource = get_bucket(bucket)
     extra_args = {}
     if content_type:
         extra_args["ContentType"] = content_type
     if settings.SIMPLEFLOW_S3_SSE:
         extra_args["ServerSideEncryption"] = "AES256"
-    bucket_resource.upload_fileobj(io.BytesIO(content.encode()), path, ExtraArgs=extra_args)
+    if isinstance(content, str):
+        content = content.encode()
+    bucket_resource.upload_fileobj(io.BytesIO(content), path, ExtraArgs=extra_args)
 
 
 def list_keys(bucket: str, path: str | None = None) -> list[ObjectSummary]:
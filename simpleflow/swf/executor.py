@@ -3,7 +3,6 @@ from __future__ import annotations
 import copy
 import hashlib
 import inspect
-import json
 import re
 import traceback
 from collections.abc import Callable
@@ -15,7 +14,7 @@ import simpleflow.swf.mapper.exceptions
 import simpleflow.swf.mapper.models
 import simpleflow.swf.mapper.models.decision
 import simpleflow.task as base_task
-from simpleflow import exceptions, executor, format, futures, logger, task
+from simpleflow import exceptions, executor, format, futures, history_cache, logger, settings, task
 from simpleflow.activity import PRIORITY_NOT_SET, Activity
 from simpleflow.base import Submittable
 from simpleflow.history import History
@@ -467,16 +466,11 @@ class Executor(executor.Executor):
         """
         Get the event corresponding to a signal, if any.
         """
-        # FIXME could look directly in signaled_workflows?
         event = history.signals.get(a_task.name)
         if not event:
             if a_task.workflow_id is None:  # Broadcast, should be in signals
                 return None
-            signaled_workflows = history.signaled_workflows.get(a_task.name, [])
-            for w in signaled_workflows:
-                if w["workflow_id"] == a_task.workflow_id and (a_task.run_id is None or w["run_id"] == a_task.run_id):
-                    event = w
-                    break
+            event = history.find_signaled_workflow(a_task.name, a_task.workflow_id, a_task.run_id)
         return event
 
     def find_marker_event(self, a_task: MarkerTask, history: History) -> dict[str, Any] | None:
@@ -484,11 +478,7 @@ class Executor(executor.Executor):
         Get the event corresponding to a marker, if any.
         """
         json_details = json_dumps(a_task.details) if a_task.details is not None else None
-        marker_list = history.markers.get(a_task.name)
-        if not marker_list:
-            return None
-        marker_list = [m for m in marker_list if m["state"] == "recorded" and m["details"] == json_details]
-        return marker_list[-1] if marker_list else None
+        return history.find_marker(a_task.name, json_details)
 
     def find_timer_event(self, a_task: TimerTask | CancelTimerTask, history: History) -> dict[str, Any] | None:
         """
@@ -726,20 +716,19 @@ class Executor(executor.Executor):
         # schedule the requested task and block execution instead, with a timer
         # to wake up the workflow immediately after completing these decisions.
         # See: http://docs.aws.amazon.com/amazonswf/latest/developerguide/swf-dg-limits.html
-        # NB: here we use json.dumps, not json_dumps, since the serialization will
-        # happen inside boto.swf and is out of our control.
-        request_size = len(json.dumps(self._decisions_and_context.decisions + decisions))
+        # NB: sizes are measured with json.dumps, not json_dumps, since the
+        # serialization will happen inside boto.swf and is out of our control.
+        # Each decision is only serialized once, when checked and added.
         # We keep a 5kB of error margin for headers, json structure, and the
         # timer decision, and 32kB for the context, even if we don't use it now.
-        if request_size > constants.MAX_REQUEST_SIZE - 5000 - 32000:
+        max_json_size = constants.MAX_REQUEST_SIZE - 5000 - 32000
+        if not self._decisions_and_context.extend_decision(decisions, max_json_size=max_json_size):
             # TODO: at this point we may check that self._decisions is not empty
             # If it's the case, it means that a single decision was weighting
             # more than 900kB, so we have bigger problems.
             self._append_timer = True
             raise exceptions.ExecutionBlocked()
 
-        self._decisions_and_context.extend_decision(decisions)
-
         # Check if we won't exceed max decisions -1
         # TODO: if we had exactly MAX_DECISIONS - 1 to take, this will wake up
         # the workflow for no reason. Evaluate if we can do better.
@@ -976,8 +965,20 @@ class Executor(executor.Executor):
 
         # noinspection PyUnresolvedReferences
         history = decision_response.history
-        self._history = History(history)
-        self._history.parse()
+        self._history = history_cache.parse_history(
+            History(history),
+            decision_response.execution.run_id if decision_response.execution else None,
+        )
+        if settings.SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS:
+            format.prefetch_jumbo_fields(
+                self._history.new_jumbo_fields(),
+                max_workers=settings.SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS,
+                # beyond the memory cache, prefetched fields would evict each other
+                max_bytes=min(
+                    settings.SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_MAX_BYTES,
+                    settings.SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_MAX_BYTES,
+                ),
+            )
         self.build_run_context(decision_response)
         # noinspection PyUnresolvedReferences
         self._execution = decision_response.execution
@@ -1246,8 +1247,11 @@ class Executor(executor.Executor):
             args = input.get("args", ())
             kwargs = input.get("kwargs", {})
             sender = (signal["external_workflow_id"], signal["external_run_id"])
-            signaled_workflows_ids = {(w["workflow_id"], w["run_id"]) for w in history.signaled_workflows[name]}
-            not_signaled_workflows_ids = list(known_workflows_ids - signaled_workflows_ids - {sender})
+            not_signaled_workflows_ids = [
+                (workflow_id, run_id)
+                for workflow_id, run_id in known_workflows_ids
+                if (workflow_id, run_id) != sender and not history.was_signaled(name, workflow_id, run_id)
+            ]
             extra_input = {"__propagate": propagate}
             for workflow_id, run_id in not_signaled_workflows_ids:
                 self.schedule_task(SignalTask(name, workflow_id, run_id, None, extra_input, *args, **kwargs))
@@ -76,10 +76,20 @@ class ActivityWorker(Actor):
         :param  result: The result of the activity task.
         """
         try:
-            return self.respond_activity_task_completed(
-                task_token,
-                format.result(result),
-            )
+            encoded_result = format.result(result)
+        except JumboTooLargeError as e:
+            return self.respond_activity_task_failed(task_token, reason=format_exc(e))
+        return self.complete_encoded(task_token, encoded_result)
+
+    def complete_encoded(self, task_token: str, result: str | None) -> dict[str, Any] | None:
+        """Responds to ``swf`` that the activity task is completed, with a
+        result already encoded by ``format.result``
+
+        :param  task_token: completed activity task token
+        :param  result: The encoded result of the activity task.
+        """
+        try:
+            return self.respond_activity_task_completed(task_token, result)
         except ClientError as e:
             error_code = extract_error_code(e)
             message = extract_message(e)
@@ -90,8 +100,6 @@ class ActivityWorker(Actor):
                 ) from e
 
             raise ResponseError(message, error_code=error_code) from e
-        except JumboTooLargeError as e:
-            return self.respond_activity_task_failed(task_token, reason=format_exc(e))
 
     def fail(self, task_token: str, details: str | None = None, reason: str | None = None) -> dict[str, Any] | None:
         """Replies to ``swf`` that the activity task failed
@@ -56,6 +56,10 @@ class ConnectedSWFObject:
         creds_ = {k: SETTINGS[k] for k in cred_keys if SETTINGS.get(k, None)}
 
         self.boto3_client = kwargs.pop("boto3_client", None)
+        if not self.boto3_client and kwargs.pop("own_client", False):
+            # not shared with the other objects of this process
+            session = boto3.session.Session(region_name=self.region)
+            self.boto3_client = session.client("swf", **creds_)
         if not self.boto3_client:
             # raises EndpointConnectionError if region is wrong
             self.boto3_client = get_or_create_boto3_client(region_name=self.region, service_name="swf", **creds_)
@@ -348,6 +352,22 @@ class ConnectedSWFObject:
             **remove_none(kwargs),
         )
 
+    def count_pending_activity_tasks(self, domain: str, task_list: str) -> dict[str, Any]:
+        return self.boto3_client.count_pending_activity_tasks(
+            domain=domain,
+            taskList={
+                "name": task_list,
+            },
+        )
+
+    def count_pending_decision_tasks(self, domain: str, task_list: str) -> dict[str, Any]:
+        return self.boto3_client.count_pending_decision_tasks(
+            domain=domain,
+            taskList={
+                "name": task_list,
+            },
+        )
+
     def poll_for_activity_task(
         self,
         domain: str,
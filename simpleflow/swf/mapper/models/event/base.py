@@ -13,6 +13,22 @@ class TaskList(TypedDict):
     name: str
 
 
+# SWF attribute names -> event attribute names, memoized as they are met. Using
+# the same name objects lets events of a type share their instance dict keys.
+ATTRIBUTE_NAMES: dict[str, str] = {}
+
+
+def attribute_name(key: str) -> str:
+    """
+    Return the event attribute name of an SWF attribute, e.g.
+    "scheduledEventId" -> "scheduled_event_id".
+    """
+    name = ATTRIBUTE_NAMES.get(key)
+    if name is None:
+        name = ATTRIBUTE_NAMES[key] = camel_to_underscore(key)
+    return name
+
+
 class Event:
     """Simple workflow execution event wrapper base class
 
@@ -34,28 +50,37 @@ class Event:
     :param  state: event current state
     :param  timestamp: event creation timestamp
     :param  raw_data: raw_event representation provided by amazon service
+    :param  name: event name (SWF eventType), e.g. 'DecisionTaskScheduleFailed'
+    :param  attributes_key: key of the event attributes in raw_data
     """
 
-    # These class attributes manipulate instance ones
     _type: str | None = None
-    _name: str | None = None
-    _attributes_key: str | None = None
     _attributes: Any = None
 
     excluded_attributes = ("eventId", "eventType", "eventTimestamp")
 
+    # Attributes set through a property, and decoded on first access
+    decoded_attributes = frozenset(("input", "control"))
+
     def __init__(
         self,
         id: int,
         state: str,
         timestamp: float | datetime,
         raw_data: dict | None,
+        name: str | None = None,
+        attributes_key: str | None = None,
     ):
         """ """
         self._id = id
         self._state = state
         self._timestamp = timestamp
+        self._name = name
+        self._attributes_key = attributes_key
+        # Payloads are decoded on first access; see the input and control properties.
+        self._raw_input: str | None = None
         self._input: dict = {}
+        self._raw_control: str | None = None
         self._control: dict | None = None
         self.raw = raw_data or {}
 
@@ -88,22 +113,48 @@ class Event:
 
     @property
     def input(self) -> dict[str, Any]:
-        return self._input
+        try:
+            return self._input
+        except AttributeError:
+            self._input = format.decode(self._raw_input)
+            return self._input
 
     @input.setter
     def input(self, value):
-        self._input = format.decode(value)
+        self._raw_input = value
+        self.__dict__.pop("_input", None)
+
+    @property
+    def raw_input(self) -> str | None:
+        """Input as received from SWF, without decoding it."""
+        return self._raw_input
 
     @property
     def control(self) -> dict[str, Any] | None:
-        return self._control
+        try:
+            return self._control
+        except AttributeError:
+            self._control = format.decode(self._raw_control)
+            return self._control
 
     @control.setter
     def control(self, value):
-        self._control = format.decode(value)
+        self._raw_control = value
+        self.__dict__.pop("_control", None)
+
+    @property
+    def raw_control(self) -> str | None:
+        """Control as received from SWF, without decoding it."""
+        return self._raw_control
 
     def process_attributes(self):
         """Processes the event raw_data attributes_key elements
         and sets current instance attributes accordingly"""
+        values = self.__dict__
+        decoded_attributes = self.decoded_attributes
         for key, value in self.raw[self._attributes_key].items():
-            setattr(self, camel_to_underscore(key), value)
+            name = attribute_name(key)
+            if name in decoded_attributes:
+                setattr(self, name, value)
+            else:
+                values[name] = value
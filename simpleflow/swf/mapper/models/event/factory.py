@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple
 
 from simpleflow.swf.mapper.models.event.marker import CompiledMarkerEvent, MarkerEvent
 from simpleflow.swf.mapper.models.event.task import (
@@ -35,6 +35,15 @@ EVENTS = {
 }
 
 
+class EventSpec(NamedTuple):
+    """What EventFactory derives from an SWF eventType."""
+
+    klass: type[Event]
+    type: str
+    state: str
+    attributes_key: str
+
+
 class EventFactory:
     """Processes an input json event representation, and instantiates
     an ``simpleflow.swf.mapper.models.event.Event`` subclass instance accordingly.
@@ -67,30 +76,47 @@ class EventFactory:
     # eventType to Event subclass bindings
     events = EVENTS
 
+    # eventType to EventSpec, filled as event types are met
+    specs: ClassVar[dict[str, EventSpec]] = {}
+
     def __new__(cls, raw_event: dict[str, Any]) -> Event:
-        event_id = raw_event["eventId"]
         event_name = raw_event["eventType"]
-        event_timestamp = raw_event["eventTimestamp"]
-
-        event_type = cls._extract_event_type(event_name)
-        event_state = cls._extract_event_state(event_type, event_name)
-        # amazon swf format is not very normalized and event attributes
-        # response field is non-capitalized...
-        event_attributes_key = decapitalize(event_name) + "EventAttributes"
-
-        cls = EventFactory.events[event_type]["event"]
-        # ⚠️ changing class attributes: don't use them in instances!
-        cls._name = event_name
-        cls._attributes_key = event_attributes_key
-
-        instance = cls(
-            id=event_id,
-            state=event_state,
-            timestamp=event_timestamp,
+        spec = cls.specs.get(event_name)
+        if spec is None:
+            spec = cls.specs[event_name] = cls.get_spec(event_name)
+
+        return spec.klass(
+            id=raw_event["eventId"],
+            state=spec.state,
+            timestamp=raw_event["eventTimestamp"],
             raw_data=raw_event,
+            name=event_name,
+            attributes_key=spec.attributes_key,
         )
 
-        return instance
+    @classmethod
+    def get_spec(cls, event_name: str) -> EventSpec:
+        """Computes how to build an event from its eventType
+
+        Example:
+
+            with event_name = 'StartChildWorkflowExecutionInitiated'
+
+        Returns:
+
+            EventSpec(ChildWorkflowExecutionEvent, 'ChildWorkflowExecution', 'start_initiated',
+                      'startChildWorkflowExecutionInitiatedEventAttributes')
+
+        """
+        event_type = cls._extract_event_type(event_name)
+        return EventSpec(
+            klass=cls.events[event_type]["event"],
+            type=event_type,
+            state=cls._extract_event_state(event_type, event_name),
+            # amazon swf format is not very normalized and event attributes
+            # response field is non-capitalized...
+            attributes_key=decapitalize(event_name) + "EventAttributes",
+        )
 
     @classmethod
     def _extract_event_type(cls, event_name: str) -> str | None:
@@ -699,6 +699,40 @@ class History(simpleflow.swf.mapper.models.History):
 
         return self
 
+    def add_signal_external_workflow(self, name, workflow_id, run_id, input=None, decision_id=0):
+        initiated_id = self.next_id
+        self.events.append(
+            EventFactory(
+                {
+                    "eventId": initiated_id,
+                    "eventTimestamp": new_timestamp_string(),
+                    "eventType": "SignalExternalWorkflowExecutionInitiated",
+                    "signalExternalWorkflowExecutionInitiatedEventAttributes": {
+                        "decisionTaskCompletedEventId": decision_id,
+                        "input": json_dumps(input) if input is not None else "{}",
+                        "runId": run_id,
+                        "signalName": name,
+                        "workflowId": workflow_id,
+                    },
+                }
+            )
+        )
+        self.events.append(
+            EventFactory(
+                {
+                    "eventId": self.next_id,
+                    "eventTimestamp": new_timestamp_string(),
+                    "eventType": "ExternalWorkflowExecutionSignaled",
+                    "externalWorkflowExecutionSignaledEventAttributes": {
+                        "initiatedEventId": initiated_id,
+                        "workflowExecution": {"runId": run_id, "workflowId": workflow_id},
+                    },
+                }
+            )
+        )
+
+        return self
+
     def add_marker(self, name, details=None):
         self.events.append(
             EventFactory(
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from simpleflow import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+
+__all__ = ["CompletionQueue"]
+
+_STOP = object()  # asks a completion thread to exit
+
+
+class CompletionQueue:
+    """
+    Background queue of responses to SWF (completing or failing tasks), so
+    that a poller returns to polling while they are sent.
+
+    The queued calls are expected to retry by themselves, as the poller's
+    ``*_with_retry()`` methods do; their errors are logged. The queue keeps
+    metrics about its depth and the latency of the responses, from queueing
+    to done.
+    """
+
+    def __init__(self, nb_threads: int = 4) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self._nb_threads = nb_threads
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.nb_done = 0
+        self.nb_errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} depth={self.depth} done={self.nb_done}>"
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of queued or running responses.
+        """
+        return self._queue.unfinished_tasks
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "depth": self.depth,
+                "done": self.nb_done,
+                "errors": self.nb_errors,
+                "latency_mean": self.total_latency / self.nb_done if self.nb_done else 0.0,
+                "latency_max": self.max_latency,
+            }
+
+    def start(self) -> None:
+        while len(self._threads) < self._nb_threads:
+            thread = threading.Thread(target=self._run, name="simpleflow-completion", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def put(self, func: Callable[..., Any], *args, **kwargs) -> None:
+        """
+        Queue a call to *func*.
+        """
+        self.start()
+        self._queue.put((time.monotonic(), func, args, kwargs))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait up to *timeout* seconds (forever if None) for the queued
+        responses to be done, and return whether they are.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self) -> None:
+        """
+        Flush the queue, then stop the threads.
+        """
+        if not self._threads:
+            return
+        if self.depth:
+            logger.info(f"flushing {self.depth} pending responses to SWF")
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        logger.info(f"completion queue metrics: {self.metrics()}")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            queued_at, func, args, kwargs = item
+            error = False
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                error = True
+                logger.exception(f"cannot respond to SWF with {getattr(func, '__name__', func)!r}")
+            latency = time.monotonic() - queued_at
+            with self._lock:
+                self.nb_done += 1
+                self.nb_errors += error
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+            self._queue.task_done()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 from typing import TYPE_CHECKING
 
@@ -8,16 +9,19 @@ import multiprocess
 import simpleflow.swf.mapper.actors
 import simpleflow.swf.mapper.exceptions
 import simpleflow.swf.mapper.models.decision
-from simpleflow import format, logger
-from simpleflow.process import Supervisor, with_state
+from simpleflow import format, logger, settings
+from simpleflow.process import ProcessPool, Supervisor, with_state
+from simpleflow.swf.mapper.models.history.base import History
+from simpleflow.swf.mapper.models.workflow import WorkflowExecution, WorkflowType
+from simpleflow.swf.mapper.responses import Response
 from simpleflow.swf.process.poller import Poller
 from simpleflow.swf.utils import DecisionsAndContext, get_name_from_event
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from typing import Any
 
     from simpleflow.swf.executor import Executor
-    from simpleflow.swf.mapper.responses import Response
 
 
 class Decider(Supervisor):
@@ -28,11 +32,12 @@ class Decider(Supervisor):
     :type _poller: DeciderPoller
     """
 
-    def __init__(self, poller, nb_children=None):
+    def __init__(self, poller, nb_children=None, autoscaler=None):
         self._poller = poller
         super().__init__(
             payload=self._poller.start,
             nb_children=nb_children,
+            autoscaler=autoscaler,
         )
 
 
@@ -55,6 +60,8 @@ class DeciderPoller(Poller, simpleflow.swf.mapper.actors.Decider):
         task_list: str,
         is_standalone: bool,
         nb_retries: int = 3,
+        decision_pool_size: int | None = None,
+        max_decisions_per_child: int | None = None,
         *args,
         **kwargs,
     ) -> None:
@@ -74,8 +81,17 @@ class DeciderPoller(Poller, simpleflow.swf.mapper.actors.Decider):
         behind this is to limit operational burden by having a single service
         handling multiple workflows.
 
+        By default, each decision task is handled in a forked process. With a
+        *decision_pool_size*, decision tasks are sent to a pool of long-lived
+        processes instead, each replaced after *max_decisions_per_child*
+        decisions if set.
+
         :param workflow_executors: executors handling workflow executions.
         :type  workflow_executors: list[simpleflow.swf.executor.Executor]
+        :param decision_pool_size: number of pooled decision processes; 0 or None forks per decision.
+        :type  decision_pool_size: Optional[int]
+        :param max_decisions_per_child: number of decisions before a pooled process is replaced.
+        :type  max_decisions_per_child: Optional[int]
 
         """
         self.workflow_name = f"{','.join([ex.workflow_class.name for ex in workflow_executors])}"
@@ -97,11 +113,17 @@ class DeciderPoller(Poller, simpleflow.swf.mapper.actors.Decider):
         self.nb_retries = nb_retries
         self.domain = domain
         self.is_standalone = is_standalone
+        self.decision_pool_size = decision_pool_size
+        self.max_decisions_per_child = max_decisions_per_child
+        self._decision_pool: ProcessPool | None = None
 
         # All executors must have the same domain.
         self._check_all_domains_identical()
 
         super().__init__(domain, self.task_list)
+        # Only decisions are pipelined: they are short, unlike activity tasks,
+        # which would wait for the current one without heartbeating.
+        self.pipelined = settings.SIMPLEFLOW_PIPELINED_POLLING
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.domain.name}, {self.task_list}, {','.join(self._workflow_executors)})"
@@ -132,6 +154,10 @@ class DeciderPoller(Poller, simpleflow.swf.mapper.actors.Decider):
             suffix = ""
         return f"{self.__class__.__name__}{suffix}"
 
+    def count_pending(self) -> int:
+        response = self.count_connection.count_pending_decision_tasks(self.domain.name, self.task_list)
+        return response["count"]
+
     @with_state("polling")
     def poll(self, task_list: str | None = None, identity: str | None = None, **kwargs) -> Response:
         return simpleflow.swf.mapper.actors.Decider.poll(self, task_list, identity, **kwargs)
@@ -157,18 +183,52 @@ class DeciderPoller(Poller, simpleflow.swf.mapper.actors.Decider):
             )
         return simpleflow.swf.mapper.actors.Decider.complete(self, token, decisions, execution_context)
 
+    @property
+    def decision_pool(self) -> ProcessPool | None:
+        """
+        Pool of decision processes, started before the first poll in the
+        poller process. Each process uses its own SWF client.
+        """
+        if not self.decision_pool_size:
+            return None
+        if self._decision_pool is None:
+            self._decision_pool = ProcessPool(
+                functools.partial(process_decision_payload, self),
+                self.decision_pool_size,
+                max_tasks_per_child=self.max_decisions_per_child,
+                initializer=self.use_own_client,
+            )
+            self._decision_pool.start()
+        return self._decision_pool
+
+    def start(self):
+        pool = self.decision_pool  # forked before a poll uses the client
+        try:
+            super().start()
+        finally:
+            if pool is not None:
+                pool.join()
+                self._decision_pool = None
+
     @with_state("processing")
     def process(self, decision_response):
         """
         Take a PollForDecisionTask response object and try to complete the
         decision task, by calling self._complete() with the response token and
-        a set of decisions. We fork so it protects us reliably against memory
-        leaks on long-running deciders.
+        a set of decisions. We fork (or use pooled processes replaced
+        periodically) so it protects us reliably against memory leaks on
+        long-running deciders.
 
         :param decision_response: an object wrapping the PollForDecisionTask response.
         :type  decision_response:  simpleflow.swf.mapper.responses.Response
         """
-        spawn(self, decision_response)
+        pool = self.decision_pool
+        if pool is None:
+            spawn(self, decision_response)
+            return
+        logger.debug(f"submitting decision for workflow {decision_response.execution.workflow_id} to the pool")
+        # the process of the previous decision may hold a snapshot of the history
+        pool.submit(make_decision_payload(decision_response), key=decision_response.execution.run_id)
 
     @with_state("deciding")
     def decide(self, decision_response):
@@ -240,13 +300,28 @@ class DeciderWorker:
         return decisions
 
 
-def process_decision(poller: DeciderPoller, decision_response: Response) -> None:
+def process_decision(
+    poller: DeciderPoller,
+    decision_response: Response,
+    respond: Callable[[Any], None] | None = None,
+) -> None:
+    """
+    Take a decision and complete it, or hand the decisions over to *respond*
+    if set.
+    """
     workflow_id = decision_response.execution.workflow_id
-    workflow_str = f"workflow {workflow_id} ({poller.workflow_name})"
     logger.debug(f"process_decision() pid={os.getpid()}")
-    logger.info(f"taking decision for {workflow_str}")
-    format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+    logger.info(f"taking decision for workflow {workflow_id} ({poller.workflow_name})")
     decisions = poller.decide(decision_response)
+    logger.debug(f"jumbo fields cache metrics: {format.jumbo_fields_cache_metrics()}")
+    if respond is not None:
+        respond(decisions)
+        return
+    complete_decision(poller, decision_response, decisions)
+
+
+def complete_decision(poller: DeciderPoller, decision_response: Response, decisions: Any) -> None:
+    workflow_str = f"workflow {decision_response.execution.workflow_id} ({poller.workflow_name})"
     try:
         logger.info(f"completing decision for {workflow_str}")
         poller.complete_with_retry(decision_response.token, decisions)
@@ -254,11 +329,76 @@ def process_decision(poller: DeciderPoller, decision_response: Response) -> None
         logger.error(f"cannot complete decision for {workflow_str}: {err}")
 
 
+def make_decision_payload(decision_response: Response) -> dict[str, Any]:
+    """
+    Turn a decision response into a picklable payload for a pooled process:
+    the response references SWF clients that cannot be sent through a pipe.
+    """
+    execution = decision_response.execution
+    history = decision_response.history
+    events = getattr(history, "raw", None)
+    if events is None:
+        events = [event.raw for event in history.events]
+    return {
+        "token": decision_response.token,
+        "events": events,
+        "workflow_id": execution.workflow_id,
+        "run_id": execution.run_id,
+        "workflow_type": (execution.workflow_type.name, execution.workflow_type.version),
+    }
+
+
+def process_decision_payload(poller: DeciderPoller, payload: dict[str, Any]) -> None:
+    """
+    Rebuild the decision response from a payload (see `make_decision_payload`)
+    and process it.
+    """
+    name, version = payload["workflow_type"]
+    execution = WorkflowExecution(
+        domain=poller.domain,
+        workflow_id=payload["workflow_id"],
+        run_id=payload["run_id"],
+        workflow_type=WorkflowType(domain=poller.domain, name=name, version=version),
+    )
+    decision_response = Response(
+        token=payload["token"],
+        history=History.from_event_list(payload["events"]),
+        execution=execution,
+    )
+    process_decision(poller, decision_response)
+
+
 def spawn(poller, decision_response):
+    """
+    Decide in a forked process. With async completion, the process sends its
+    decisions back, and the poller completes them from its completion queue.
+    """
     logger.debug(f"spawn() pid={os.getpid()}")
+    completion_queue = poller.completion_queue
+    if completion_queue is None:
+        worker = multiprocess.Process(
+            target=process_decision,
+            args=(poller, decision_response),
+        )
+        worker.start()
+        worker.join()
+        return
+
+    reader, writer = multiprocess.Pipe(duplex=False)
     worker = multiprocess.Process(
         target=process_decision,
-        args=(poller, decision_response),
+        args=(poller, decision_response, writer.send),
     )
     worker.start()
+    writer.close()
+    try:
+        decisions = reader.recv()  # before joining: the process may block on large decisions
+    except EOFError:
+        decisions = None
+    finally:
+        reader.close()
     worker.join()
+    if decisions is None:
+        logger.error(f"decision process {worker.pid} died: exit code {worker.exitcode}")
+        return
+    completion_queue.put(complete_decision, poller, decision_response, decisions)
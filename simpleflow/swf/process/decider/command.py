@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from simpleflow import logger
+from simpleflow.process import preload_modules
 
 from . import helpers
 
@@ -16,6 +17,11 @@ def start(
     is_standalone=False,
     repair_workflow_id=None,
     repair_run_id=None,
+    decision_pool_size=None,
+    max_decisions_per_child=None,
+    preload=None,
+    min_processes=None,
+    max_processes=None,
 ):
     """
     Start a decider.
@@ -39,9 +45,20 @@ def start(
     :type repair_workflow_id: Optional[str]
     :param repair_run_id: run ID to repair
     :type repair_run_id: Optional[str]
+    :param decision_pool_size: number of long-lived decision processes per poller
+    :type decision_pool_size: Optional[int]
+    :param max_decisions_per_child: number of decisions before a pooled decision process is replaced
+    :type max_decisions_per_child: Optional[int]
+    :param preload: modules imported before forking the processes, see SIMPLEFLOW_PRELOAD_MODULES
+    :type preload: Optional[list[str]]
+    :param min_processes: minimum number of processes when autoscaling (default: 1)
+    :type min_processes: Optional[int]
+    :param max_processes: scale the number of processes up to this, from the backlog of the task list
+    :type max_processes: Optional[int]
     """
     if log_level:
         logger.warning("Deprecated: --log-level will be removed, use LOG_LEVEL environment variable instead")
+    preload_modules(preload)
     decider = helpers.make_decider(
         workflows,
         domain,
@@ -52,6 +69,10 @@ def start(
         is_standalone=is_standalone,
         repair_workflow_id=repair_workflow_id,
         repair_run_id=repair_run_id,
+        decision_pool_size=decision_pool_size,
+        max_decisions_per_child=max_decisions_per_child,
+        min_children=min_processes,
+        max_children=max_processes,
     )
     decider.is_alive = True
     decider.start()
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 
 import simpleflow.swf.mapper.models
 from simpleflow import logger
+from simpleflow.process import Autoscaler
 from simpleflow.swf.executor import Executor
 from simpleflow.utils import import_from_module
 
@@ -51,6 +52,8 @@ def make_decider_poller(
     is_standalone: bool = False,
     repair_workflow_id: str | None = None,
     repair_run_id: str | None = None,
+    decision_pool_size: int | None = None,
+    max_decisions_per_child: int | None = None,
 ) -> DeciderPoller:
     """
     Factory building a decider poller.
@@ -76,7 +79,14 @@ def make_decider_poller(
         )
         for workflow in workflows
     ]
-    return DeciderPoller(executors, domain, task_list, is_standalone)
+    return DeciderPoller(
+        executors,
+        domain,
+        task_list,
+        is_standalone,
+        decision_pool_size=decision_pool_size,
+        max_decisions_per_child=max_decisions_per_child,
+    )
 
 
 def make_decider(
@@ -89,6 +99,10 @@ def make_decider(
     is_standalone: bool = False,
     repair_workflow_id: str | None = None,
     repair_run_id: str | None = None,
+    decision_pool_size: int | None = None,
+    max_decisions_per_child: int | None = None,
+    min_children: int | None = None,
+    max_children: int | None = None,
 ) -> Decider:
     """
     Instantiate a Decider.
@@ -97,6 +111,10 @@ def make_decider(
     is_standalone: Whether the executor uses this task list (and pass it to the workers)
     repair_workflow_id: workflow ID to repair
     repair_run_id: run ID to repair
+    decision_pool_size: number of long-lived decision processes per poller (default: fork per decision)
+    max_decisions_per_child: number of decisions before a pooled decision process is replaced
+    min_children: minimum number of decider processes when autoscaling (default: 1)
+    max_children: scale the number of decider processes up to this, from the backlog of the task list
     """
     poller = make_decider_poller(
         workflows,
@@ -107,5 +125,10 @@ def make_decider(
         is_standalone=is_standalone,
         repair_workflow_id=repair_workflow_id,
         repair_run_id=repair_run_id,
+        decision_pool_size=decision_pool_size,
+        max_decisions_per_child=max_decisions_per_child,
     )
-    return Decider(poller, nb_children=nb_children)
+    autoscaler = None
+    if max_children:
+        autoscaler = Autoscaler(poller.count_pending, min_children or 1, max_children)
+    return Decider(poller, nb_children=nb_children, autoscaler=autoscaler)
@@ -2,14 +2,18 @@ from __future__ import annotations
 
 import abc
 import os
+import queue
 import signal
+import threading
 from typing import TYPE_CHECKING, Any
 
 import simpleflow.swf.mapper.actors
 import simpleflow.swf.mapper.exceptions
-from simpleflow import logger, utils
+from simpleflow import logger, settings, utils
 from simpleflow.process import NamedMixin, with_state
 from simpleflow.swf.helpers import swf_identity
+from simpleflow.swf.mapper.core import ConnectedSWFObject
+from simpleflow.swf.process.completion import CompletionQueue
 
 if TYPE_CHECKING:
     from simpleflow.swf.mapper.models.domain import Domain
@@ -17,12 +21,22 @@ if TYPE_CHECKING:
 
 __all__ = ["Poller"]
 
+_POLLING_DONE = object()  # sent by the polling thread when it exits
+
 
 class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
     """Multi-processing implementation of a SWF actor."""
 
     def __init__(self, domain: Domain, task_list: str | None = None) -> None:
         self.is_alive = False
+        # Poll the next task while processing the current one; see start_pipelined().
+        self.pipelined = False
+        self._poll_thread_ident: int | None = None
+        self._poll_client = None
+        # Respond to SWF from a background queue; see completion_queue.
+        self.async_completion = settings.SIMPLEFLOW_ASYNC_COMPLETION
+        self._completion_queue: CompletionQueue | None = None
+        self._count_connection: ConnectedSWFObject | None = None
         self._named_mixin_properties = ["task_list"]
 
         super().__init__(domain, task_list)
@@ -30,6 +44,27 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
     def __repr__(self):
         return f"{self.__class__.__name__}(domain={self.domain.name}, task_list={self.task_list})"
 
+    @property
+    def boto3_client(self):
+        # The polling thread of start_pipelined() or start_slots() has its own
+        # client: the main thread forks processes meanwhile, which use the other one.
+        if self._poll_client is not None and threading.get_ident() == self._poll_thread_ident:
+            return self._poll_client
+        return self._boto3_client
+
+    @boto3_client.setter
+    def boto3_client(self, client) -> None:
+        self._boto3_client = client
+
+    def use_own_client(self) -> None:
+        """
+        Replace the SWF client of the poller and its domain, in a process
+        forked by the poller process: the inherited one shares connections
+        the poller keeps using.
+        """
+        self.boto3_client = ConnectedSWFObject(region=self.region).boto3_client
+        self.domain.boto3_client = self.boto3_client
+
     @property
     def identity(self) -> str:
         """Identity when polling decision task.
@@ -71,6 +106,18 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
         self.bind_signal_handlers()
         self.is_alive = True
         self.set_process_name()
+        try:
+            self.main_loop()
+        finally:
+            self.stop_completion_queue()
+
+    def main_loop(self):
+        """
+        Poll and process tasks until stopped.
+        """
+        if self.pipelined:
+            self.start_pipelined()
+            return
         while self.is_alive:
             try:
                 response = self.poll_with_retry()
@@ -78,6 +125,55 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
                 continue
             self.process(response)
 
+    def start_pipelined(self):
+        """
+        Main loop where a background thread keeps one poll outstanding while
+        the current task is processed, saving a poll round-trip per task.
+
+        The polling thread waits for each task to be taken by the main thread
+        before polling the next one, so at most one task waits for processing.
+        Once stopped, tasks already polled are still processed.
+
+        Only meant for short tasks such as decisions: a polled task waits for
+        the current one without being started nor heartbeating. The polling
+        thread uses its own SWF client, so that the processes forked by the
+        main thread never use a client (and its connections) busy polling.
+        """
+        if self._poll_client is None:
+            self._poll_client = ConnectedSWFObject(own_client=True).boto3_client
+        responses: queue.Queue = queue.Queue(maxsize=1)
+        thread = threading.Thread(target=self._poll_ahead, args=(responses,), name="simpleflow-poller", daemon=True)
+        thread.start()
+        while True:
+            response = responses.get()
+            responses.task_done()
+            if response is _POLLING_DONE:
+                break
+            if isinstance(response, Exception):
+                raise response
+            self.process(response)
+        thread.join()
+
+    def _poll_ahead(self, responses: queue.Queue) -> None:
+        """
+        Polling thread of start_pipelined(): hand tasks (or the exception
+        stopping the polling) over to the main thread until stopped.
+        """
+        self._poll_thread_ident = threading.get_ident()
+        try:
+            while self.is_alive:
+                try:
+                    response = self.poll_with_retry()
+                except simpleflow.swf.mapper.exceptions.PollTimeout:
+                    continue
+                except Exception as err:
+                    responses.put(err)
+                    return
+                responses.put(response)
+                responses.join()  # wait for the main thread to take it
+        finally:
+            responses.put(_POLLING_DONE)
+
     @with_state("running")
     def run_once(self):
         """
@@ -87,13 +183,37 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
         self.bind_signal_handlers()
         self.is_alive = True
         self.set_process_name()
-        while self.is_alive:
-            try:
-                response = self.poll_with_retry()
-            except simpleflow.swf.mapper.exceptions.PollTimeout:
-                continue
-            self.process(response)
-            break
+        try:
+            while self.is_alive:
+                try:
+                    response = self.poll_with_retry()
+                except simpleflow.swf.mapper.exceptions.PollTimeout:
+                    continue
+                self.process(response)
+                break
+        finally:
+            self.stop_completion_queue()
+
+    @property
+    def completion_queue(self) -> CompletionQueue | None:
+        """
+        Queue responding to SWF in background threads of the poller process,
+        if async completion is enabled. Processes forked by the poller must
+        not use it: they hand their responses over to the poller instead.
+        """
+        if not self.async_completion:
+            return None
+        if self._completion_queue is None:
+            self._completion_queue = CompletionQueue()
+        return self._completion_queue
+
+    def stop_completion_queue(self) -> None:
+        """
+        Flush the pending responses, on shutdown.
+        """
+        if self._completion_queue is not None:
+            self._completion_queue.stop()
+            self._completion_queue = None
 
     @with_state("stopping")
     def stop_gracefully(self):
@@ -164,6 +284,25 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
         response = poll(task_list, identity=identity)
         return response
 
+    @property
+    def count_connection(self) -> ConnectedSWFObject:
+        """
+        SWF connection counting the pending tasks, for the autoscaling of the
+        supervisor process. It has its own client: the processes forked by
+        the supervisor keep using the one of the poller, and must not share
+        its connections.
+        """
+        if self._count_connection is None:
+            self._count_connection = ConnectedSWFObject(own_client=True)
+        return self._count_connection
+
+    @abc.abstractmethod
+    def count_pending(self) -> int:
+        """
+        Approximate number of tasks waiting in the task list.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def fail(self, *args, **kwargs):
         """fail; only relevant for activity workers."""
@@ -1,40 +1,50 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import os
-import sys
+import queue
+import threading
+import time
 import traceback
 from base64 import b64decode
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 import multiprocess
 import psutil
+from multiprocess.connection import wait
 
 import simpleflow.swf.mapper.actors
 import simpleflow.swf.mapper.exceptions
-from simpleflow import format, logger, settings
+from simpleflow import format, logger, logging_context, settings
 from simpleflow.dispatch import dynamic_dispatcher
 from simpleflow.download import download_binaries
 from simpleflow.exceptions import ExecutionError
-from simpleflow.process import Supervisor, with_state
+from simpleflow.process import ProcessPool, Supervisor, with_state
+from simpleflow.swf.mapper.core import ConnectedSWFObject
 from simpleflow.swf.mapper.models.activity import ActivityTask as BaseActivityTask
 from simpleflow.swf.mapper.responses import Response
-from simpleflow.swf.process.poller import Poller
+from simpleflow.swf.process.poller import _POLLING_DONE, Poller
 from simpleflow.swf.task import ActivityTask
 from simpleflow.swf.utils import sanitize_activity_context
 from simpleflow.utils import format_exc, format_exc_type, json_dumps
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from simpleflow.activity import Activity
     from simpleflow.swf.mapper.models.domain import Domain
 
 
 class Worker(Supervisor):
-    def __init__(self, poller, nb_children=None):
+    def __init__(self, poller, nb_children=None, autoscaler=None):
         self._poller = poller
         super().__init__(
             payload=self._poller.start,
             nb_children=nb_children,
+            autoscaler=autoscaler,
         )
 
 
@@ -50,11 +60,25 @@ class ActivityPoller(Poller, simpleflow.swf.mapper.actors.ActivityWorker):
         middlewares: dict[str, list[str]] | None = None,
         heartbeat: int = 60,
         poll_data: str | None = None,
+        reuse_processes: bool = False,
+        max_tasks_per_child: int | None = None,
+        nb_slots: int = 1,
+        nb_coroutines: int | None = None,
+        executor: str = "process",
     ) -> None:
         """
         :param middlewares: Paths to middleware functions to execute before and after any Activity
         :param process_mode: Whether to process locally (default)
+        :param reuse_processes: Run the tasks in long-lived processes instead of forking one per task
+        :param max_tasks_per_child: Number of tasks before a reused process is replaced
+        :param nb_slots: Number of tasks run concurrently by this poller
+        :param nb_coroutines: Run up to this many async activities concurrently on an event loop
+        :param executor: Run the tasks in processes ("process") or in threads of this process ("thread")
         """
+        if nb_slots < 1:
+            raise ValueError("an activity poller needs at least one slot")
+        if executor not in ("process", "thread"):
+            raise ValueError(f"unknown executor {executor!r}, expected 'process' or 'thread'")
         self.nb_retries = 3
         # heartbeat=0 is a special value to disable heartbeating. We want to
         # replace it by None because multiprocessing.Process.join() treats
@@ -63,12 +87,22 @@ class ActivityPoller(Poller, simpleflow.swf.mapper.actors.ActivityWorker):
         self.middlewares = middlewares
 
         self.poll_data = poll_data
+        self.reuse_processes = reuse_processes
+        self.max_tasks_per_child = max_tasks_per_child
+        self.nb_slots = nb_slots
+        self.nb_coroutines = nb_coroutines
+        self.executor = executor
+        self._process_pool: ProcessPool | None = None
         super().__init__(domain, task_list)
 
     @property
     def name(self):
         return f"{self.__class__.__name__}(task_list={self.task_list})"
 
+    def count_pending(self) -> int:
+        response = self.count_connection.count_pending_activity_tasks(self.domain.name, self.task_list)
+        return response["count"]
+
     @with_state("polling")
     def poll(self, task_list: str | None = None, identity: str | None = None) -> Response:
         if self.poll_data:
@@ -91,18 +125,316 @@ class ActivityPoller(Poller, simpleflow.swf.mapper.actors.ActivityWorker):
             raw_response=polled_activity_data,
         )
 
+    @property
+    def process_pool(self) -> ProcessPool | None:
+        """
+        Pool of activity processes, started on first use in the poller process.
+        """
+        if not self.reuse_processes:
+            return None
+        if self._process_pool is None:
+            self._process_pool = ProcessPool(
+                functools.partial(process_task_payload, self),
+                self.nb_slots,
+                max_tasks_per_child=self.max_tasks_per_child,
+                initializer=self.use_own_client,
+            )
+            self._process_pool.start()
+        return self._process_pool
+
+    def start(self):
+        try:
+            super().start()
+        finally:
+            if self._process_pool is not None:
+                self._process_pool.join()
+                self._process_pool = None
+
+    def main_loop(self):
+        if self.nb_coroutines:
+            asyncio.run(self.start_coroutines())
+        elif self.executor == "thread":
+            self.start_threads()
+        elif self.nb_slots > 1:
+            self.start_slots()
+        else:
+            super().main_loop()
+
+    def start_threads(self):
+        """
+        Main loop running up to nb_slots tasks concurrently in threads of this
+        process: the main thread polls while a thread is free, and a heartbeat
+        thread serves all the running tasks.
+
+        Threads cannot be interrupted: a task that should stop (cancelled, or
+        no longer existing) is left to finish, and no longer heartbeated.
+        Once stopped, running tasks are waited for.
+        """
+        free_slots = threading.Semaphore(self.nb_slots)
+        running: dict[str, ActivityTask] = {}  # by token
+        done = threading.Event()
+        heartbeats = None
+        if self._heartbeat:
+            heartbeats = threading.Thread(
+                target=self._heartbeat_threads,
+                args=(running, done),
+                name="simpleflow-heartbeat",
+                daemon=True,
+            )
+            heartbeats.start()
+
+        def on_done(token: str) -> None:
+            running.pop(token, None)
+            free_slots.release()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.nb_slots, thread_name_prefix="simpleflow-activity") as executor:
+                while self.is_alive:
+                    if not free_slots.acquire(timeout=1):
+                        continue
+                    try:
+                        response = self.poll_with_retry()
+                    except simpleflow.swf.mapper.exceptions.PollTimeout:
+                        free_slots.release()
+                        continue
+                    except Exception:
+                        free_slots.release()
+                        raise
+                    token = response.task_token
+                    running[token] = response.activity_task
+                    future = executor.submit(
+                        self.make_worker(token, response.activity_task).process,
+                        self,
+                        token,
+                        response.activity_task,
+                        self.middlewares,
+                    )
+                    future.add_done_callback(lambda _, token=token: on_done(token))
+        finally:
+            done.set()
+            if heartbeats is not None:
+                heartbeats.join()
+
+    def _heartbeat_threads(self, running: dict[str, ActivityTask], done: threading.Event) -> None:
+        """
+        Heartbeat thread of start_threads(): heartbeat for the running tasks
+        every heartbeat interval, until done.
+        """
+        while not done.wait(self._heartbeat):
+            for token, task in list(running.items()):
+                logger.debug(f"heartbeating for activity id={task.activity_id} (token={token})")
+                try:
+                    go_on = heartbeat_task(self, token, task)
+                except Exception:
+                    continue  # already logged; the heartbeat timeout may eventually trigger on SWF side
+                if not go_on:
+                    logger.warning(f"activity id={task.activity_id} should stop, but cannot be interrupted in a thread")
+                    running.pop(token, None)
+
+    async def start_coroutines(self):
+        """
+        Main loop running up to nb_coroutines tasks concurrently on an event
+        loop: async activities run as coroutines of this process, heartbeats
+        and cancellations being delivered as asyncio cancellations; the other
+        activities are spawned in processes as usual, from threads of their
+        own so that they don't hold up polls and heartbeats.
+
+        Polling happens in a thread, only while a coroutine slot is free.
+        Once stopped, running tasks are awaited.
+        """
+        free_slots = asyncio.Semaphore(self.nb_coroutines)
+        running: set[asyncio.Task] = set()
+        spawner = ThreadPoolExecutor(max_workers=self.nb_coroutines, thread_name_prefix="simpleflow-spawn")
+
+        def on_done(aio_task: asyncio.Task) -> None:
+            running.discard(aio_task)
+            free_slots.release()
+
+        try:
+            while self.is_alive:
+                await free_slots.acquire()
+                if not self.is_alive:
+                    free_slots.release()
+                    break
+                try:
+                    response = await asyncio.to_thread(self.poll_with_retry)
+                except simpleflow.swf.mapper.exceptions.PollTimeout:
+                    free_slots.release()
+                    continue
+                except Exception:
+                    free_slots.release()
+                    raise
+                aio_task = asyncio.create_task(self.process_coroutine(response, spawner))
+                running.add(aio_task)
+                aio_task.add_done_callback(on_done)
+        finally:
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            spawner.shutdown()
+
+    async def process_coroutine(self, response: Response, spawner: ThreadPoolExecutor) -> None:
+        """
+        Process a poll response on the event loop; a sync activity is spawned
+        from a thread of spawner.
+        """
+        token = response.task_token
+        task = response.activity_task
+        try:
+            is_async = ActivityWorker().dispatch(task).is_async
+        except Exception:
+            is_async = False  # let the spawned process report the error
+        if not is_async:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                spawner, functools.partial(spawn, self, token, task, self.middlewares, self._heartbeat)
+            )
+            return
+
+        logger.info("running async activity id=%s", task.activity_id)
+        activity = asyncio.create_task(self.make_worker(token, task).process_async(self, token, task, self.middlewares))
+        heartbeats = asyncio.create_task(self.heartbeat_coroutine(token, task, activity)) if self._heartbeat else None
+        try:
+            await asyncio.wait([activity])
+        finally:
+            if heartbeats is not None:
+                heartbeats.cancel()
+        if activity.cancelled():
+            logger.warning("cancelled async activity id=%s", task.activity_id)
+        elif activity.exception():
+            logger.error(f"async activity id={task.activity_id} failed: {activity.exception()}")
+
+    async def heartbeat_coroutine(self, token: str, task: ActivityTask, activity: asyncio.Task) -> None:
+        """
+        Heartbeat for an async activity until it ends; cancel it if it should
+        not run anymore.
+        """
+        while True:
+            await asyncio.sleep(self._heartbeat)
+            logger.debug(f"heartbeating for async activity id={task.activity_id} (token={token})")
+            try:
+                go_on = await asyncio.to_thread(heartbeat_task, self, token, task)
+            except Exception:
+                # Already logged; the heartbeat timeout may eventually trigger on SWF side.
+                return
+            if not go_on:
+                activity.cancel()
+                return
+
+    def start_slots(self):
+        """
+        Main loop running up to nb_slots tasks concurrently: a background
+        thread long-polls while a slot is free, and the main thread starts the
+        polled tasks, heartbeats the running ones and frees the slots of those
+        that ended. The polling thread uses its own SWF client, as with
+        start_pipelined(), since the main thread forks processes meanwhile.
+
+        Once stopped, tasks already polled are still processed.
+        """
+        if self._poll_client is None:
+            self._poll_client = ConnectedSWFObject(own_client=True).boto3_client
+        free_slots = threading.Semaphore(self.nb_slots)
+        responses: queue.SimpleQueue = queue.SimpleQueue()
+        wakeup_r, wakeup_w = os.pipe()
+        thread = threading.Thread(
+            target=self._poll_for_slots,
+            args=(free_slots, responses, wakeup_w),
+            name="simpleflow-poller",
+            daemon=True,
+        )
+        thread.start()
+        running: list[RunningTask] = []
+        polling = True
+        error = None
+        try:
+            while polling or running:
+                timeout = None
+                if running and self._heartbeat:
+                    timeout = max(0.0, min(t.heartbeat_at for t in running) - time.monotonic())
+                # a pooled process may run a task whose predecessor is not seen as done yet
+                handles = list(dict.fromkeys([wakeup_r] + [h for t in running for h in t.handles]))
+                if wakeup_r in wait(handles, timeout=timeout):
+                    os.read(wakeup_r, 4096)
+                while True:
+                    try:
+                        response = responses.get_nowait()
+                    except queue.Empty:
+                        break
+                    if response is _POLLING_DONE:
+                        polling = False
+                    elif isinstance(response, Exception):
+                        error = response
+                    else:
+                        running.append(RunningTask(self, response, self.process_pool))
+
+                now = time.monotonic()
+                for t in list(running):
+                    if t.done():
+                        t.finish()
+                        running.remove(t)
+                        free_slots.release()
+                    elif self._heartbeat and t.heartbeat_at <= now:
+                        t.heartbeat()
+        except BaseException:
+            self.is_alive = False  # the polling thread may still write to the pipe: leave it open
+            raise
+        thread.join()
+        os.close(wakeup_r)
+        os.close(wakeup_w)
+        if error is not None:
+            raise error
+
+    def _poll_for_slots(self, free_slots: threading.Semaphore, responses: queue.SimpleQueue, wakeup_fd: int) -> None:
+        """
+        Polling thread of start_slots(): poll only while a slot is free, and
+        hand tasks (or the exception stopping the polling) over to the main
+        thread until stopped.
+        """
+        self._poll_thread_ident = threading.get_ident()
+        try:
+            while self.is_alive:
+                if not free_slots.acquire(timeout=1):
+                    continue
+                try:
+                    response = self.poll_with_retry()
+                except simpleflow.swf.mapper.exceptions.PollTimeout:
+                    free_slots.release()
+                    continue
+                except Exception as err:
+                    free_slots.release()
+                    responses.put(err)
+                    return
+                responses.put(response)
+                os.write(wakeup_fd, b"\0")
+        finally:
+            responses.put(_POLLING_DONE)
+            os.write(wakeup_fd, b"\0")
+
+    def make_worker(self, token: str, task: ActivityTask) -> ActivityWorker:
+        """
+        Worker for a task run in this process: with async completion, it
+        queues its response instead of sending it.
+        """
+        if not self.async_completion:
+            return ActivityWorker()
+        return ActivityWorker(respond=functools.partial(respond_later, self, token, task))
+
     @with_state("processing")
     def process(self, response: Response) -> None:
         """
         Process a simpleflow.swf.mapper.actors.ActivityWorker poll response.
         """
-        token = response.task_token
-        task = response.activity_task
-        spawn(self, token, task, self.middlewares, self._heartbeat)
+        pool = self.process_pool
+        if pool is None:
+            spawn(self, response.task_token, response.activity_task, self.middlewares, self._heartbeat)
+        else:
+            run_in_pool(self, pool, response, self._heartbeat)
 
     @with_state("completing")
     def complete(self, token: str, result: str | None = None) -> None:
-        simpleflow.swf.mapper.actors.ActivityWorker.complete(self, token, result)
+        """
+        Complete the activity with a result encoded by ``format.result``.
+        """
+        simpleflow.swf.mapper.actors.ActivityWorker.complete_encoded(self, token, result)
 
     # noinspection PyMethodOverriding
     @with_state("failing")
@@ -124,8 +456,18 @@ class ActivityPoller(Poller, simpleflow.swf.mapper.actors.ActivityWorker):
 
 
 class ActivityWorker:
-    def __init__(self, dispatcher=None):
+    """
+    Process activity tasks, then complete or fail them.
+
+    With a *respond* callable, the response is handed over to it instead of
+    being sent to SWF, as a ``("complete", encoded_result)`` or
+    ``("fail", reason, details)`` tuple: see `respond_later`. The result is
+    encoded by the worker, so that the response only holds strings.
+    """
+
+    def __init__(self, dispatcher=None, respond: Callable[[tuple], None] | None = None):
         self._dispatcher = dispatcher or dynamic_dispatcher.Dispatcher()
+        self._respond = respond
 
     def dispatch(self, task: ActivityTask) -> Activity:
         name = task.activity_type.name
@@ -136,42 +478,70 @@ class ActivityWorker:
     ) -> Any:
         logger.debug("ActivityWorker.process()")
         try:
-            activity = self.dispatch(task)
-            input = format.decode(task.input)
-            args = input.get("args", ())
-            kwargs = input.get("kwargs", {})
-            context = sanitize_activity_context(task.context)
-            context["domain_name"] = poller.domain.name
-            context["activity_task_list"] = poller.task_list
-            if input.get("meta", {}).get("binaries"):
-                download_binaries(input["meta"]["binaries"])
-            result = ActivityTask(
-                activity,
-                *args,
-                context=context,
-                simpleflow_middlewares=middlewares,
-                **kwargs,
-            ).execute()
-        except Exception:
-            exc_type, exc_value, exc_tb = sys.exc_info()
-            logger.exception(f"process error: {exc_value!s}")
-            if isinstance(exc_value, ExecutionError) and len(exc_value.args):
-                details = exc_value.args[0]
-                reason = format_exc(exc_value)  # FIXME json.loads and rebuild?
-            else:
-                tb = traceback.format_exception(exc_value, value=exc_value, tb=exc_tb)
-                reason = format_exc(exc_value)
-                details = json_dumps(
-                    {
-                        "error": exc_type.__name__,
-                        "error_type": format_exc_type(exc_type),
-                        "message": str(exc_value),
-                        "traceback": tb,
-                    },
-                    default=repr,
-                )
-            return poller.fail_with_retry(token, task, reason=reason, details=details)
+            result = self.make_activity_task(poller, task, middlewares).execute()
+        except Exception as err:
+            logger.exception(f"process error: {err!s}")
+            return self.fail(poller, token, task, err)
+        self.complete(poller, token, task, result)
 
+    async def process_async(
+        self, poller: ActivityPoller, token: str, task: ActivityTask, middlewares: dict[str, list[str]] | None = None
+    ) -> Any:
+        """
+        Process an async activity on the running event loop; SWF calls, and
+        decoding the input and downloading binaries (S3 GETs), are made in
+        threads.
+        """
+        logger.debug("ActivityWorker.process_async()")
+        try:
+            activity_task = await asyncio.to_thread(self.make_activity_task, poller, task, middlewares)
+            result = await activity_task.execute_async()
+        except Exception as err:
+            logger.exception(f"process error: {err!s}")
+            return await asyncio.to_thread(self.fail, poller, token, task, err)
+        await asyncio.to_thread(self.complete, poller, token, task, result)
+
+    def make_activity_task(
+        self, poller: ActivityPoller, task: ActivityTask, middlewares: dict[str, list[str]] | None = None
+    ) -> ActivityTask:
+        activity = self.dispatch(task)
+        input = format.decode(task.input)
+        args = input.get("args", ())
+        kwargs = input.get("kwargs", {})
+        context = sanitize_activity_context(task.context)
+        context["domain_name"] = poller.domain.name
+        context["activity_task_list"] = poller.task_list
+        if input.get("meta", {}).get("binaries"):
+            download_binaries(input["meta"]["binaries"])
+        return ActivityTask(
+            activity,
+            *args,
+            context=context,
+            simpleflow_middlewares=middlewares,
+            **kwargs,
+        )
+
+    def fail(self, poller: ActivityPoller, token: str, task: ActivityTask, error: Exception) -> Any:
+        reason, details = format_error(error)
+        if self._respond is not None:
+            return self._respond(("fail", reason, details))
+        return poller.fail_with_retry(token, task, reason=reason, details=details)
+
+    def complete(self, poller: ActivityPoller, token: str, task: ActivityTask, result: Any) -> Any:
+        try:
+            encoded_result = format.result(result)
+        except Exception as err:
+            logger.exception(f"cannot encode the result of activity id={task.activity_id}: {err!s}")
+            return self.fail(poller, token, task, err)
+        if self._respond is not None:
+            return self._respond(("complete", encoded_result))
+        self.complete_encoded(poller, token, task, encoded_result)
+
+    def complete_encoded(self, poller: ActivityPoller, token: str, task: ActivityTask, result: str) -> None:
+        """
+        Complete a task with a result encoded by ``format.result``; fail it if
+        SWF cannot be told.
+        """
         try:
             logger.info("completing activity id=%s", task.activity_id)
             poller.complete_with_retry(token, result)
@@ -181,11 +551,164 @@ class ActivityWorker:
             poller.fail_with_retry(token, task, reason)
 
 
-def process_task(poller, token: str, task: ActivityTask, middlewares: dict[str, list[str]] | None = None) -> None:
+def format_error(error: Exception) -> tuple[str, str]:
+    """
+    Return the reason and details to fail a task with, for *error*.
+    """
+    if isinstance(error, ExecutionError) and len(error.args):
+        details = error.args[0]
+        reason = format_exc(error)  # FIXME json.loads and rebuild?
+    else:
+        tb = traceback.format_exception(error, value=error, tb=error.__traceback__)
+        reason = format_exc(error)
+        details = json_dumps(
+            {
+                "error": type(error).__name__,
+                "error_type": format_exc_type(type(error)),
+                "message": str(error),
+                "traceback": tb,
+            },
+            default=repr,
+        )
+    return reason, details
+
+
+def process_task(
+    poller,
+    token: str,
+    task: ActivityTask,
+    middlewares: dict[str, list[str]] | None = None,
+    respond: Callable[[tuple], None] | None = None,
+) -> None:
     logger.debug("process_task()")
-    format.JUMBO_FIELDS_MEMORY_CACHE.clear()
-    worker = ActivityWorker()
+    worker = ActivityWorker(respond=respond)
     worker.process(poller, token, task, middlewares)
+    logger.debug(f"jumbo fields cache metrics: {format.jumbo_fields_cache_metrics()}")
+
+
+def respond_later(poller: ActivityPoller, token: str, task: ActivityTask, response: tuple) -> None:
+    """
+    Queue the response of a task (see `ActivityWorker`) on the completion
+    queue of the poller.
+    """
+    if response[0] == "complete":
+        poller.completion_queue.put(ActivityWorker().complete_encoded, poller, token, task, response[1])
+    else:
+        _, reason, details = response
+        poller.completion_queue.put(poller.fail_with_retry, token, task, reason=reason, details=details)
+
+
+def receive_response(reader) -> tuple | None:
+    """
+    Receive the response sent by the process of a task, if any, and close
+    the connection.
+    """
+    try:
+        return reader.recv()
+    except (EOFError, OSError):
+        return None  # died before responding
+    finally:
+        reader.close()
+
+
+class RunningTask:
+    """
+    Activity task running in a forked or pooled process, in a slot of an
+    ActivityPoller.
+    """
+
+    def __init__(self, poller: ActivityPoller, response: Response, pool: ProcessPool | None = None) -> None:
+        self.poller = poller
+        self.token = response.task_token
+        self.task = response.activity_task
+        self.pool = pool
+        self.reaped = False
+        self.response = None
+        self.reader = None
+        if pool is None:
+            writer = respond = None
+            if poller.async_completion:
+                self.reader, writer = multiprocess.Pipe(duplex=False)
+                respond = writer.send
+            self.process = multiprocess.Process(
+                target=process_task, args=(poller, self.token, self.task, poller.middlewares, respond)
+            )
+            self.process.start()
+            if writer is not None:
+                writer.close()
+            self.pool_task = None
+            self.handles = [self.process.sentinel]
+            if self.reader is not None:
+                self.handles.append(self.reader)
+        else:
+            self.pool_task = pool.submit(make_task_payload(response))
+            self.process = self.pool_task.process.process
+            self.handles = [self.pool_task.process.conn, self.process.sentinel]
+        self.pid = self.process.pid
+        self.heartbeat_at = time.monotonic() + (poller._heartbeat or 0)
+        logger.info("started activity id=%s in process pid=%s", self.task.activity_id, self.pid)
+
+    def done(self) -> bool:
+        if self.pool_task is not None:
+            if not self.pool.wait(self.pool_task, timeout=0):
+                return False
+            self.response = self.pool_task.result
+            return True
+        if self.reader is not None and self.reader.poll():
+            # read the response before the process exits: it may block on a large one
+            self.response = receive_response(self.reader)
+            self.handles.remove(self.reader)
+            self.reader = None
+        self.process.join(timeout=0)
+        return not psutil.pid_exists(self.pid)
+
+    def heartbeat(self) -> None:
+        if not self.reaped and not send_heartbeat(self.poller, self.token, self.task, self.pid):
+            self.reaped = True
+        self.heartbeat_at = time.monotonic() + self.poller._heartbeat
+
+    def finish(self) -> None:
+        """
+        Queue the response of the task, if its process sent one, or fail the
+        task if its process died.
+        """
+        if self.response is not None:
+            respond_later(self.poller, self.token, self.task, self.response)
+        elif self.process.exitcode and not self.reaped:
+            self.poller.fail_with_retry(
+                self.token,
+                self.task,
+                reason=f"process {self.pid} died: exit code {self.process.exitcode}",
+            )
+
+
+def make_task_payload(response: Response) -> dict[str, Any]:
+    """
+    Turn a poll response into a picklable payload for a pooled process: the
+    response references the domain and its SWF client.
+    """
+    return {"raw_response": response.raw_response}
+
+
+def process_task_payload(poller: ActivityPoller, payload: dict[str, Any]) -> tuple | None:
+    """
+    Rebuild the activity task from a payload (see `make_task_payload`) and
+    process it. With async completion, return the response of the task for
+    the poller to send.
+    """
+    raw_response = payload["raw_response"]
+    logging_context.reset()
+    logging_context.set("workflow_id", raw_response["workflowExecution"]["workflowId"])
+    logging_context.set("task_type", "activity")
+    logging_context.set("event_id", raw_response["startedEventId"])
+    logging_context.set("activity_id", raw_response["activityId"])
+    task = BaseActivityTask.from_poll(poller.domain, poller.task_list, raw_response)
+    if not poller.async_completion:
+        process_task(poller, task.task_token, task, poller.middlewares)
+        return None
+    responses: list[tuple] = []
+    process_task(poller, task.task_token, task, poller.middlewares, respond=responses.append)
+    return responses[0] if responses else None
 
 
 def reap_process_tree(pid: int, wait_timeout: float = settings.ACTIVITY_SIGTERM_WAIT_SEC) -> None:
@@ -237,14 +760,28 @@ def spawn(
     children.
     """
     logger.info("spawning new activity id=%s worker heartbeat=%s", task.activity_id, heartbeat)
-    worker = multiprocess.Process(target=process_task, args=(poller, token, task, middlewares))
+    reader = writer = respond = None
+    if poller.async_completion:
+        reader, writer = multiprocess.Pipe(duplex=False)
+        respond = writer.send
+    worker = multiprocess.Process(target=process_task, args=(poller, token, task, middlewares, respond))
     worker.start()
+    if writer is not None:
+        writer.close()
 
     def worker_alive():
         return psutil.pid_exists(worker.pid)
 
+    response = None
     while worker_alive():
-        worker.join(timeout=heartbeat)
+        if reader is not None:
+            # read the response before joining: the process may block on a large one
+            if reader.poll(heartbeat):
+                response = receive_response(reader)
+                reader = None
+                continue
+        else:
+            worker.join(timeout=heartbeat)
         if not worker_alive():
             # Most certainly unneeded: we'll see
             if worker.exitcode is None:
@@ -252,39 +789,82 @@ def spawn(
                 worker.join(timeout=0)
                 if worker.exitcode is None:
                     logger.warning(f"process {worker.pid} is dead but multiprocess doesn't know it (simpleflow bug)")
-            if worker.exitcode != 0:
+            if response is not None:
+                respond_later(poller, token, task, response)
+            elif worker.exitcode != 0:
                 poller.fail_with_retry(
                     token,
                     task,
                     reason=f"process {worker.pid} died: exit code {worker.exitcode}",
                 )
             return
-        try:
-            logger.debug(f"heartbeating for pid={worker.pid} (token={token})")
-            response = poller.heartbeat(token)
-        except simpleflow.swf.mapper.exceptions.DoesNotExistError as error:
-            # Either the task or the workflow execution no longer exists,
-            # let's kill the worker process.
-            logger.warning(f"heartbeat failed: {error}")
-            logger.warning(f"killing (KILL) worker with pid={worker.pid}")
-            reap_process_tree(worker.pid)
+        if not send_heartbeat(poller, token, task, worker.pid):
             return
-        except simpleflow.swf.mapper.exceptions.RateLimitExceededError as error:
-            # ignore rate limit errors: high chances the next heartbeat will be
-            # ok anyway, so it would be stupid to break the task for that
-            logger.warning(
-                f'got a "ThrottlingException / Rate exceeded" when heartbeating for task {task.activity_type.name}:'
-                f" {error}"
-            )
-            continue
-        except Exception as error:
-            # Let's crash if it cannot notify the heartbeat failed.  The
-            # subprocess will become orphan and the heartbeat timeout may
-            # eventually trigger on Amazon SWF side.
-            logger.error(f"cannot send heartbeat for task {task.activity_type.name}: {error}")
-            raise
 
-        # Task cancelled.
-        if response and response.get("cancelRequested"):
-            reap_process_tree(worker.pid)
+
+def send_heartbeat(poller: ActivityPoller, token: str, task: ActivityTask, pid: int) -> bool:
+    """
+    Heartbeat for the task run by process *pid*. Reap the process tree and
+    return False if the task should not run anymore.
+    """
+    logger.debug(f"heartbeating for pid={pid} (token={token})")
+    if heartbeat_task(poller, token, task):
+        return True
+    logger.warning(f"killing (KILL) worker with pid={pid}")
+    reap_process_tree(pid)
+    return False
+
+
+def heartbeat_task(poller: ActivityPoller, token: str, task: ActivityTask) -> bool:
+    """
+    Heartbeat for a task, and return whether it should go on running.
+    """
+    try:
+        response = poller.heartbeat(token)
+    except simpleflow.swf.mapper.exceptions.DoesNotExistError as error:
+        # Either the task or the workflow execution no longer exists,
+        # let's stop the task.
+        logger.warning(f"heartbeat failed: {error}")
+        return False
+    except simpleflow.swf.mapper.exceptions.RateLimitExceededError as error:
+        # ignore rate limit errors: high chances the next heartbeat will be
+        # ok anyway, so it would be stupid to break the task for that
+        logger.warning(
+            f'got a "ThrottlingException / Rate exceeded" when heartbeating for task {task.activity_type.name}: {error}'
+        )
+        return True
+    except Exception as error:
+        # Let's crash if it cannot notify the heartbeat failed.  The
+        # subprocess will become orphan and the heartbeat timeout may
+        # eventually trigger on Amazon SWF side.
+        logger.error(f"cannot send heartbeat for task {task.activity_type.name}: {error}")
+        raise
+
+    # Task cancelled.
+    return not (response and response.get("cancelRequested"))
+
+
+def run_in_pool(poller: ActivityPoller, pool: ProcessPool, response: Response, heartbeat: int | None = 60) -> None:
+    """
+    Send a task to a pooled process and wait for it to be done, sending
+    heartbeats to SWF.
+
+    As with `spawn`, on activity timeouts and termination, we reap the
+    process and its children; the pool then replaces it.
+    """
+    token = response.task_token
+    task = response.activity_task
+    pool_task = pool.submit(make_task_payload(response))
+    logger.info("sent activity id=%s to pooled process pid=%s heartbeat=%s", task.activity_id, pool_task.pid, heartbeat)
+    while not pool.wait(pool_task, timeout=heartbeat):
+        if not send_heartbeat(poller, token, task, pool_task.pid):
+            pool.wait(pool_task)
             return
+    if pool_task.result is not None:
+        respond_later(poller, token, task, pool_task.result)
+    elif pool_task.exitcode:
+        poller.fail_with_retry(
+            token,
+            task,
+            reason=f"process {pool_task.pid} died: exit code {pool_task.exitcode}",
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import simpleflow.swf.mapper.models
+from simpleflow.process import Autoscaler, preload_modules
 
 from .base import ActivityPoller, Worker
 
@@ -11,6 +12,11 @@ def make_worker_poller(
     middlewares: dict[str, list[str]] | None,
     heartbeat: int,
     poll_data: str,
+    reuse_processes: bool = False,
+    max_tasks_per_child: int | None = None,
+    nb_slots: int = 1,
+    nb_coroutines: int | None = None,
+    executor: str = "process",
 ) -> ActivityPoller:
     """
     Make a worker poller for the domain and task list.
@@ -22,6 +28,11 @@ def make_worker_poller(
         middlewares=middlewares,
         heartbeat=heartbeat,
         poll_data=poll_data,
+        reuse_processes=reuse_processes,
+        max_tasks_per_child=max_tasks_per_child,
+        nb_slots=nb_slots,
+        nb_coroutines=nb_coroutines,
+        executor=executor,
     )
 
 
@@ -33,6 +44,14 @@ def start(
     heartbeat: int = 60,
     one_task: bool = False,
     poll_data: str | None = None,
+    reuse_processes: bool = False,
+    max_tasks_per_child: int | None = None,
+    nb_slots: int = 1,
+    nb_coroutines: int | None = None,
+    executor: str = "process",
+    preload: list[str] | None = None,
+    min_processes: int | None = None,
+    max_processes: int | None = None,
 ):
     """
     Start a worker for the given domain and task_list.
@@ -41,13 +60,27 @@ def start(
     heartbeat: heartbeat frequency in seconds
     one_task: Process only one task then shutdown
     poll_data: Base64 encoded poll data from SWF, in case you don't want to poll directly.
+    reuse_processes: Run the tasks in long-lived processes instead of forking one per task
+    max_tasks_per_child: Number of tasks before a reused process is replaced
+    nb_slots: Number of tasks run concurrently by each process
+    nb_coroutines: Number of async activities run concurrently on an event loop by each process
+    executor: Run the tasks in processes ("process") or in threads of each process ("thread")
+    preload: Modules imported before forking the processes, see SIMPLEFLOW_PRELOAD_MODULES
+    min_processes: Minimum number of processes when autoscaling. Default: 1
+    max_processes: Scale the number of processes up to this, from the backlog of the task list
     """
+    preload_modules(preload)
     poller = make_worker_poller(
         domain=domain,
         task_list=task_list,
         middlewares=middlewares,
         heartbeat=heartbeat,
         poll_data=poll_data,
+        reuse_processes=reuse_processes,
+        max_tasks_per_child=max_tasks_per_child,
+        nb_slots=nb_slots,
+        nb_coroutines=nb_coroutines,
+        executor=executor,
     )
 
     if poll_data:
@@ -57,6 +90,9 @@ def start(
     if one_task:
         poller.run_once()
     else:
-        worker = Worker(poller, nb_processes)
+        autoscaler = None
+        if max_processes:
+            autoscaler = Autoscaler(poller.count_pending, min_processes or 1, max_processes)
+        worker = Worker(poller, nb_processes, autoscaler=autoscaler)
         worker.is_alive = True
         worker.start()
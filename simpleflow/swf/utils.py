@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from typing import TYPE_CHECKING
 
 import simpleflow.swf.mapper.exceptions
@@ -64,11 +65,17 @@ class DecisionsAndContext:
     """
     Encapsulate decisions and execution context.
     The execution context contains keys with either plain values, lists or sets.
+
+    The JSON size of the decisions is maintained as they are added, each
+    decision being serialized once; add decisions with append_decision or
+    extend_decision, the latter optionally checking a size limit first.
     """
 
     def __init__(self, decisions=None, execution_context=None):
-        self.decisions: list[Decision] = decisions or []
+        self.decisions: list[Decision] = []
         self.execution_context: dict[str, Any] = execution_context
+        self._decisions_size = 0
+        self.extend_decision(decisions or [])
 
     def __repr__(self):
         return f"<{self.__class__.__name__} decisions={self.decisions}, execution_context={self.execution_context}>"
@@ -77,13 +84,33 @@ class DecisionsAndContext:
         """
         Append a decision.
         """
-        self.decisions.append(decision)
+        self.extend_decision([decision])
 
-    def extend_decision(self, decisions: list[Decision]) -> None:
+    def extend_decision(self, decisions: list[Decision], max_json_size: int | None = None) -> bool:
         """
-        Append a list of decisions.
+        Append a list of decisions, unless the length of
+        ``json.dumps(self.decisions)`` would then exceed max_json_size.
+
+        :return: whether the decisions were appended.
         """
+        sizes = [decision_size(d) for d in decisions]
+        if max_json_size is not None and self._json_size(sizes) > max_json_size:
+            return False
+        self._decisions_size += sum(sizes)
         self.decisions += decisions
+        return True
+
+    def decisions_json_size(self, decisions: list[Decision] | None = None) -> int:
+        """
+        Length of ``json.dumps(self.decisions + decisions)``, without
+        serializing the current decisions again.
+        """
+        return self._json_size([decision_size(d) for d in decisions] if decisions else [])
+
+    def _json_size(self, sizes: list[int]) -> int:
+        nb_decisions = len(self.decisions) + len(sizes)
+        separators = 2 * (nb_decisions - 1) if nb_decisions else 0  # ", "
+        return 2 + self._decisions_size + sum(sizes) + separators  # "[...]"
 
     def append_kv_to_context(self, key: str, value: Any) -> None:
         """
@@ -114,6 +141,13 @@ class DecisionsAndContext:
         self.execution_context[key].add(value)
 
 
+def decision_size(decision: Decision) -> int:
+    """
+    Length of a decision serialized like the SWF client does, with json.dumps.
+    """
+    return len(json.dumps(decision))
+
+
 def get_name_from_event(event):
     if isinstance(event.input, dict) and "__extra" in event.input:
         return event.input["__extra"]["class"]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 import time
 from copy import deepcopy
 from enum import Enum
@@ -13,7 +14,7 @@ from simpleflow.history import History
 from simpleflow.utils import import_from_module
 
 from . import futures, logger
-from .activity import Activity
+from .activity import Activity, task_context
 
 if TYPE_CHECKING:
     from typing import Any
@@ -105,7 +106,7 @@ class ActivityTask(Task):
             f"{self.__class__.__name__}(activity={self.activity}, args={self.args}, kwargs={self.kwargs}, id={self.id})"
         )
 
-    def execute(self):
+    def _prepare_execute(self):
         method = self.activity.callable
 
         if getattr(method, "add_context_in_kwargs", False):
@@ -114,25 +115,65 @@ class ActivityTask(Task):
         for func in self.pre_execute_funcs:
             func(self.context)
 
-        if hasattr(method, "execute"):
-            task = method(*self.args, **self.kwargs)
-            task.context = self.context
-
-            result = task.execute()
-
-            if hasattr(task, "post_execute"):
-                task.post_execute()
-        else:
-            # NB: the following line attaches some *state* to the callable, so it
-            # can be used directly for advanced usage. This works well because we
-            # don't do multithreading, but if we ever do, DANGER!
-            method.context = self.context
-            result = method(*self.args, **self.kwargs)
+        return method
 
+    def _run_post_execute_funcs(self, result):
         for func in self.post_execute_funcs:
             func(self.context, result=result)
 
-        return result
+    def execute(self):
+        if self.activity.is_async:
+            return asyncio.run(self.execute_async())
+
+        token = task_context.set(self.context)
+        try:
+            method = self._prepare_execute()
+
+            if hasattr(method, "execute"):
+                task = method(*self.args, **self.kwargs)
+                task.context = self.context
+
+                result = task.execute()
+
+                if hasattr(task, "post_execute"):
+                    task.post_execute()
+            else:
+                # NB: the following line attaches some *state* to the callable, so it
+                # can be used directly for advanced usage. With several tasks per
+                # process (threads, coroutines), this state is shared: Activity.context
+                # reads the per-task task_context instead.
+                method.context = self.context
+                result = method(*self.args, **self.kwargs)
+
+            self._run_post_execute_funcs(result)
+            return result
+        finally:
+            task_context.reset(token)
+
+    async def execute_async(self):
+        """
+        Execute an async activity on the running event loop.
+        """
+        token = task_context.set(self.context)
+        try:
+            method = self._prepare_execute()
+
+            if hasattr(method, "execute"):
+                task = method(*self.args, **self.kwargs)
+                task.context = self.context
+
+                result = await task.execute()
+
+                if hasattr(task, "post_execute"):
+                    task.post_execute()
+            else:
+                method.context = self.context
+                result = await method(*self.args, **self.kwargs)
+
+            self._run_post_execute_funcs(result)
+            return result
+        finally:
+            task_context.reset(token)
 
     def propagate_attribute(self, attr, val):
         """
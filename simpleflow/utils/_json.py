@@ -53,6 +53,19 @@ def _resolve_proxy(obj):
     return obj
 
 
+def _dump_kwargs(pretty, compact, kwargs):
+    if "default" not in kwargs:
+        kwargs["default"] = serialize_complex_object
+    if pretty:
+        kwargs["indent"] = 4
+        kwargs["sort_keys"] = True
+        kwargs["separators"] = (",", ": ")
+    elif compact:
+        kwargs["separators"] = (",", ":")
+        kwargs["sort_keys"] = True
+    return kwargs
+
+
 def json_dumps(obj, pretty=False, compact=True, **kwargs):
     """
     JSON dump to string.
@@ -65,16 +78,7 @@ def json_dumps(obj, pretty=False, compact=True, **kwargs):
     :return:
     :rtype: str
     """
-    if "default" not in kwargs:
-        kwargs["default"] = serialize_complex_object
-    if pretty:
-        kwargs["indent"] = 4
-        kwargs["sort_keys"] = True
-        kwargs["separators"] = (",", ": ")
-    elif compact:
-        kwargs["separators"] = (",", ":")
-        kwargs["sort_keys"] = True
-
+    kwargs = _dump_kwargs(pretty, compact, kwargs)
     try:
         return json.dumps(obj, **kwargs)
     except TypeError:
@@ -84,6 +88,34 @@ def json_dumps(obj, pretty=False, compact=True, **kwargs):
         return json.dumps(obj, **kwargs)
 
 
+def json_dump(obj, fp, pretty=False, compact=True, chunk_size=1000, **kwargs):
+    """
+    JSON dump to a text file, like json_dumps(). The items of a top-level list
+    or dict are dumped and written *chunk_size* at a time, instead of building
+    the whole string (json.dump() does it too, but without the C encoder).
+    :param obj:
+    :type obj: Any
+    :param fp:
+    :type fp: typing.TextIO
+    """
+    if pretty or not compact or not isinstance(obj, (list, tuple, dict)):
+        fp.write(json_dumps(obj, pretty=pretty, compact=compact, **kwargs))
+        return
+    if isinstance(obj, dict):
+        items = sorted(obj.items())
+        chunks = (dict(items[i : i + chunk_size]) for i in range(0, len(items), chunk_size))
+        begin, end = "{", "}"
+    else:
+        chunks = (obj[i : i + chunk_size] for i in range(0, len(obj), chunk_size))
+        begin, end = "[", "]"
+    fp.write(begin)
+    for i, chunk in enumerate(chunks):
+        if i:
+            fp.write(",")
+        fp.write(json_dumps(chunk, **kwargs)[1:-1])
+    fp.write(end)
+
+
 def json_loads_or_raw(data):
     """
     Try to get a JSON object from a string.
@@ -73,22 +73,27 @@ class Workflow(Submittable):
         else:
             raise TypeError(f"Bad type for {submittable} activity ({type(submittable)})")
 
-    def map(self, activity, iterable):
+    def map(self, activity, iterable, max_parallel=None):
         """
         Submit an activity for asynchronous execution for each value of
         *iterable*.
 
+        The tasks are built lazily: with *max_parallel*, only those up to the
+        submitted window are.
+
         :param activity: activity.
         :type  activity: Activity
         :param iterable: collections of arguments passed to the task.
         :type  iterable: collection.Iterable[Any]
+        :param max_parallel: maximum number of tasks scheduled at a given time.
+        :type  max_parallel: int | None
         :rtype: list[simpleflow.futures.Future]
 
         """
-        group = canvas.Group(*[task.ActivityTask(activity, i) for i in iterable])
+        group = canvas.StreamingGroup((task.ActivityTask(activity, i) for i in iterable), max_parallel=max_parallel)
         return self.submit(group).futures
 
-    def starmap(self, activity, iterable):
+    def starmap(self, activity, iterable, max_parallel=None):
         """
         Submit an activity for asynchronous execution for each value of
         *iterable*.
@@ -99,10 +104,12 @@ class Workflow(Submittable):
                          as positional arguments. They are destructured using
                          the ``*`` operator.
         :type  iterable: collection.Iterable[Any]
+        :param max_parallel: maximum number of tasks scheduled at a given time.
+        :type  max_parallel: int | None
         :rtype: list[simpleflow.futures.Future]
 
         """
-        group = canvas.Group(*[task.ActivityTask(activity, *i) for i in iterable])
+        group = canvas.StreamingGroup((task.ActivityTask(activity, *i) for i in iterable), max_parallel=max_parallel)
         return self.submit(group).futures
 
     def fail(self, reason, details=None):
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import time
+
 from simpleflow import activity
 
 from .constants import DEFAULT_VERSION
@@ -34,6 +37,12 @@ def increment_retry(x):
     return x + 1
 
 
+@activity.with_attributes(version=DEFAULT_VERSION)
+def generate_range(n):
+    # JSON-serializable, but not picklable
+    return (i for i in range(n))
+
+
 @activity.with_attributes(version=DEFAULT_VERSION)
 def print_message(msg):
     print(f"MESSAGE: {msg}")
@@ -52,3 +61,15 @@ def raise_error():
 @activity.with_attributes(version=DEFAULT_VERSION)
 def non_pythonic(*args, **kwargs):
     pass
+
+
+@activity.with_attributes(version=DEFAULT_VERSION)
+async def async_sleep(seconds):
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+@activity.with_attributes(version=DEFAULT_VERSION)
+def sleep_and_get_activity_id(seconds):
+    time.sleep(seconds)
+    return sleep_and_get_activity_id.context["activity_id"]
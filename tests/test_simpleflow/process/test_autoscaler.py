@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import signal
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import multiprocess
+import psutil
+
+from simpleflow.process import Autoscaler, Supervisor
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAutoscaler(unittest.TestCase):
+    def setUp(self):
+        self.backlog = 0
+        self.clock = Clock()
+        patcher = patch("simpleflow.process._autoscaler.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build(self, **kwargs):
+        options = dict(scale_up_cooldown=60, scale_down_cooldown=300, max_load=0)
+        options.update(kwargs)
+        return Autoscaler(lambda: self.backlog, 1, 8, **options)
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            Autoscaler(lambda: 0, 4, 2)
+        with self.assertRaises(ValueError):
+            Autoscaler(lambda: 0, 0, 0)
+
+    def test_scale_up_with_cooldown(self):
+        autoscaler = self.build()
+        self.backlog = 3
+        self.assertEqual(5, autoscaler.scale(2))
+        self.clock.now += 30
+        self.assertEqual(5, autoscaler.scale(5))  # cooling down
+        self.clock.now += 30
+        self.assertEqual(8, autoscaler.scale(5))  # bounded
+
+    def test_scale_down_after_idle_cooldown(self):
+        autoscaler = self.build()
+        self.assertEqual(4, autoscaler.scale(4))
+        self.clock.now += 299
+        self.assertEqual(4, autoscaler.scale(4))
+        self.clock.now += 1
+        self.assertEqual(3, autoscaler.scale(4))
+        self.clock.now += 100
+        self.assertEqual(3, autoscaler.scale(3))  # cooling down
+        self.clock.now += 200
+        self.assertEqual(2, autoscaler.scale(3))
+
+    def test_backlog_resets_idleness(self):
+        autoscaler = self.build(scale_up_cooldown=0)
+        autoscaler.scale(4)
+        self.clock.now += 200
+        self.backlog = 1
+        self.assertEqual(5, autoscaler.scale(4))
+        self.backlog = 0
+        self.clock.now += 200
+        self.assertEqual(5, autoscaler.scale(5))
+
+    def test_no_scale_up_on_a_loaded_host(self):
+        autoscaler = self.build(max_load=2.0)
+        self.backlog = 3
+        with patch.object(autoscaler, "load", return_value=2.5):
+            self.assertEqual(2, autoscaler.scale(2))
+        with patch.object(autoscaler, "load", return_value=0.5):
+            self.assertEqual(5, autoscaler.scale(2))
+
+    def test_backlog_errors(self):
+        def backlog():
+            raise RuntimeError("throttled")
+
+        autoscaler = Autoscaler(backlog, 2, 4)
+        self.assertEqual(3, autoscaler.scale(3))
+        self.assertEqual(2, autoscaler.scale(1))  # still bounded
+
+
+def read_backlog(path):
+    with open(path) as f:
+        return int(f.read() or 0)
+
+
+def sleep_long():
+    time.sleep(60)
+
+
+class TestAutoscaledSupervisor(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def set_backlog(self, backlog):
+        with open(self.path, "w") as f:
+            f.write(str(backlog))
+
+    def wait_for_children(self, process, count, timeout=10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            children = [p for p in psutil.Process(process.pid).children() if p.status() != psutil.STATUS_ZOMBIE]
+            if len(children) == count:
+                return
+            time.sleep(0.02)
+        self.fail(f"expected {count} children, got {len(children)}")
+
+    def test_children_follow_the_backlog(self):
+        autoscaler = Autoscaler(
+            lambda: read_backlog(self.path),
+            1,
+            3,
+            interval=0.05,
+            scale_up_cooldown=0,
+            scale_down_cooldown=0,
+            max_load=0,
+        )
+        supervisor = Supervisor(sleep_long, autoscaler=autoscaler)
+        self.assertEqual(1, supervisor._nb_children)
+        process = multiprocess.Process(target=supervisor.target)
+        process.start()
+
+        def stop():
+            os.kill(process.pid, signal.SIGTERM)
+            process.join(10)
+
+        self.addCleanup(stop)
+
+        self.wait_for_children(process, 1)
+        self.set_backlog(5)
+        self.wait_for_children(process, 3)
+        self.set_backlog(0)
+        self.wait_for_children(process, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+
+from simpleflow.process import ProcessPool
+
+
+def record_pid(payload):
+    path, value = payload
+    with open(path, "a") as f:
+        f.write(f"{os.getpid()} {value}\n")
+    if value == "die":
+        os._exit(1)
+    if value == "raise":
+        raise ValueError("boom")
+    if value == "sleep":
+        time.sleep(0.5)
+    return value.upper()
+
+
+INITIALIZED_PIDS = []
+
+
+def initialize():
+    INITIALIZED_PIDS.append(os.getpid())
+
+
+def get_initialized_pids(payload):
+    return INITIALIZED_PIDS
+
+
+class TestProcessPool(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def run_tasks(self, pool, values):
+        for value in values:
+            pool.submit((self.path, value))
+        pool.join()
+        with open(self.path) as f:
+            lines = [line.split() for line in f]
+        return [(int(pid), value) for pid, value in lines]
+
+    def test_processes_are_reused(self):
+        pool = ProcessPool(record_pid, 1)
+        pool.start()
+        child_pid = pool.processes[0].pid
+        results = self.run_tasks(pool, ["a", "b", "c"])
+        self.assertEqual([(child_pid, "a"), (child_pid, "b"), (child_pid, "c")], results)
+        self.assertNotEqual(os.getpid(), child_pid)
+        self.assertEqual([], pool.processes)
+
+    def test_processes_are_replaced_after_max_tasks(self):
+        pool = ProcessPool(record_pid, 1, max_tasks_per_child=2)
+        results = self.run_tasks(pool, ["a", "b", "c"])
+        pids = [pid for pid, _ in results]
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+
+    def test_dead_processes_are_replaced(self):
+        pool = ProcessPool(record_pid, 1)
+        results = self.run_tasks(pool, ["die", "a", "raise", "b"])
+        self.assertEqual(["die", "a", "raise", "b"], [value for _, value in results])
+        pids = [pid for pid, _ in results]
+        self.assertNotEqual(pids[0], pids[1])
+        self.assertEqual(pids[1], pids[3])
+
+    def test_several_processes(self):
+        pool = ProcessPool(record_pid, 3)
+        pool.start()
+        self.assertEqual(3, len(pool.processes))
+        results = self.run_tasks(pool, [str(i) for i in range(10)])
+        self.assertEqual({str(i) for i in range(10)}, {value for _, value in results})
+
+    def test_results(self):
+        pool = ProcessPool(record_pid, 1)
+        task = pool.submit((self.path, "a"))
+        self.assertTrue(pool.wait(task))
+        self.assertEqual("A", task.result)
+        task = pool.submit((self.path, "raise"))
+        self.assertTrue(pool.wait(task))
+        self.assertIsNone(task.result)
+        pool.join()
+
+    def test_results_of_a_reused_process(self):
+        pool = ProcessPool(record_pid, 1)
+        first = pool.submit((self.path, "a"))
+        # the first task gets acknowledged while waiting for an idle process
+        second = pool.submit((self.path, "b"))
+        self.assertIs(first.process, second.process)
+        self.assertTrue(first.done)
+        self.assertTrue(pool.wait(second))
+        self.assertEqual(("A", "B"), (first.result, second.result))
+        pool.join()
+
+    def test_payloads_of_a_key_go_to_the_same_process(self):
+        pool = ProcessPool(record_pid, 2)
+        self.addCleanup(pool.join)
+        first = pool.submit((self.path, "sleep"))
+        second = pool.submit((self.path, "b"), key="run-1")
+        self.assertIsNot(first.process, second.process)
+        self.assertTrue(pool.wait(first) and pool.wait(second))
+        # the first process is idle too, but didn't take run-1
+        third = pool.submit((self.path, "sleep"), key="run-1")
+        self.assertIs(second.process, third.process)
+        # unless it is busy
+        fourth = pool.submit((self.path, "d"), key="run-1")
+        self.assertIs(first.process, fourth.process)
+
+    def test_initializer(self):
+        pool = ProcessPool(get_initialized_pids, 1, initializer=initialize)
+        task = pool.submit("a")
+        self.assertTrue(pool.wait(task))
+        self.assertEqual([task.pid], task.result)
+        self.assertEqual([], INITIALIZED_PIDS)
+        pool.join()
+
+    def test_needs_a_process(self):
+        with self.assertRaises(ValueError):
+            ProcessPool(record_pid, 0)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import gc
+import sys
+import unittest
+from unittest.mock import patch
+
+from simpleflow.process import preload_modules
+from simpleflow.process._preload import get_preload_modules
+
+
+class TestPreload(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(gc.unfreeze)
+
+    @patch("simpleflow.settings.SIMPLEFLOW_PRELOAD_MODULES", "json, tests.data.activities,")
+    def test_modules_from_settings(self):
+        self.assertEqual(
+            ["tests.data.workflows", "json", "tests.data.activities"],
+            get_preload_modules(["tests.data.workflows", "json"]),
+        )
+
+    @patch("simpleflow.settings.SIMPLEFLOW_PRELOAD_MODULES", "")
+    def test_preload_modules(self):
+        sys.modules.pop("json.tool", None)
+        self.assertEqual(["json.tool"], preload_modules(["json.tool"]))
+        self.assertIn("json.tool", sys.modules)
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    @patch("simpleflow.settings.SIMPLEFLOW_PRELOAD_MODULES", "")
+    def test_nothing_to_preload(self):
+        self.assertEqual([], preload_modules(None))
+        self.assertEqual(0, gc.get_freeze_count())
+
+    @patch("simpleflow.settings.SIMPLEFLOW_PRELOAD_MODULES", "")
+    def test_import_errors_are_raised(self):
+        with self.assertRaises(ImportError):
+            preload_modules(["tests.data.no_such_module"])
+
+
+if __name__ == "__main__":
+    unittest.main()
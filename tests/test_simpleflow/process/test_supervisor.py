@@ -3,7 +3,9 @@ from __future__ import annotations
 import os
 import signal
 import sys
+import tempfile
 import time
+import unittest
 
 import multiprocess
 from flaky import flaky
@@ -159,3 +161,85 @@ class TestSupervisor(IntegrationTestCase):
         os.kill(p.pid, signal.SIGTERM)
         p.join()
         assert p.exitcode == -15
+
+
+def record_pid_and_sleep(path, seconds):
+    with open(path, "a") as f:
+        f.write(f"{os.getpid()}\n")
+    time.sleep(seconds)
+
+
+def record_pid_and_fork(path, seconds):
+    # the task process inherits the sentinel of its parent
+    if os.fork() == 0:
+        try:
+            record_pid_and_sleep(path + ".tasks", seconds)
+        finally:
+            os._exit(0)
+    record_pid_and_sleep(path, seconds)
+
+
+class TestSupervisorChildren(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def start_supervisor(self, seconds, payload=record_pid_and_sleep):
+        supervisor = Supervisor(payload, arguments=(self.path, seconds), nb_children=1)
+        process = multiprocess.Process(target=supervisor.target)
+        process.start()
+
+        def stop():
+            os.kill(process.pid, signal.SIGTERM)
+            process.join(10)
+
+        self.addCleanup(stop)
+
+    def wait_for_pids(self, count, timeout=5, path=None):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with open(path or self.path) as f:
+                pids = [int(line) for line in f]
+            if len(pids) >= count:
+                return pids
+            time.sleep(0.01)
+        self.fail(f"expected {count} workers, got {pids}")
+
+    def kill_tasks(self):
+        with open(self.path + ".tasks") as f:
+            for line in f:
+                try:
+                    os.kill(int(line), signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        os.remove(self.path + ".tasks")
+
+    def test_dead_children_are_replaced_immediately(self):
+        self.start_supervisor(60)
+        (pid,) = self.wait_for_pids(1)
+        time.sleep(Supervisor.respawn_delay)
+        killed_at = time.monotonic()
+        os.kill(pid, signal.SIGKILL)
+        pids = self.wait_for_pids(2)
+        self.assertLess(time.monotonic() - killed_at, 0.5)
+        self.assertNotEqual(pids[0], pids[1])
+
+    def test_dead_children_are_replaced_while_their_tasks_run(self):
+        self.addCleanup(self.kill_tasks)
+        self.start_supervisor(60, payload=record_pid_and_fork)
+        (pid,) = self.wait_for_pids(1)
+        self.wait_for_pids(1, path=self.path + ".tasks")
+        time.sleep(Supervisor.respawn_delay)
+        killed_at = time.monotonic()
+        os.kill(pid, signal.SIGKILL)
+        pids = self.wait_for_pids(2)
+        self.assertLess(time.monotonic() - killed_at, 0.5)
+        self.assertNotEqual(pids[0], pids[1])
+
+    def test_crashing_children_are_replaced_with_a_delay(self):
+        self.start_supervisor(0)
+        self.wait_for_pids(1)
+        time.sleep(1.5 * Supervisor.respawn_delay)
+        with open(self.path) as f:
+            self.assertLessEqual(len(f.readlines()), 3)
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import unittest
 from datetime import datetime
+from unittest import mock
 
 import pytz
 
 import simpleflow.swf.mapper.constants
+from simpleflow import format
 from simpleflow.swf.mapper.models.event.base import Event
+from simpleflow.swf.mapper.models.event.factory import EventFactory
+from simpleflow.swf.mapper.models.event.task import ActivityTaskEvent
 from simpleflow.swf.mapper.models.history.base import History
 
 from ..mocks.event import mock_get_workflow_execution_history
@@ -34,6 +38,65 @@ class TestEvent(unittest.TestCase):
         self.assertEqual(datetime(1970, 1, 1, 0, 0, tzinfo=pytz.UTC), ev.timestamp)
 
 
+class TestEventFactory(unittest.TestCase):
+    def test_build_events(self):
+        scheduled = EventFactory(
+            {
+                "eventId": 1,
+                "eventType": "ActivityTaskScheduled",
+                "eventTimestamp": 0,
+                "activityTaskScheduledEventAttributes": {
+                    "activityId": "activity-1",
+                    "input": '{"args": [1]}',
+                    "decisionTaskCompletedEventId": 42,
+                },
+            }
+        )
+        completed = EventFactory(
+            {
+                "eventId": 2,
+                "eventType": "ActivityTaskCompleted",
+                "eventTimestamp": 0,
+                "activityTaskCompletedEventAttributes": {"result": "2", "scheduledEventId": 1},
+            }
+        )
+        self.assertIsInstance(scheduled, ActivityTaskEvent)
+        self.assertEqual(
+            ("ActivityTask", "scheduled", "ActivityTaskScheduled"), (scheduled.type, scheduled.state, scheduled.name)
+        )
+        self.assertEqual({"args": [1]}, scheduled.input)
+        self.assertEqual(42, scheduled.decision_task_completed_event_id)
+        self.assertEqual("activity-1", scheduled.activity_id)
+        # events of the same class keep their own name
+        self.assertEqual(("completed", "ActivityTaskCompleted"), (completed.state, completed.name))
+        self.assertEqual("ActivityTaskScheduled", scheduled.name)
+        self.assertEqual(1, completed.scheduled_event_id)
+
+    def test_payloads_are_decoded_lazily(self):
+        with mock.patch("simpleflow.format.decode", wraps=format.decode) as decode:
+            event = EventFactory(
+                {
+                    "eventId": 1,
+                    "eventType": "WorkflowExecutionStarted",
+                    "eventTimestamp": 0,
+                    "workflowExecutionStartedEventAttributes": {"input": '{"args": [1]}'},
+                }
+            )
+            self.assertEqual(0, decode.call_count)
+            self.assertEqual('{"args": [1]}', event.raw_input)
+            self.assertIsNone(event.raw_control)
+            self.assertEqual({"args": [1]}, event.input)
+            self.assertIs(event.input, event.input)
+            self.assertEqual(1, decode.call_count)
+            self.assertIsNone(event.control)
+
+    def test_spec(self):
+        spec = EventFactory.get_spec("StartChildWorkflowExecutionInitiated")
+        self.assertEqual("ChildWorkflowExecution", spec.type)
+        self.assertEqual("start_initiated", spec.state)
+        self.assertEqual("startChildWorkflowExecutionInitiatedEventAttributes", spec.attributes_key)
+
+
 class TestHistory(unittest.TestCase):
     def setUp(self):
         self.event_list = mock_get_workflow_execution_history()
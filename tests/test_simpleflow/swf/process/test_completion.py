@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from simpleflow.swf.process.completion import CompletionQueue
+
+
+class TestCompletionQueue(unittest.TestCase):
+    def test_calls_and_metrics(self):
+        completion_queue = CompletionQueue(nb_threads=2)
+        done = []
+        for i in range(10):
+            completion_queue.put(done.append, i)
+        completion_queue.put(int, "not a number")
+        self.assertTrue(completion_queue.flush(timeout=5))
+        self.assertEqual(list(range(10)), sorted(done))
+        metrics = completion_queue.metrics()
+        self.assertEqual(0, metrics["depth"])
+        self.assertEqual(11, metrics["done"])
+        self.assertEqual(1, metrics["errors"])
+        self.assertGreaterEqual(metrics["latency_max"], metrics["latency_mean"])
+        completion_queue.stop()
+
+    def test_depth_and_flush_timeout(self):
+        completion_queue = CompletionQueue(nb_threads=1)
+        release = threading.Event()
+        completion_queue.put(release.wait)
+        completion_queue.put(len, [])
+        self.assertEqual(2, completion_queue.depth)
+        self.assertFalse(completion_queue.flush(timeout=0.1))
+        release.set()
+        completion_queue.stop()
+        self.assertEqual(0, completion_queue.depth)
+        self.assertEqual(2, completion_queue.metrics()["done"])
+
+    def test_stop_without_start(self):
+        CompletionQueue().stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
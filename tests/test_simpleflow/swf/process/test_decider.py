@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import functools
+import pickle
+import unittest
+from unittest.mock import MagicMock, patch
+
+import boto3
+from moto import mock_swf
+
+from simpleflow.process import ProcessPool
+from simpleflow.swf.executor import Executor
+from simpleflow.swf.mapper.models.history import builder
+from simpleflow.swf.mapper.models.workflow import WorkflowExecution, WorkflowType
+from simpleflow.swf.mapper.responses import Response
+from simpleflow.swf.process.decider.base import (
+    DeciderPoller,
+    make_decision_payload,
+    process_decision_payload,
+    spawn,
+)
+from tests.data.activities import increment
+from tests.data.constants import DOMAIN
+from tests.data.workflows import BaseTestWorkflow
+
+
+def has_own_client(poller, parent_client_id, payload):
+    client_id = id(poller.boto3_client)
+    return client_id != parent_client_id and id(poller.domain.boto3_client) == client_id
+
+
+@mock_swf
+class TestDeciderPoller(unittest.TestCase):
+    def build_poller(self, **kwargs):
+        return DeciderPoller([Executor(DOMAIN, BaseTestWorkflow)], DOMAIN, "task-list", False, **kwargs)
+
+    def build_response(self):
+        history = builder.History(BaseTestWorkflow, input={})
+        history.add_activity_task(increment, history.last_id, activity_id="increment-1", result=2)
+        workflow_type = WorkflowType(DOMAIN, BaseTestWorkflow.name, "test")
+        execution = WorkflowExecution(DOMAIN, "workflow-id", "run-id", workflow_type=workflow_type)
+        return Response(token="token", history=history, execution=execution)
+
+    def test_decision_payload_round_trip(self):
+        poller = self.build_poller()
+        response = self.build_response()
+        payload = pickle.loads(pickle.dumps(make_decision_payload(response)))
+
+        with patch("simpleflow.swf.process.decider.base.process_decision") as process_decision:
+            process_decision_payload(poller, payload)
+
+        self.assertEqual(1, process_decision.call_count)
+        rebuilt = process_decision.call_args[0][1]
+        self.assertEqual("token", rebuilt.token)
+        self.assertEqual("run-id", rebuilt.execution.run_id)
+        self.assertEqual(BaseTestWorkflow.name, rebuilt.execution.workflow_type.name)
+        self.assertEqual(
+            [(e.id, e.type, e.state) for e in response.history.events],
+            [(e.id, e.type, e.state) for e in rebuilt.history.events],
+        )
+
+    def test_pipelined_polling_setting(self):
+        self.assertFalse(self.build_poller().pipelined)
+        with patch("simpleflow.settings.SIMPLEFLOW_PIPELINED_POLLING", True):
+            self.assertTrue(self.build_poller().pipelined)
+
+    def test_fork_per_decision_by_default(self):
+        poller = self.build_poller()
+        self.assertIsNone(poller.decision_pool)
+        with patch("simpleflow.swf.process.decider.base.spawn") as spawn:
+            poller.process(self.build_response())
+        self.assertEqual(1, spawn.call_count)
+
+    def test_decisions_go_to_the_pool(self):
+        poller = self.build_poller(decision_pool_size=2, max_decisions_per_child=10)
+        with patch("simpleflow.swf.process.decider.base.ProcessPool") as pool_class:
+            poller.process(self.build_response())
+            poller.process(self.build_response())
+        self.assertEqual(1, pool_class.call_count)
+        self.assertEqual(10, pool_class.call_args[1]["max_tasks_per_child"])
+        pool = pool_class.return_value
+        self.assertEqual(2, pool.submit.call_count)
+        self.assertEqual("token", pool.submit.call_args[0][0]["token"])
+        self.assertEqual("run-id", pool.submit.call_args[1]["key"])
+
+    def test_decision_pool_is_started_before_polling(self):
+        poller = self.build_poller(decision_pool_size=2)
+        with (
+            patch("simpleflow.swf.process.decider.base.ProcessPool") as pool_class,
+            patch.object(poller, "bind_signal_handlers"),
+            patch.object(poller, "set_process_name"),
+            patch.object(poller, "main_loop", side_effect=lambda: self.assertEqual(1, pool_class.call_count)) as loop,
+        ):
+            poller.start()
+        self.assertEqual(1, loop.call_count)
+        self.assertEqual(poller.use_own_client, pool_class.call_args[1]["initializer"])
+        pool_class.return_value.join.assert_called_once_with()
+
+    def test_decision_processes_have_their_own_client(self):
+        poller = self.build_poller()
+        pool = ProcessPool(
+            functools.partial(has_own_client, poller, id(poller.boto3_client)), 1, initializer=poller.use_own_client
+        )
+        task = pool.submit("payload")
+        self.assertTrue(pool.wait(task))
+        pool.join()
+        self.assertTrue(task.result)
+
+    def test_async_completion(self):
+        poller = self.build_poller()
+        poller.async_completion = True
+        poller.decide = MagicMock(return_value=["decision"])
+        poller.complete_with_retry = MagicMock()
+        spawn(poller, self.build_response())
+        poller.stop_completion_queue()
+        # decided in the forked process, completed by the poller
+        self.assertEqual(0, poller.decide.call_count)
+        poller.complete_with_retry.assert_called_once_with("token", ["decision"])
+
+    def test_count_pending(self):
+        # the client of DOMAIN may predate the mock
+        swf = boto3.client("swf", region_name="us-east-1")
+        swf.register_domain(name=DOMAIN.name, workflowExecutionRetentionPeriodInDays="1")
+        poller = self.build_poller()
+        self.assertEqual(0, poller.count_pending())
+        self.assertIsNot(poller.boto3_client, poller.count_connection.boto3_client)
+        swf.register_workflow_type(domain=DOMAIN.name, name=BaseTestWorkflow.name, version="test")
+        swf.start_workflow_execution(
+            domain=DOMAIN.name,
+            workflowId="workflow-id",
+            workflowType={"name": BaseTestWorkflow.name, "version": "test"},
+            taskList={"name": "task-list"},
+            executionStartToCloseTimeout="60",
+            taskStartToCloseTimeout="10",
+            childPolicy="TERMINATE",
+        )
+        self.assertEqual(1, poller.count_pending())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,11 +3,13 @@ from __future__ import annotations
 import os
 import signal
 import time
+import unittest
 
 import multiprocess
 from psutil import Process
 from pytest import mark
 
+from simpleflow.swf.mapper.exceptions import PollTimeout
 from simpleflow.swf.mapper.models.domain import Domain
 from simpleflow.swf.process.poller import Poller
 from tests.utils import IntegrationTestCase
@@ -50,3 +52,77 @@ class TestSupervisor(IntegrationTestCase):
         # in "zombie" mode yet (which would be the case if SIGTERM had its
         # default effect)
         assert "sleeping" in Process(process.pid).status()
+
+
+class ListPoller(Poller):
+    """
+    This poller returns tasks from a list, then stops.
+    """
+
+    def __init__(self, domain, task_list, tasks):
+        super().__init__(domain, task_list)
+        self.pipelined = True
+        self.tasks = list(tasks)
+        self.processed = []
+        self.nb_polls = 0
+        self.poll_clients = []
+
+    @property
+    def name(self):
+        return "ListPoller()"
+
+    def bind_signal_handlers(self):
+        pass
+
+    def poll_with_retry(self):
+        self.nb_polls += 1
+        self.poll_clients.append(self.boto3_client)
+        if not self.tasks:
+            self.stop_gracefully()
+            raise PollTimeout("no more tasks")
+        task = self.tasks.pop(0)
+        if isinstance(task, Exception):
+            raise task
+        return task
+
+    def process(self, response):
+        self.processed.append(response)
+
+
+class TestPipelinedPolling(unittest.TestCase):
+    def test_pipelined_polling(self):
+        poller = ListPoller(Domain("test-domain"), "test-task-list", ["a", "b", "c"])
+        poller.start()
+        self.assertEqual(["a", "b", "c"], poller.processed)
+        self.assertFalse(poller.is_alive)
+
+    def test_polling_thread_has_its_own_client(self):
+        poller = ListPoller(Domain("test-domain"), "test-task-list", ["a", "b"])
+        client = poller.boto3_client
+        poller.start()
+        self.assertIs(client, poller.boto3_client)
+        self.assertEqual(1, len({id(c) for c in poller.poll_clients}))
+        self.assertIsNot(client, poller.poll_clients[0])
+
+    def test_pipelined_polling_error(self):
+        poller = ListPoller(Domain("test-domain"), "test-task-list", ["a", ValueError("boom")])
+        with self.assertRaises(ValueError):
+            poller.start()
+        self.assertEqual(["a"], poller.processed)
+
+    def test_tasks_polled_before_stopping_are_processed(self):
+        poller = ListPoller(Domain("test-domain"), "test-task-list", ["a", "b", "c"])
+
+        def process_and_stop(response):
+            poller.processed.append(response)
+            if response == "a":
+                # wait for "b" to be polled while processing "a", then stop
+                deadline = time.time() + 5
+                while poller.nb_polls < 2 and time.time() < deadline:
+                    time.sleep(0.01)
+                poller.stop_gracefully()
+
+        poller.process = process_and_stop
+        poller.start()
+        self.assertEqual(["a", "b"], poller.processed)
+        self.assertEqual(["c"], poller.tasks)
@@ -1,17 +1,54 @@
 from __future__ import annotations
 
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
 from collections import namedtuple
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from moto import mock_swf
 
+from simpleflow.format import JumboTooLargeError
+from simpleflow.process import ProcessPool
+from simpleflow.swf.mapper.exceptions import PollTimeout
 from simpleflow.swf.mapper.models.activity import ActivityTask
 from simpleflow.swf.mapper.models.domain import Domain
-from simpleflow.swf.process.worker.base import ActivityPoller, ActivityWorker
+from simpleflow.swf.mapper.responses import Response
+from simpleflow.swf.process.worker.base import ActivityPoller, ActivityWorker, process_task_payload, run_in_pool
 
 FakeActivityType = namedtuple("FakeActivityType", ["name"])
 
+RAW_RESPONSE = {
+    "taskToken": "token",
+    "activityId": "activity-1",
+    "startedEventId": 5,
+    "activityType": {"name": "tests.data.activities.increment", "version": "test"},
+    "workflowExecution": {"workflowId": "workflow-id", "runId": "run-id"},
+    "input": '{"args": [1]}',
+}
+
+
+def run_payload(payload):
+    """
+    Pool target: behave as asked by the activity ID of the task.
+    """
+    activity_id = payload["raw_response"]["activityId"]
+    if activity_id == "crash":
+        os._exit(3)
+    elif activity_id == "long":
+        time.sleep(60)
+
+
+def has_own_client(poller, parent_client_id):
+    """
+    Pool target: whether the process uses another client than its parent.
+    """
+    client_id = id(poller.boto3_client)
+    return client_id != parent_client_id and id(poller.domain.boto3_client) == client_id
+
 
 @mock_swf
 class TestActivityWorker(unittest.TestCase):
@@ -33,6 +70,335 @@ class TestActivityWorker(unittest.TestCase):
         self.assertEqual(mock.call_args[0], ("token", task))
         self.assertIn("unable to import ", mock.call_args[1]["reason"])
 
+    def test_result_encoding_error_fails_the_task(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list")
+        task = ActivityTask(Domain("test-domain"), "task-list", activity_type=FakeActivityType("activity"))
+        responses = []
+        worker = ActivityWorker(respond=responses.append)
+
+        with patch("simpleflow.format.result", side_effect=JumboTooLargeError("Message too long")):
+            worker.complete(poller, "token", task, "result")
+
+        self.assertEqual(1, len(responses))
+        self.assertEqual("fail", responses[0][0])
+        self.assertIn("JumboTooLargeError", responses[0][1])
+
+
+@mock_swf
+class TestActivityPollerProcessPool(unittest.TestCase):
+    def build_response(self, activity_id="activity-1"):
+        raw_response = dict(RAW_RESPONSE, activityId=activity_id)
+        task = ActivityTask.from_poll(Domain("test-domain"), "task-list", raw_response)
+        return Response(task_token=task.task_token, activity_task=task, raw_response=raw_response)
+
+    @patch("simpleflow.settings.SIMPLEFLOW_PIPELINED_POLLING", True)
+    def test_activity_polls_are_not_pipelined(self):
+        self.assertFalse(ActivityPoller(Domain("test-domain"), "task-list").pipelined)
+
+    def test_fork_per_task_by_default(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list")
+        self.assertIsNone(poller.process_pool)
+        with patch("simpleflow.swf.process.worker.base.spawn") as spawn:
+            poller.process(self.build_response())
+        self.assertEqual(1, spawn.call_count)
+
+    def test_tasks_go_to_the_pool(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list", reuse_processes=True, max_tasks_per_child=10)
+        with (
+            patch("simpleflow.swf.process.worker.base.ProcessPool") as pool_class,
+            patch("simpleflow.swf.process.worker.base.run_in_pool") as run_in_pool_,
+        ):
+            poller.process(self.build_response())
+            poller.process(self.build_response())
+        self.assertEqual(1, pool_class.call_count)
+        self.assertEqual(10, pool_class.call_args[1]["max_tasks_per_child"])
+        self.assertEqual(poller.use_own_client, pool_class.call_args[1]["initializer"])
+        self.assertEqual(2, run_in_pool_.call_count)
+
+    def test_pool_processes_have_their_own_client(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list", reuse_processes=True)
+        parent_client_id = id(poller.boto3_client)
+        with patch("simpleflow.swf.process.worker.base.process_task_payload", has_own_client):
+            pool = poller.process_pool
+        try:
+            task = pool.submit(parent_client_id)
+            self.assertTrue(pool.wait(task))
+        finally:
+            pool.join()
+        self.assertTrue(task.result)
+
+    def test_process_task_payload(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list", middlewares={"pre": [], "post": []})
+        with patch("simpleflow.swf.process.worker.base.process_task") as process_task:
+            process_task_payload(poller, {"raw_response": RAW_RESPONSE})
+        _, token, task, middlewares = process_task.call_args[0]
+        self.assertEqual("token", token)
+        self.assertEqual("activity-1", task.activity_id)
+        self.assertEqual("tests.data.activities.increment", task.activity_type.name)
+        self.assertEqual({"pre": [], "post": []}, middlewares)
+
+    def run_in_pool(self, activity_id, heartbeat_response=None):
+        poller = MagicMock()
+        poller.heartbeat.return_value = heartbeat_response
+        pool = ProcessPool(run_payload, 1)
+        try:
+            run_in_pool(poller, pool, self.build_response(activity_id), heartbeat=0.1)
+            self.assertEqual(1, len(pool.processes))
+            self.assertFalse(pool.processes[0].busy)
+        finally:
+            pool.join()
+        return poller
+
+    def test_run_in_pool(self):
+        poller = self.run_in_pool("activity-1")
+        self.assertEqual(0, poller.fail_with_retry.call_count)
+
+    def test_run_in_pool_process_death(self):
+        poller = self.run_in_pool("crash")
+        self.assertEqual(1, poller.fail_with_retry.call_count)
+        self.assertIn("exit code 3", poller.fail_with_retry.call_args[1]["reason"])
+
+    def test_run_in_pool_cancellation(self):
+        start = time.time()
+        poller = self.run_in_pool("long", heartbeat_response={"cancelRequested": True})
+        self.assertLess(time.time() - start, 30)
+        self.assertGreaterEqual(poller.heartbeat.call_count, 1)
+        self.assertEqual(0, poller.fail_with_retry.call_count)
+
+
+def record_task(poller, token, task, middlewares, respond=None):
+    """
+    Replaces process_task: record the process and the run time of the task.
+    """
+    start = time.time()
+    if task.activity_id.startswith("crash"):
+        os._exit(3)
+    time.sleep(60 if task.activity_id.startswith("long") else 0.3)
+    with open(poller.record_path, "a") as f:
+        f.write(f"{os.getpid()} {task.activity_id} {start} {time.time()}\n")
+
+
+class ListActivityPoller(ActivityPoller):
+    """
+    This poller returns the tasks of a list, then stops. Tasks are
+    (token, activity name, args[, meta]) tuples; the token is also the
+    activity ID, and heartbeats cancel the tasks whose token starts with "long".
+    """
+
+    def __init__(self, tasks, **kwargs):
+        super().__init__(Domain("test-domain"), "task-list", heartbeat=0.1, **kwargs)
+        self.responses = [self.build_response(*task) for task in tasks]
+        self.heartbeat = MagicMock(side_effect=lambda token: {"cancelRequested": token.startswith("long")})
+        self.complete_with_retry = MagicMock()
+        self.fail_with_retry = MagicMock()
+        self.poll_clients = []
+
+    @staticmethod
+    def build_response(token, name, args, meta=None):
+        raw_response = dict(
+            RAW_RESPONSE,
+            taskToken=token,
+            activityId=token,
+            activityType={"name": f"tests.data.activities.{name}", "version": "test"},
+            input=json.dumps({"args": args, "meta": meta or {}}),
+        )
+        task = ActivityTask.from_poll(Domain("test-domain"), "task-list", raw_response)
+        return Response(task_token=task.task_token, activity_task=task, raw_response=raw_response)
+
+    def bind_signal_handlers(self):
+        pass
+
+    def poll_with_retry(self):
+        self.poll_clients.append(self.boto3_client)
+        if not self.responses:
+            self.stop_gracefully()
+            raise PollTimeout("no more tasks")
+        return self.responses.pop(0)
+
+
+@mock_swf
+class TestActivityPollerSlots(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        patcher = patch("simpleflow.swf.process.worker.base.process_task", record_task)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_poller(self, activity_ids, **kwargs):
+        poller = ListActivityPoller([(activity_id, "increment", [1]) for activity_id in activity_ids], **kwargs)
+        poller.record_path = self.path
+        poller.start()
+        with open(self.path) as f:
+            records = [line.split() for line in f]
+        return poller, [(int(pid), activity_id, float(start), float(end)) for pid, activity_id, start, end in records]
+
+    def assertMaxConcurrency(self, expected, records):
+        times = sorted([(start, 1) for _, _, start, _ in records] + [(end, -1) for _, _, _, end in records])
+        running = max_running = 0
+        for _, delta in times:
+            running += delta
+            max_running = max(max_running, running)
+        self.assertEqual(expected, max_running)
+
+    def test_needs_a_slot(self):
+        with self.assertRaises(ValueError):
+            ActivityPoller(Domain("test-domain"), "task-list", nb_slots=0)
+
+    def test_slots(self):
+        poller, records = self.run_poller(["a", "b", "c", "d", "e"], nb_slots=2)
+        self.assertEqual(["a", "b", "c", "d", "e"], sorted(activity_id for _, activity_id, _, _ in records))
+        self.assertMaxConcurrency(2, records)
+        self.assertEqual(0, poller.fail_with_retry.call_count)
+
+    def test_slots_polling_thread_has_its_own_client(self):
+        poller = ListActivityPoller([("a", "increment", [1])], nb_slots=2)
+        poller.record_path = self.path
+        client = poller.boto3_client
+        poller.start()
+        self.assertIs(client, poller.boto3_client)
+        self.assertEqual(1, len({id(c) for c in poller.poll_clients}))
+        self.assertIsNot(client, poller.poll_clients[0])
+
+    def test_slots_with_reused_processes(self):
+        poller, records = self.run_poller(["a", "b", "c", "d"], nb_slots=2, reuse_processes=True)
+        self.assertGreater(poller.heartbeat.call_count, 0)
+        self.assertEqual(4, len(records))
+        self.assertEqual(2, len({pid for pid, _, _, _ in records}))
+        self.assertMaxConcurrency(2, records)
+
+    def test_slots_heartbeat_and_failure(self):
+        start = time.time()
+        poller, records = self.run_poller(["long-1", "crash", "a"], nb_slots=3)
+        self.assertLess(time.time() - start, 30)
+        self.assertEqual(["a"], [activity_id for _, activity_id, _, _ in records])
+        self.assertEqual(1, poller.fail_with_retry.call_count)
+        self.assertIn("exit code 3", poller.fail_with_retry.call_args[1]["reason"])
+
+
+@mock_swf
+class TestActivityPollerCoroutines(unittest.TestCase):
+    def test_coroutines(self):
+        poller = ListActivityPoller([(str(i), "async_sleep", [0.5]) for i in range(10)], nb_coroutines=10)
+        start = time.time()
+        poller.start()
+        self.assertLess(time.time() - start, 3)
+        self.assertEqual(10, poller.complete_with_retry.call_count)
+        self.assertEqual(
+            [str(i) for i in range(10)], sorted(call[0][0] for call in poller.complete_with_retry.call_args_list)
+        )
+        self.assertGreater(poller.heartbeat.call_count, 0)
+        self.assertEqual(0, poller.fail_with_retry.call_count)
+
+    def test_coroutines_cancellation_and_failure(self):
+        poller = ListActivityPoller(
+            [("long", "async_sleep", [60]), ("error", "async_sleep", ["not a number"]), ("ok", "async_sleep", [0])],
+            nb_coroutines=2,
+        )
+        start = time.time()
+        poller.start()
+        self.assertLess(time.time() - start, 30)
+        self.assertEqual(["ok"], [call[0][0] for call in poller.complete_with_retry.call_args_list])
+        self.assertEqual(["error"], [call[0][0] for call in poller.fail_with_retry.call_args_list])
+
+    def test_input_is_prepared_off_the_event_loop(self):
+        poller = ListActivityPoller([("bin", "async_sleep", [0], {"binaries": {"tool": "s3://x"}})], nb_coroutines=2)
+        threads = []
+        with patch(
+            "simpleflow.swf.process.worker.base.download_binaries",
+            side_effect=lambda binaries: threads.append(threading.current_thread()),
+        ):
+            poller.start()
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.main_thread(), threads[0])
+        self.assertEqual(["bin"], [call[0][0] for call in poller.complete_with_retry.call_args_list])
+
+    def test_sync_activities_are_spawned(self):
+        poller = ListActivityPoller([("sync", "increment", [1])], nb_coroutines=2)
+        threads = []
+        with patch(
+            "simpleflow.swf.process.worker.base.spawn",
+            side_effect=lambda *args: threads.append(threading.current_thread().name),
+        ) as spawn:
+            poller.start()
+        self.assertEqual(1, spawn.call_count)
+        self.assertEqual("sync", spawn.call_args[0][1])
+        # not in the default executor, shared with polls and heartbeats
+        self.assertEqual(1, len(threads))
+        self.assertTrue(threads[0].startswith("simpleflow-spawn"))
+
+
+@mock_swf
+class TestActivityPollerThreads(unittest.TestCase):
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            ActivityPoller(Domain("test-domain"), "task-list", executor="fiber")
+
+    def test_threads(self):
+        tasks = [(str(i), "sleep_and_get_activity_id", [0.5]) for i in range(10)]
+        poller = ListActivityPoller(tasks, executor="thread", nb_slots=10)
+        start = time.time()
+        poller.start()
+        self.assertLess(time.time() - start, 3)
+        # each task gets its own context
+        self.assertEqual(
+            [(str(i), json.dumps(str(i))) for i in range(10)],
+            sorted(call[0] for call in poller.complete_with_retry.call_args_list),
+        )
+        self.assertGreater(poller.heartbeat.call_count, 0)
+        self.assertEqual(0, poller.fail_with_retry.call_count)
+
+    def test_threads_are_bounded(self):
+        tasks = [(str(i), "sleep_and_get_activity_id", [0.3]) for i in range(4)]
+        poller = ListActivityPoller(tasks, executor="thread", nb_slots=2)
+        start = time.time()
+        poller.start()
+        self.assertGreaterEqual(time.time() - start, 0.6)
+        self.assertEqual(4, poller.complete_with_retry.call_count)
+
+    def test_cancelled_threads_are_no_longer_heartbeated(self):
+        poller = ListActivityPoller([("long", "sleep_and_get_activity_id", [0.5])], executor="thread")
+        poller.start()
+        self.assertEqual(1, poller.heartbeat.call_count)
+        self.assertEqual(1, poller.complete_with_retry.call_count)
+
+
+@mock_swf
+class TestActivityPollerAsyncCompletion(unittest.TestCase):
+    """
+    With async completion, the poller sends the responses of the tasks run in
+    its child processes: the mocks of the poller see them.
+    """
+
+    def run_poller(self, **kwargs):
+        tasks = [("ok", "increment", [1]), ("error", "increment", ["one"]), ("range", "generate_range", [2])]
+        poller = ListActivityPoller(tasks, **kwargs)
+        poller.async_completion = True
+        poller.start()
+        self.assertIsNone(poller._completion_queue)  # flushed and stopped
+        # results are encoded by the task processes, once
+        self.assertEqual(
+            [("ok", "2"), ("range", "[0,1]")], sorted(call[0] for call in poller.complete_with_retry.call_args_list)
+        )
+        self.assertEqual(["error"], [call[0][0] for call in poller.fail_with_retry.call_args_list])
+        self.assertIn("TypeError", poller.fail_with_retry.call_args[1]["reason"])
+
+    def test_fork(self):
+        self.run_poller()
+
+    def test_pool(self):
+        self.run_poller(reuse_processes=True)
+
+    def test_slots(self):
+        self.run_poller(nb_slots=2)
+
+    def test_slots_with_reused_processes(self):
+        self.run_poller(nb_slots=2, reuse_processes=True)
+
+    def test_threads(self):
+        self.run_poller(executor="thread", nb_slots=2)
+
 
 if __name__ == "__main__":
     unittest.main()
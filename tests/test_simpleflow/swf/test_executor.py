@@ -169,6 +169,26 @@ class TestSimpleflowSwfExecutorWithJumboFields(MockSWFTestCase):
 
         assert re.search(r"^simpleflow\+s3://jumbo-bucket/[a-z0-9-]+ 90002$", result)
 
+    @mock.patch.dict("os.environ", {"SIMPLEFLOW_JUMBO_FIELDS_BUCKET": "jumbo-bucket"})
+    @mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS", 4)
+    def test_jumbo_fields_are_prefetched(self):
+        self.register_activity_type("tests.test_simpleflow.swf.test_executor.print_me_n_times", "default")
+        self.start_workflow_execution(input='{"args": ["012345679", 10000]}')
+        result = self.build_decisions(ExampleJumboWorkflow)
+        self.take_decisions(result.decisions, result.execution_context)
+        self.process_activity_task()
+        reference = self.get_workflow_execution_history()["events"][-2]["activityTaskCompletedEventAttributes"][
+            "result"
+        ]
+        path = reference.split()[0].split("/", 3)[-1]
+        format.JUMBO_FIELDS_MEMORY_CACHE.pop(path)
+
+        with mock.patch.object(format, "prefetch_jumbo_fields", wraps=format.prefetch_jumbo_fields) as prefetch:
+            result = self.build_decisions(ExampleJumboWorkflow)
+        prefetch.assert_called_once_with([reference], max_workers=4, max_bytes=64 * 1024**2)
+        assert path in format.JUMBO_FIELDS_MEMORY_CACHE
+        assert result.decisions[0]["decisionType"] == "CompleteWorkflowExecution"
+
     @mock.patch.dict("os.environ", {"SIMPLEFLOW_JUMBO_FIELDS_BUCKET": "jumbo-bucket"})
     def test_jumbo_fields_in_task_failed_is_decoded(self):
         # prepare execution
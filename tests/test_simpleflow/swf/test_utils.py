@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+import unittest
+from unittest import mock
+
+from simpleflow.swf import utils
+from simpleflow.swf.mapper.models.decision import MarkerDecision, TimerDecision
+from simpleflow.swf.utils import DecisionsAndContext
+
+
+class TestDecisionsAndContext(unittest.TestCase):
+    def test_decisions_json_size(self):
+        timer = TimerDecision("start", id="timer", start_to_fire_timeout="0")
+        marker = MarkerDecision("record", name="marker", details='{"é": "\\u00e9"}')
+
+        decisions_and_context = DecisionsAndContext()
+        self.assertEqual(len(json.dumps([])), decisions_and_context.decisions_json_size())
+        self.assertEqual(len(json.dumps([timer])), decisions_and_context.decisions_json_size([timer]))
+
+        decisions_and_context.append_decision(timer)
+        decisions_and_context.extend_decision([marker, timer])
+        self.assertEqual(len(json.dumps([timer, marker, timer])), decisions_and_context.decisions_json_size())
+        self.assertEqual(
+            len(json.dumps([timer, marker, timer, marker])),
+            decisions_and_context.decisions_json_size([marker]),
+        )
+        self.assertEqual(
+            len(json.dumps([marker, timer])),
+            DecisionsAndContext([marker, timer]).decisions_json_size(),
+        )
+
+    def test_extend_decision_with_max_json_size(self):
+        timer = TimerDecision("start", id="timer", start_to_fire_timeout="0")
+        marker = MarkerDecision("record", name="marker", details="x" * 100)
+        decisions_and_context = DecisionsAndContext([timer])
+        max_json_size = len(json.dumps([timer, marker]))
+
+        with mock.patch.object(utils, "decision_size", wraps=utils.decision_size) as decision_size:
+            self.assertTrue(decisions_and_context.extend_decision([marker], max_json_size=max_json_size))
+            self.assertFalse(decisions_and_context.extend_decision([timer], max_json_size=max_json_size))
+        self.assertEqual(2, decision_size.call_count)  # each decision serialized once
+        self.assertEqual([timer, marker], decisions_and_context.decisions)
+        self.assertEqual(max_json_size, decisions_and_context.decisions_json_size())
@@ -5,7 +5,7 @@ import unittest
 
 from simpleflow import Workflow, exceptions, futures, workflow
 from simpleflow.activity import with_attributes
-from simpleflow.canvas import Chain, FuncGroup, Group
+from simpleflow.canvas import Chain, FuncGroup, Group, StreamingGroup
 from simpleflow.constants import HOUR, MINUTE
 from simpleflow.exceptions import AggregateException, TaskFailed
 from simpleflow.local.executor import Executor
@@ -162,6 +162,32 @@ class TestGroup(unittest.TestCase):
         ).submit(executor)
         self.assertTrue(future.finished)
 
+    def test_state_counters(self):
+        future = Group(
+            (to_string, "test1"),
+            (running_task, "test2"),
+            zero_division,
+            (running_task, "test4"),
+            bubbles_exception_on_failure=True,
+        ).submit(executor)
+        self.assertEqual(future.nb_finished, 2)
+        self.assertEqual(future.nb_running, 2)
+        self.assertEqual(future.nb_failed, 1)
+        self.assertEqual(future.nb_pending, 0)
+        self.assertEqual(future.nb_cancelled, 0)
+        self.assertTrue(future.running)
+        self.assertIsInstance(future._exception, AggregateException)
+        self.assertIsNone(future._exception.exceptions[0])
+        self.assertIsInstance(future._exception.exceptions[2], TaskFailed)
+
+    def test_max_parallel_with_many_finished_activities(self):
+        activities = [(to_string, i) for i in range(500)] + [(running_task, i) for i in range(10)]
+        future = Group(*activities, max_parallel=5).submit(executor)
+        self.assertTrue(future.running)
+        self.assertEqual(len(future.futures), 505)
+        self.assertEqual(future.count_finished_activities, 500)
+        self.assertEqual(future._count_pending_or_running, 5)
+
     def test_propagate_attribute(self):
         """
         Test that attribute 'raises_on_failure' is well propagated through Group.
@@ -178,6 +204,52 @@ class TestGroup(unittest.TestCase):
         self.assertFalse(inner_a.activities[1].activity.raises_on_failure)
 
 
+class TestStreamingGroup(unittest.TestCase):
+    def test_generator(self):
+        built = []
+
+        def activities():
+            for i in range(1000):
+                built.append(i)
+                yield (running_task, i)
+
+        future = StreamingGroup(activities(), max_parallel=3).submit(executor)
+        self.assertTrue(future.running)
+        self.assertEqual(len(future.futures), 3)
+        self.assertEqual(built, [0, 1, 2])
+
+    def test_callable(self):
+        built = []
+
+        def get_activity(i):
+            built.append(i)
+            return ActivityTask(to_string if i < 5 else running_task, i)
+
+        future = StreamingGroup(get_activity, size=1000, max_parallel=2).submit(executor)
+        self.assertTrue(future.running)
+        self.assertEqual(built, list(range(7)))
+        self.assertEqual(future._result, ["0", "1", "2", "3", "4", None, None])
+
+        future = StreamingGroup(lambda i: (to_string, i), size=3).submit(executor)
+        self.assertTrue(future.finished)
+        self.assertEqual(future.result, ["0", "1", "2"])
+
+    def test_callable_needs_a_size(self):
+        with self.assertRaises(ValueError):
+            StreamingGroup(lambda i: (to_string, i))
+
+    def test_propagate_attribute(self):
+        activities = [ActivityTask(running_task, i) for i in range(2)]
+        group = StreamingGroup(iter(activities))
+        Group(group, raises_on_failure=False).submit(executor)
+        self.assertFalse(activities[0].activity.raises_on_failure)
+        self.assertFalse(activities[1].activity.raises_on_failure)
+
+    def test_workflow_map(self):
+        self.assertEqual(["0", "1", "2"], [f.result for f in executor._workflow.map(to_string, range(3))])
+        self.assertEqual(2, len(executor._workflow.map(running_task, range(10), max_parallel=2)))
+
+
 class TestChain(unittest.TestCase):
     def test(self):
         future = Chain((to_string, "test"), (to_string, "test")).submit(executor)
@@ -323,3 +323,119 @@ def test_large_command_line_utf8():
     """
     x = "ä" * 1024 * 1024
     assert length(x.encode("utf-8")) == len(x)
+
+
+def repeat(x, n):
+    return [x] * n
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_large_result(persistent, python_servers):
+    result = execute.python(persistent=persistent)(repeat)({"ä": 1.5}, 100_000)
+    assert result == [{"ä": 1.5}] * 100_000
+
+
+def test_read_text():
+    with execute.anonymous_file() as f:
+        assert execute.read_text(f.fileno()) == ""
+        f.write("ʘ‿ʘ".encode() + b"\xff")
+        f.flush()
+        assert execute.read_text(f.fileno()) == "ʘ‿ʘ\ufffd"
+
+
+def test_read_text_from_pipe():
+    content = "ʘ‿ʘ" * 100_000  # more than the pipe buffer
+    r, w = os.pipe()
+    writer = threading.Thread(target=lambda: (os.write(w, content.encode()), os.close(w)))
+    writer.start()
+    try:
+        assert execute.read_text(r) == content
+    finally:
+        writer.join()
+        os.close(r)
+
+
+def get_pid():
+    return os.getpid()
+
+
+def exit_with(code):
+    sys.exit(code)
+
+
+@pytest.fixture
+def python_servers():
+    yield execute.python_servers
+    execute.python_servers.close()
+
+
+def test_persistent_server_is_reused(python_servers):
+    func = execute.python(persistent=True)(get_pid)
+    pid = func()
+    assert pid != os.getpid()
+    assert func() == pid
+    assert execute.python(persistent=True, env=dict(os.environ))(get_pid)() != pid
+
+
+def test_persistent_results_and_errors(python_servers):
+    func = execute.python(persistent=True)
+    assert func(inc.__wrapped__)([1, 2, 3]) == [2, 3, 4]
+    assert func(Add.__wrapped__)(3, 7) == 10
+    assert func(print_string.__wrapped__)("This isn't part of the return value", "a\nb") == "a\nb"
+    assert func(print_string.__wrapped__)("", None) is None
+    x = "ä" * 1024 * 1024
+    assert func(length.__wrapped__)(x) == len(x)
+    with pytest.raises(ExecutionError) as excinfo:
+        func(raise_dummy_exception_with_unicode.__wrapped__)()
+    error = json.loads(excinfo.value.args[0])
+    assert error["error"] == "DummyException"
+    assert error["message"] == "ʘ‿ʘ"
+    assert len(python_servers._idle[python_servers.make_key("python", None)]) == 1
+
+
+def test_persistent_server_exit(python_servers):
+    func = execute.python(persistent=True)(exit_with)
+    assert func(0) is None
+    with pytest.raises(ExecutionError):
+        func(1)
+    assert not python_servers._idle.get(python_servers.make_key("python", None))
+
+
+def test_persistent_timeout(python_servers):
+    # The server is started without timeout, as it is slow on a loaded machine.
+    pid = execute.python(persistent=True)(get_pid)()
+    func = execute.python(persistent=True, timeout=1)(sleep_and_return)
+    assert func(0.1) == 0.1
+
+    t = time.time()
+    with pytest.raises(ExecutionTimeoutError) as e:
+        func(10)
+    assert (time.time() - t) < 5.0
+    assert "ExecutionTimeoutError after 1 seconds" in str(e.value)
+    assert not psutil.pid_exists(pid)
+    assert execute.python(persistent=True)(get_pid)() != pid
+    assert func(0.1) == 0.1
+
+
+def test_persistent_kill_children(python_servers):
+    pid = execute.python(persistent=True, kill_children=True)(create_sleeper_subprocess)()
+    with pytest.raises(psutil.NoSuchProcess):
+        psutil.Process(pid)
+
+
+def test_persistent_servers_are_not_shared_after_fork(python_servers):
+    func = execute.python(persistent=True)(get_pid)
+    pid = func()
+    read_fd, write_fd = os.pipe()
+    child = os.fork()
+    if not child:  # pragma: no cover
+        try:
+            os.write(write_fd, str(func()).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    os.waitpid(child, 0)
+    with os.fdopen(read_fd) as f:
+        child_server_pid = int(f.read())
+    assert child_server_pid != pid
+    assert func() == pid
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import gzip
 import json
 import os
 import random
 import unittest
+from datetime import datetime, timedelta, timezone
 from typing import Any, cast
+from unittest import mock
 
 import boto3
 from moto import mock_s3
@@ -135,3 +138,123 @@ class TestFormat(unittest.TestCase):
 
         for case in cases:
             self.assertEqual(case[1], format.decode(case[0], parse_json=False))
+
+    @mock_s3
+    def test_prefetch_jumbo_fields(self):
+        self.setup_jumbo_fields("jumbo-bucket")
+        for key in "abc":
+            push_content("jumbo-bucket", key, key * 10)
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        format.JUMBO_FIELDS_MEMORY_CACHE["c"] = "cached"
+        self.addCleanup(format.JUMBO_FIELDS_MEMORY_CACHE.clear)
+
+        references = [
+            "simpleflow+s3://jumbo-bucket/a 10",
+            "simpleflow+s3://jumbo-bucket/a 10",  # duplicate
+            "simpleflow+s3://jumbo-bucket/c 10",  # cached
+            "simpleflow+s3://jumbo-bucket/missing 10",  # error
+            "simpleflow+s3://jumbo-bucket/b 10",  # beyond max_bytes
+        ]
+        self.assertEqual(1, format.prefetch_jumbo_fields(references, max_workers=4, max_bytes=25))
+        self.assertEqual({"a": "a" * 10, "c": "cached"}, format.JUMBO_FIELDS_MEMORY_CACHE)
+
+        self.assertEqual(1, format.prefetch_jumbo_fields(references, max_workers=4))
+        self.assertEqual("b" * 10, format.JUMBO_FIELDS_MEMORY_CACHE["b"])
+        self.assertEqual(0, format.prefetch_jumbo_fields([], max_workers=4))
+
+    @mock.patch.object(format, "_prefetch_executor", None)
+    def test_prefetch_executor_is_kept(self):
+        executor = format._get_prefetch_executor(4)
+        self.assertIs(executor, format._get_prefetch_executor(4))
+        self.assertIsNot(executor, format._get_prefetch_executor(2))
+        with mock.patch("os.getpid", return_value=os.getpid() + 1):
+            self.assertIsNot(format._prefetch_executor[2], format._get_prefetch_executor(2))
+
+    @mock_s3
+    @mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION", "gzip")
+    def test_jumbo_fields_compression(self):
+        self.setup_jumbo_fields("jumbo-bucket/subdir")
+        self.addCleanup(format.JUMBO_FIELDS_MEMORY_CACHE.clear)
+
+        # compressible enough to fit in the field
+        message = {"values": ["A" * 100] * 1000}
+        encoded = format.result(message)
+        self.assertTrue(encoded.startswith("simpleflow+gzip:"))
+        self.assertLessEqual(len(encoded), constants.MAX_RESULT_LENGTH)
+        self.assertEqual(message, format.decode(encoded))
+        self.assertEqual(json.dumps(message, separators=(",", ":")), format.decode(encoded, parse_json=False))
+
+        # stored on S3, compressed
+        message = {"values": [str(random.random()) for _ in range(10_000)]}
+        encoded = format.result(message)
+        self.assertRegex(encoded, r"^simpleflow\+s3\+gzip://jumbo-bucket/subdir/[a-z0-9-]+ \d+$")
+        location, size = encoded.split()
+        self.assertEqual(len(json.dumps(message, separators=(",", ":"))), int(size))
+        key = location.replace("simpleflow+s3+gzip://jumbo-bucket/", "")
+        stored = self.client.get_object(Bucket="jumbo-bucket", Key=key)
+        self.assertEqual("application/gzip", stored["ContentType"])
+        self.assertEqual(message, json.loads(gzip.decompress(stored["Body"].read())))
+
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        self.assertEqual(message, format.decode(encoded))
+        self.assertTrue(format.is_jumbo_field(encoded))
+
+        # fields stored before the compression are still decoded
+        push_content("jumbo-bucket", "abc", '"not compressed"')
+        self.assertEqual("not compressed", format.decode("simpleflow+s3://jumbo-bucket/abc 16"))
+
+    @mock_s3
+    @mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED", True)
+    def test_jumbo_fields_content_addressed(self):
+        self.setup_jumbo_fields("jumbo-bucket/subdir")
+        self.addCleanup(format.JUMBO_FIELDS_MEMORY_CACHE.clear)
+        self.addCleanup(format.JUMBO_FIELDS_KNOWN_KEYS.clear)
+
+        message = {"values": [str(random.random()) for _ in range(10_000)]}
+        with mock.patch("simpleflow.storage.push_content", wraps=push_content) as push:
+            encoded = format.input(message)
+            self.assertEqual(encoded, format.input(message))
+            self.assertEqual(1, push.call_count)
+
+            # another process: the object exists, it's not uploaded again
+            format.JUMBO_FIELDS_KNOWN_KEYS.clear()
+            self.assertEqual(encoded, format.input(message))
+            self.assertEqual(1, push.call_count)
+
+            other = format.input({"values": message["values"][1:]})
+            self.assertNotEqual(encoded, other)
+            self.assertEqual(2, push.call_count)
+
+            # an old object is uploaded again
+            format.JUMBO_FIELDS_KNOWN_KEYS.clear()
+            old = datetime.now(timezone.utc) - timedelta(days=2)
+            with mock.patch("simpleflow.storage.last_modified", return_value=old):
+                self.assertEqual(encoded, format.input(message))
+            self.assertEqual(3, push.call_count)
+            self.assertEqual(encoded, format.input(message))
+            self.assertEqual(3, push.call_count)
+
+        self.assertRegex(encoded, r"^simpleflow\+s3://jumbo-bucket/subdir/[0-9a-f]{32} \d+$")
+        self.assertEqual(2, self.client.list_objects_v2(Bucket="jumbo-bucket")["KeyCount"])
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        self.assertEqual(message, format.decode(encoded))
+
+        # compressed objects are named after the compressed content
+        with mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION", "gzip"):
+            compressed = format.input(message)
+        self.assertTrue(compressed.startswith("simpleflow+s3+gzip://"))
+        self.assertNotEqual(encoded.split("/")[-1], compressed.split("/")[-1])
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        self.assertEqual(message, format.decode(compressed))
+
+    @mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION", "gzip")
+    def test_inline_compression_without_jumbo_fields(self):
+        message = "A" * 64000
+        encoded = format.result(message)
+        self.assertTrue(encoded.startswith("simpleflow+gzip:"))
+        self.assertEqual(message, format.decode(encoded))
+        with self.assertRaisesRegex(JumboTooLargeError, "Message too long"):
+            format.result(os.urandom(48000).hex())
+        # only where jumbo fields are allowed
+        with self.assertRaisesRegex(JumboTooLargeError, "Message too long"):
+            format.encode(message, 1000, allow_jumbo_fields=False)
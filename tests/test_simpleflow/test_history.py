@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pickle
+import unittest
+from unittest import mock
+
+from simpleflow.history import History
+from simpleflow.swf.mapper.models.history import builder
+from simpleflow.utils import json_dumps, json_loads_or_raw
+from tests.data.activities import increment
+from tests.data.workflows import BaseTestWorkflow
+
+
+class TestHistoryIndexes(unittest.TestCase):
+    def test_find_marker(self):
+        swf_history = builder.History(BaseTestWorkflow, input={})
+        swf_history.add_marker("a_marker", {"foo": 1})
+        swf_history.add_marker("a_marker", {"foo": 2})
+        swf_history.add_marker("a_marker", {"foo": 1})
+        history = History(swf_history)
+        history.parse()
+
+        marker = history.find_marker("a_marker", json_dumps({"foo": 1}))
+        self.assertIs(history.markers["a_marker"][2], marker)
+        self.assertIs(history.markers["a_marker"][1], history.find_marker("a_marker", json_dumps({"foo": 2})))
+        self.assertIsNone(history.find_marker("a_marker", json_dumps({"foo": 3})))
+        self.assertIsNone(history.find_marker("another_marker", json_dumps({"foo": 1})))
+
+    def test_find_signaled_workflow(self):
+        swf_history = builder.History(BaseTestWorkflow, input={})
+        swf_history.add_signal_external_workflow("a_signal", "workflow-1", "run-1")
+        swf_history.add_signal_external_workflow("a_signal", "workflow-1", "run-2")
+        swf_history.add_signal_external_workflow("another_signal", "workflow-2", "run-3")
+        history = History(swf_history)
+        history.parse()
+
+        signaled = history.signaled_workflows["a_signal"]
+        self.assertIs(signaled[0], history.find_signaled_workflow("a_signal", "workflow-1", "run-1"))
+        self.assertIs(signaled[1], history.find_signaled_workflow("a_signal", "workflow-1", "run-2"))
+        # any run ID: first signaled workflow
+        self.assertIs(signaled[0], history.find_signaled_workflow("a_signal", "workflow-1"))
+        self.assertIsNone(history.find_signaled_workflow("a_signal", "workflow-2"))
+        self.assertIsNotNone(history.find_signaled_workflow("another_signal", "workflow-2", "run-3"))
+
+    def test_was_signaled(self):
+        swf_history = builder.History(BaseTestWorkflow, input={})
+        swf_history.add_signal_external_workflow("a_signal", "workflow-1", "run-1")
+        swf_history.add_signal_external_workflow("a_signal", "workflow-2", "run-2")
+        swf_history.add_signal_external_workflow("a_signal", "workflow-2", None)
+        history = History(swf_history)
+        history.parse()
+
+        self.assertTrue(history.was_signaled("a_signal", "workflow-1", "run-1"))
+        self.assertFalse(history.was_signaled("a_signal", "workflow-1", "run-2"))
+        # None only matches signals sent without a run ID
+        self.assertFalse(history.was_signaled("a_signal", "workflow-1", None))
+        self.assertTrue(history.was_signaled("a_signal", "workflow-2", None))
+        self.assertFalse(history.was_signaled("a_signal", "workflow-3", None))
+        self.assertFalse(history.was_signaled("another_signal", "workflow-2", None))
+
+    def test_jumbo_fields(self):
+        jumbo = "simpleflow+s3://jumbo-bucket/{} 100"
+        swf_history = builder.History(BaseTestWorkflow, input={})
+        swf_history.add_activity_task(increment, decision_id=0, last_state="completed", activity_id="activity-1")
+        swf_history.add_marker("a_marker", {"foo": 1})
+        # as encoded by simpleflow.format, instead of JSON by the builder
+        for event in swf_history.events:
+            attributes = next(value for key, value in event.raw.items() if key.endswith("EventAttributes"))
+            for name in "input", "result", "details":
+                if name in attributes:
+                    attributes[name] = jumbo.format(f"{event.type}-{name}")
+        attributes["details"] = attributes["details"].replace("simpleflow+s3://", "simpleflow+s3+gzip://")
+        history = History(swf_history)
+        history.parse()
+
+        self.assertEqual(
+            [
+                jumbo.format("WorkflowExecution-input"),
+                jumbo.format("ActivityTask-input"),
+                jumbo.format("ActivityTask-result"),
+                "simpleflow+s3+gzip://jumbo-bucket/Marker-details 100",
+            ],
+            history.jumbo_fields(),
+        )
+
+    def test_inputs_are_decoded_on_access(self):
+        swf_history = builder.History(BaseTestWorkflow, input={})
+        swf_history.add_activity_task(
+            increment, decision_id=0, last_state="completed", activity_id="activity-1", input={"args": [2]}
+        )
+        history = History(swf_history)
+        with mock.patch("simpleflow.format.json_loads_or_raw", wraps=json_loads_or_raw) as loads:
+            history.parse()
+            snapshot = pickle.loads(pickle.dumps(history.snapshot()))
+            self.assertEqual(0, loads.call_count)
+
+            activity = history.activities["activity-1"]
+            self.assertEqual({"args": [2]}, activity["input"])
+            self.assertEqual(1, loads.call_count)
+            self.assertEqual({"args": [2]}, snapshot["state"]["_activities"]["activity-1"]["input"])
+        self.assertEqual({}, activity["control"])
+
+    def test_null_inputs_are_none(self):
+        swf_history = builder.History(BaseTestWorkflow, input={})
+        swf_history.add_signal("a_signal")
+        swf_history.events[-1].input = "null"
+        history = History(swf_history)
+        history.parse()
+        self.assertIsNone(history.signals["a_signal"]["input"])
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from simpleflow import constants, format
+from simpleflow.history import History
+from simpleflow.history_cache import DiskHistorySnapshotCache, MemoryHistorySnapshotCache, parse_history
+from simpleflow.swf.mapper.models.history import builder
+from tests.data.activities import increment
+from tests.data.workflows import BaseTestWorkflow
+
+
+class TestHistorySnapshot(unittest.TestCase):
+    def build_history(self):
+        history = builder.History(BaseTestWorkflow, input={})
+        decision_id = history.last_id
+        history.add_activity_task(increment, decision_id, activity_id="increment-1", input={"args": [1]}, result=2)
+        history.add_signal("a_signal", {"foo": "bar"})
+        history.add_marker("a_marker", {"baz": 1})
+        history.add_decision_task()
+        return history
+
+    def add_more_events(self, history):
+        decision_id = history.last_id
+        history.add_activity_task(increment, decision_id, activity_id="increment-2", input={"args": [2]}, result=3)
+        history.add_activity_task(
+            increment, decision_id, activity_id="increment-1", input={"args": [1]}, last_state="failed"
+        )
+        history.add_signal("a_signal", {"foo": "qux"})
+        history.add_timer_started("a_timer", 1, decision_id=decision_id)
+        history.add_timer_fired("a_timer")
+
+    def assert_same_parsed_state(self, expected, actual):
+        for name in History.PARSED_ATTRIBUTES:
+            self.assertEqual(getattr(expected, name), getattr(actual, name), name)
+
+    def test_resume_from_snapshot(self):
+        swf_history = self.build_history()
+        history = History(swf_history)
+        history.parse()
+        snapshot = pickle.loads(pickle.dumps(history.snapshot()))
+
+        self.add_more_events(swf_history)
+        resumed = History(swf_history)
+        self.assertTrue(resumed.restore(snapshot))
+        with mock.patch.object(History, "parse_activity_event", wraps=History.parse_activity_event) as parse_activity:
+            resumed.TYPE_TO_PARSER = {**History.TYPE_TO_PARSER, "ActivityTask": parse_activity}
+            resumed.parse()
+        # Only activity events following the snapshot are parsed
+        self.assertEqual(6, parse_activity.call_count)
+
+        full = History(swf_history)
+        full.parse()
+        self.assert_same_parsed_state(full, resumed)
+        self.assertIs(resumed.activities["increment-1"], resumed.tasks[0])
+
+    def test_restore_mismatching_snapshot(self):
+        history = History(self.build_history())
+        history.parse()
+        snapshot = history.snapshot()
+
+        other = History(builder.History(BaseTestWorkflow, input={}))
+        self.assertFalse(other.restore(snapshot))
+        self.assertEqual({}, other.activities)
+
+    def test_restore_snapshot_from_another_version(self):
+        swf_history = self.build_history()
+        history = History(swf_history)
+        history.parse()
+        snapshot = history.snapshot()
+        del snapshot["state"]["_markers_index"]
+
+        self.assertFalse(History(swf_history).restore(snapshot))
+
+    def test_jumbo_fields_of_new_events(self):
+        references = [f"{constants.JUMBO_FIELDS_PREFIX}jumbo-bucket/{key} 42" for key in ("old", "new")]
+        swf_history = self.build_history()
+        marker = next(event for event in swf_history.events if event.type == "Marker")
+        marker.raw["markerRecordedEventAttributes"]["details"] = references[0]
+        history = History(swf_history)
+        history.parse()
+        snapshot = pickle.loads(pickle.dumps(history.snapshot()))
+
+        self.add_more_events(swf_history)
+        swf_history.add_marker("a_marker")
+        swf_history.events[-1].raw["markerRecordedEventAttributes"]["details"] = references[1]
+        resumed = History(swf_history)
+        self.assertTrue(resumed.restore(snapshot))
+        resumed.parse()
+        self.assertEqual(references, resumed.jumbo_fields())
+        self.assertEqual(references[1:], resumed.new_jumbo_fields())
+
+    def test_snapshot_keeps_jumbo_fields_lazy(self):
+        content = f"{constants.JUMBO_FIELDS_PREFIX}jumbo-bucket/1234 42"
+        with mock.patch("simpleflow.format._pull_jumbo_field", return_value='{"a": 1}') as pull:
+            value = pickle.loads(pickle.dumps(format.decode(content)))
+            self.assertEqual(0, pull.call_count)
+            self.assertEqual(1, value["a"])
+            self.assertEqual(1, pull.call_count)
+
+
+class TestParseHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        cache = DiskHistorySnapshotCache(directory=self.tmp_dir.name)
+        patcher = mock.patch("simpleflow.history_cache.get_history_snapshot_cache", return_value=cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = cache
+
+    def test_parse_history_stores_and_uses_snapshot(self):
+        swf_history = builder.History(BaseTestWorkflow, input={})
+        swf_history.add_activity_task(increment, swf_history.last_id, activity_id="increment-1", result=2)
+        history = parse_history(History(swf_history), "run-1")
+        self.assertEqual(history.last_event_id, self.cache.get("run-1")["last_event_id"])
+
+        swf_history.add_decision_task()
+        with mock.patch.object(History, "restore", return_value=True) as restore:
+            parse_history(History(swf_history), "run-1")
+        self.assertEqual(1, restore.call_count)
+        self.assertEqual(swf_history.last_id, self.cache.get("run-1")["last_event_id"])
+
+
+class TestMemoryHistorySnapshotCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = MemoryHistorySnapshotCache(max_events=10)
+        cache.set("run-1", {"last_event_id": 4})
+        cache.set("run-2", {"last_event_id": 4})
+        cache.set("run-1", {"last_event_id": 5})
+        self.assertEqual(9, cache.nb_events)
+        cache.set("run-3", {"last_event_id": 3})
+        # run-2 is the least recently stored
+        self.assertEqual(2, len(cache))
+        self.assertEqual(8, cache.nb_events)
+        self.assertIsNone(cache.get("run-2"))
+
+    def test_get_takes_the_snapshot(self):
+        cache = MemoryHistorySnapshotCache()
+        cache.set("run-1", {"last_event_id": 4})
+        self.assertEqual({"last_event_id": 4}, cache.get("run-1"))
+        self.assertIsNone(cache.get("run-1"))
+        self.assertEqual(0, cache.nb_events)
+
+    def test_parse_history_resumes_in_memory(self):
+        cache = MemoryHistorySnapshotCache()
+        swf_history = builder.History(BaseTestWorkflow, input={})
+        swf_history.add_activity_task(increment, swf_history.last_id, activity_id="increment-1", result=2)
+        with mock.patch("simpleflow.history_cache.get_history_snapshot_cache", return_value=cache):
+            first = parse_history(History(swf_history), "run-1")
+            # same history again: the snapshot is kept
+            parse_history(History(swf_history), "run-1")
+            swf_history.add_activity_task(increment, swf_history.last_id, activity_id="increment-2", result=3)
+            second = parse_history(History(swf_history), "run-1")
+
+        # aggregates are shared, not copied
+        self.assertIs(first.activities, second.activities)
+        self.assertEqual({"increment-1", "increment-2"}, set(second.activities))
+        self.assertEqual(swf_history.last_id, cache.get("run-1")["last_event_id"])
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from sqlite3 import OperationalError
+from unittest import mock
+
+from simpleflow import format
+from simpleflow.jumbo_fields_cache import DiskJumboFieldsCache, KnownJumboFieldsKeys, MemoryJumboFieldsCache
+
+
+class TestMemoryJumboFieldsCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = MemoryJumboFieldsCache(max_bytes=10)
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        self.assertEqual("aaaa", cache.get("a"))
+        cache.set("c", "cccc")
+        # b is the least recently used
+        self.assertEqual({"a": "aaaa", "c": "cccc"}, cache)
+        self.assertEqual(8, cache.nb_bytes)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual({"entries": 2, "bytes": 8, "hits": 1, "misses": 1, "evictions": 1}, cache.metrics())
+
+    def test_too_large(self):
+        cache = MemoryJumboFieldsCache(max_bytes=10)
+        cache.set("a", "aaaa")
+        cache.set("a", "a" * 11)
+        self.assertNotIn("a", cache)
+        self.assertEqual(0, cache.nb_bytes)
+
+    def test_mapping(self):
+        cache = MemoryJumboFieldsCache(max_bytes=10)
+        cache["a"] = "aaaa"
+        cache["a"] = "aa"
+        self.assertEqual("aa", cache["a"])
+        self.assertEqual(2, cache.nb_bytes)
+        self.assertEqual("aa", cache.pop("a"))
+        with self.assertRaises(KeyError):
+            del cache["a"]
+        cache["b"] = "bbbb"
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.nb_bytes)
+
+    @mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_MAX_BYTES", 3)
+    def test_max_bytes_setting(self):
+        cache = MemoryJumboFieldsCache()
+        cache.set("a", "aaaa")
+        self.assertNotIn("a", cache)
+
+
+class TestDiskJumboFieldsCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_get_set(self):
+        cache = DiskJumboFieldsCache(directory=self.tmp_dir.name)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", "aaaa")
+        self.assertEqual("aaaa", cache.get("a"))
+        self.assertEqual({"hits": 1, "misses": 1, "errors": 0}, cache.metrics())
+
+    def test_opened_once_per_process(self):
+        cache = DiskJumboFieldsCache(directory=self.tmp_dir.name, size_limit=1024**2)
+        self.assertIs(cache.cache, cache.cache)
+        self.assertEqual(1024**2, cache.cache.size_limit)
+        self.assertEqual("least-recently-stored", cache.cache.eviction_policy)
+        with mock.patch("os.getpid", return_value=os.getpid() + 1):
+            self.assertIsNot(cache._cache, cache.cache)
+
+    def test_errors_are_misses(self):
+        cache = DiskJumboFieldsCache(directory=self.tmp_dir.name)
+        with (
+            mock.patch.object(cache.cache, "get", side_effect=OperationalError),
+            self.assertLogs("simpleflow", level="WARNING"),
+        ):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual({"hits": 0, "misses": 1, "errors": 1}, cache.metrics())
+
+
+class TestKnownJumboFieldsKeys(unittest.TestCase):
+    def test_max_entries(self):
+        keys = KnownJumboFieldsKeys(max_entries=2)
+        keys.add("a")
+        keys.add("b")
+        keys.add("a")
+        keys.add("c")
+        # b is the least recently added
+        self.assertEqual(2, len(keys))
+        self.assertNotIn("b", keys)
+        self.assertIn("a", keys)
+
+    def test_max_age(self):
+        keys = KnownJumboFieldsKeys(max_age=60)
+        keys.add("a")
+        keys.add("b", stored_at=time.time() - 61)
+        self.assertIn("a", keys)
+        self.assertNotIn("b", keys)
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.assertNotIn("a", keys)
+
+    @mock.patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_KNOWN_KEYS_MAX_ENTRIES", 1)
+    def test_max_entries_setting(self):
+        keys = KnownJumboFieldsKeys()
+        keys.add("a")
+        keys.add("b")
+        self.assertEqual(1, len(keys))
+
+
+class TestJumboFieldsCaches(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        for name, cache in (
+            ("JUMBO_FIELDS_MEMORY_CACHE", MemoryJumboFieldsCache()),
+            ("JUMBO_FIELDS_DISK_CACHE", DiskJumboFieldsCache(directory=self.tmp_dir.name)),
+        ):
+            patcher = mock.patch.object(format, name, cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @mock.patch("simpleflow.settings.SIMPLEFLOW_ENABLE_DISK_CACHE", True)
+    def test_disk_hits_are_kept_in_memory(self):
+        format._set_cached("dir/abc", "content")
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        self.assertEqual("content", format._get_cached("dir/abc"))
+        self.assertEqual("content", format._get_cached("dir/abc"))
+        metrics = format.jumbo_fields_cache_metrics()
+        self.assertEqual(1, metrics["memory"]["hits"])
+        self.assertEqual(1, metrics["disk"]["hits"])
+
+    def test_disk_cache_disabled(self):
+        format._set_cached("dir/abc", "content")
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        self.assertIsNone(format._get_cached("dir/abc"))
+        self.assertEqual(0, format.jumbo_fields_cache_metrics()["disk"]["misses"])
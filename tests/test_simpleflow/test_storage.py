@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import tempfile
+import threading
 import unittest
 from unittest.mock import patch
 
@@ -75,6 +76,16 @@ class TestGroup(unittest.TestCase):
 
         assert storage.pull_content(self.bucket, "mykey.txt") == "42"
 
+    @mock_s3
+    def test_exists(self):
+        self.create()
+        storage.push_content(self.bucket, "mykey.txt", "Hey Jude")
+
+        assert storage.exists(self.bucket, "mykey.txt")
+        assert not storage.exists(self.bucket, "otherkey.txt")
+        assert storage.last_modified(self.bucket, "mykey.txt").tzinfo is not None
+        assert storage.last_modified(self.bucket, "otherkey.txt") is None
+
     @mock_s3
     def test_list(self):
         self.create()
@@ -120,3 +131,45 @@ class TestGroup(unittest.TestCase):
         # bucket with too many "/": raise
         with self.assertRaises(ValueError):
             storage.sanitize_bucket_and_host("s3-eu-west-1.amazonaws.com/mybucket/subpath")
+
+    @mock_s3
+    def test_resources_are_reused(self):
+        resource = storage.get_resource("us-east-1")
+        self.assertIs(resource, storage.get_resource("us-east-1"))
+        self.assertIsNot(resource, storage.get_resource("eu-west-1"))
+        self.assertIsNot(resource, storage.get_resource("s3.amazonaws.com"))
+        self.assertEqual(
+            (storage.settings.SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS, storage.settings.SIMPLEFLOW_S3_TCP_KEEPALIVE),
+            (resource.meta.client.meta.config.max_pool_connections, resource.meta.client.meta.config.tcp_keepalive),
+        )
+
+        # not shared with threads, unlike their client
+        resources = []
+        thread = threading.Thread(target=lambda: resources.append(storage.get_resource("us-east-1")))
+        thread.start()
+        thread.join()
+        self.assertIsNot(resource, resources[0])
+        self.assertIs(resource.meta.client, resources[0].meta.client)
+
+        # nor with forked processes
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if not pid:  # pragma: no cover
+            try:
+                same = storage.get_resource("us-east-1").meta.client is resource.meta.client
+                os.write(write_fd, b"1" if same else b"0")
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd, "rb") as f:
+            self.assertEqual(b"0", f.read())
+        self.assertIs(resource, storage.get_resource("us-east-1"))
+
+    @mock_s3
+    def test_clients_are_shared_with_threads(self):
+        clients = []
+        thread = threading.Thread(target=lambda: clients.append(storage.get_client()))
+        thread.start()
+        thread.join()
+        self.assertIs(storage.get_client(), clients[0])
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from simpleflow import Workflow, activity, registry, task
 
 
@@ -17,6 +21,31 @@ class Double:
         return self.val * 2
 
 
+@activity.with_attributes(task_list="test")
+async def async_double(x):
+    await asyncio.sleep(0)
+    return x * 2
+
+
+@activity.with_attributes(task_list="test")
+class AsyncDouble:
+    def __init__(self, val):
+        self.val = val
+
+    async def execute(self):
+        await asyncio.sleep(0)
+        return self.val * 2
+
+
+barrier = threading.Barrier(2)
+
+
+@activity.with_attributes(task_list="test")
+def get_context():
+    barrier.wait(timeout=5)  # both tasks are running
+    return get_context.context
+
+
 def test_task_applies_function_correctly():
     assert task.ActivityTask(double, 2).execute() == 4
 
@@ -25,6 +54,29 @@ def test_task_applies_class_correctly():
     assert task.ActivityTask(Double, 4).execute() == 8
 
 
+def test_async_activities():
+    assert not double.is_async
+    assert not Double.is_async
+    assert async_double.is_async
+    assert AsyncDouble.is_async
+
+
+def test_task_applies_async_function_correctly():
+    assert task.ActivityTask(async_double, 2).execute() == 4
+    assert asyncio.run(task.ActivityTask(async_double, 3).execute_async()) == 6
+
+
+def test_task_applies_async_class_correctly():
+    assert task.ActivityTask(AsyncDouble, 4).execute() == 8
+    assert asyncio.run(task.ActivityTask(AsyncDouble, 5).execute_async()) == 10
+
+
+def test_context_is_per_task():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(task.ActivityTask(get_context, context={"id": i}).execute) for i in range(2)]
+    assert [f.result() for f in futures] == [{"id": 0}, {"id": 1}]
+
+
 def test_context_is_empty_for_non_swf_tasks():
     assert task.ActivityTask(Double, 3).context is None
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+import io
 import json
 import unittest
 
@@ -8,7 +9,7 @@ import pytz
 
 from simpleflow.exceptions import ExecutionBlocked
 from simpleflow.futures import Future
-from simpleflow.utils import json_dumps
+from simpleflow.utils import json_dump, json_dumps
 
 
 class TestJsonDumps(unittest.TestCase):
@@ -106,5 +107,29 @@ class TestJsonDumps(unittest.TestCase):
         self.assertEqual(sorted(expected[1]), sorted(actual[1]))
 
 
+class TestJsonDump(unittest.TestCase):
+    def test_json_dump_like_json_dumps(self):
+        from lazy_object_proxy import Proxy
+
+        d = datetime.datetime(1970, 1, 1, tzinfo=pytz.UTC)
+        cases = [
+            None,
+            "a",
+            [],
+            {},
+            (1, 2),
+            list(range(25)),
+            {f"k{i}": [i, d] for i in range(25)},
+            {3: "c", 1: "a", 2: "b"},
+            [Proxy(lambda: "foo")] * 12,
+            {"z": 1, "abc": "def"},
+        ]
+        for case in cases:
+            for kwargs in {}, {"pretty": True}, {"compact": False}:
+                fp = io.StringIO()
+                json_dump(case, fp, chunk_size=10, **kwargs)
+                self.assertEqual(json_dumps(case, **kwargs), fp.getvalue())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ import unittest
 import boto3
 from moto import mock_s3, mock_swf
 
+from simpleflow import logging_context
 from simpleflow.swf.executor import Executor
 from simpleflow.swf.mapper.actors import Decider
 from simpleflow.swf.process.worker.base import ActivityPoller, ActivityWorker
@@ -15,6 +16,9 @@ from tests.data.constants import DOMAIN
 @mock_swf
 class MockSWFTestCase(unittest.TestCase):
     def setUp(self):
+        # polling sets the logging context of this process
+        self.addCleanup(logging_context.reset)
+
         # SWF preparation
         self.domain = DOMAIN
         self.workflow_type_name = "test-workflow"